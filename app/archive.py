@@ -0,0 +1,161 @@
+"""Move past events, their seats and bookings into the archive tables.
+
+Usage:
+    python archive.py                      # use ARCHIVE_AFTER_DAYS from config
+    python archive.py --days 30 --batch-size 500
+    python archive.py --dry-run
+"""
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.orm import Session
+from database import SessionLocal, init_db
+from models.movie import Movie
+from models.event import Event
+from models.seat import Seat
+from models.archive import ArchivedEvent, ArchivedSeat
+from core.versions import CATALOG, bump
+from config import get_config
+
+# Get config once at module level
+config = get_config()
+
+def get_archive_cutoff(older_than_days: int = None) -> datetime:
+    """Events starting before this (naive UTC) time are archived"""
+    if older_than_days is None:
+        older_than_days = config.archive_after_days
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    # start_time is stored as naive UTC
+    return cutoff.replace(tzinfo=None)
+
+def _archive_events(event_ids: list, db: Session) -> int:
+    """Copy a batch of events and their seats into the archive tables, return seats moved"""
+    event_rows = db.execute(
+        select(Event.id, Event.movie_id, Event.start_time, Event.created_at, Movie.title)
+        .join(Movie, Movie.id == Event.movie_id, isouter=True)
+        .where(Event.id.in_(event_ids))
+        .order_by(Event.id)
+    ).all()
+
+    seat_counts = {
+        event_id: (total_seats, booked_seats)
+        for event_id, total_seats, booked_seats in db.execute(
+            select(
+                Seat.event_id,
+                func.count(Seat.id),
+                func.coalesce(func.sum(case((Seat.status == "booked", 1), else_=0)), 0)
+            ).where(Seat.event_id.in_(event_ids)).group_by(Seat.event_id)
+        )
+    }
+
+    archived_at = datetime.now(timezone.utc)
+    # One multi-row INSERT for the batch; RETURNING gives the new archive ids
+    archived_ids = db.scalars(
+        insert(ArchivedEvent).returning(ArchivedEvent.id),
+        [
+            {
+                "event_id": event_row.id,
+                "movie_id": event_row.movie_id,
+                "movie_title": event_row.title or "Deleted movie",
+                "start_time": event_row.start_time,
+                "total_seats": seat_counts.get(event_row.id, (0, 0))[0],
+                "booked_seats": seat_counts.get(event_row.id, (0, 0))[1],
+                "created_at": event_row.created_at,
+                "archived_at": archived_at
+            }
+            for event_row in event_rows
+        ]
+    ).all()
+
+    # Copy the batch's seats (including bookings) in a single INSERT ... SELECT;
+    # joining on the new archive rows only, in case a live event id was reused
+    db.execute(
+        insert(ArchivedSeat).from_select(
+            ["archived_event_id", "seat_id", "price", "description", "status",
+             "locked_at", "booking_reference", "created_at"],
+            select(
+                ArchivedEvent.id, Seat.id, Seat.price, Seat.description, Seat.status,
+                Seat.locked_at, Seat.booking_reference, Seat.created_at
+            )
+            .join(ArchivedEvent, ArchivedEvent.event_id == Seat.event_id)
+            .where(ArchivedEvent.id.in_(archived_ids))
+        )
+    )
+
+    return sum(total_seats for total_seats, _ in seat_counts.values())
+
+def archive_past_events(db: Session, older_than_days: int = None, batch_size: int = None, dry_run: bool = False) -> dict:
+    """Archive events older than the cutoff in batched transactions"""
+    if batch_size is None:
+        batch_size = config.archive_batch_size
+    cutoff = get_archive_cutoff(older_than_days)
+
+    if dry_run:
+        events_pending = db.query(func.count(Event.id)).filter(Event.start_time < cutoff).scalar()
+        return {"cutoff": cutoff, "events_archived": 0, "seats_archived": 0, "events_pending": events_pending}
+
+    events_archived = 0
+    seats_archived = 0
+
+    while True:
+        event_ids = [
+            row[0] for row in db.query(Event.id)
+            .filter(Event.start_time < cutoff)
+            .order_by(Event.id)
+            .limit(batch_size)
+            .all()
+        ]
+        if not event_ids:
+            break
+
+        # One transaction per batch - the live tables never see a half-archived event
+        try:
+            seats_archived += _archive_events(event_ids, db)
+
+            db.query(Seat).filter(Seat.event_id.in_(event_ids)).delete(synchronize_session=False)
+            db.query(Event).filter(Event.id.in_(event_ids)).delete(synchronize_session=False)
+            bump(db, CATALOG)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        events_archived += len(event_ids)
+
+    return {"cutoff": cutoff, "events_archived": events_archived, "seats_archived": seats_archived}
+
+def run_archive_job() -> dict:
+    """Run one archive pass with its own session (used by the scheduler)"""
+    db = SessionLocal()
+    try:
+        return archive_past_events(db)
+    finally:
+        db.close()
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Archive past events into cold storage tables")
+    parser.add_argument("--days", type=int, default=config.archive_after_days,
+                        help=f"Archive events that started more than N days ago (default: {config.archive_after_days})")
+    parser.add_argument("--batch-size", type=int, default=config.archive_batch_size,
+                        help=f"Events moved per transaction (default: {config.archive_batch_size})")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the events that would be archived")
+    args = parser.parse_args()
+
+    # Make sure the archive tables exist
+    init_db()
+
+    db = SessionLocal()
+    try:
+        result = archive_past_events(db, args.days, args.batch_size, args.dry_run)
+    finally:
+        db.close()
+
+    print(f"Cutoff: {result['cutoff']:%Y-%m-%d %H:%M:%S} UTC")
+    if args.dry_run:
+        print(f"Events that would be archived: {result['events_pending']}")
+    else:
+        print(f"Archived {result['events_archived']} events and {result['seats_archived']} seats")
+
+if __name__ == "__main__":
+    main()
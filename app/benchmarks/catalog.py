@@ -0,0 +1,121 @@
+"""Catalog benchmark: movie search and event list paging over a large catalog.
+
+Loads --movies synthetic movies with --showtimes events each into a scratch
+SQLite DB (titles and descriptions from sample_data.py), then times
+GET /api/events/search for a mix of title words, prefixes and genres, with
+and without a showtime range, and GET /api/events for the first page and
+for a page deep into the list (keyset pages should cost the same).
+
+Usage (from the app directory):
+    python benchmarks/catalog.py                          # 20,000 movies x 3 showtimes
+    python benchmarks/catalog.py --movies 50000 --requests 500
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+from common import use_scratch_database, latency_summary, save_results
+
+QUERIES = ["crimson", "midnight storm", "echo", "fro", "thriller", "sci-fi", "golden harbor 3", "documentary"]
+
+def seed(args):
+    """Start the app in-process and bulk-load the catalog"""
+    use_scratch_database()
+    os.environ.setdefault("PASSWORD_HASH_ROUNDS", "4")
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import insert
+    from main import app
+    from database import SessionLocal
+    from models.movie import Movie
+    from models.event import Event
+    from sample_data import movie_rows, event_rows
+
+    client = TestClient(app)
+    client.__enter__()
+
+    rng = random.Random(args.seed)
+    movies = movie_rows(args.movies, 1, rng)
+    events = event_rows([movie["id"] for movie in movies], args.showtimes, args.days, 1, rng)
+    for event in events:
+        del event["total_seats"]
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    db.execute(insert(Movie), movies)
+    db.execute(insert(Event), events)
+    db.commit()
+    db.close()
+    print(f"Loaded {len(movies):,} movies and {len(events):,} events in {time.perf_counter() - started:.1f}s")
+
+    client.post("/api/auth/register", json={"email": "bench@example.com", "password": "bench", "full_name": "Bench"})
+    token = client.post("/api/auth/login", json={"email": "bench@example.com", "password": "bench"}).json()["access_token"]
+    return client, {"Authorization": f"Bearer {token}"}
+
+def main():
+    parser = argparse.ArgumentParser(description="Time movie search over a large catalog")
+    parser.add_argument("--movies", type=int, default=20000, help="Number of movies (default: 20000)")
+    parser.add_argument("--showtimes", type=int, default=3, help="Showtimes per movie (default: 3)")
+    parser.add_argument("--days", type=int, default=30, help="Spread showtimes over this many days (default: 30)")
+    parser.add_argument("--requests", type=int, default=200, help="Search requests per scenario (default: 200)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    parser.add_argument("--output", default=None, help="Results JSON path (default: benchmarks/results/catalog-<timestamp>.json)")
+    args = parser.parse_args()
+
+    client, headers = seed(args)
+    week_from = datetime.utcnow() + timedelta(days=7)
+    scenarios = {
+        "search": lambda q: {"q": q},
+        "search_range": lambda q: {
+            "q": q, "from": week_from.isoformat(), "to": (week_from + timedelta(days=7)).isoformat()
+        }
+    }
+
+    results = {"movies": args.movies, "events": args.movies * args.showtimes, "scenarios": {}}
+    for name, params in scenarios.items():
+        samples, hits = [], 0
+        for index in range(args.requests):
+            query = QUERIES[index % len(QUERIES)]
+            started = time.perf_counter()
+            response = client.get("/api/events/search", params=params(query), headers=headers)
+            samples.append((time.perf_counter() - started) * 1000)
+            response.raise_for_status()
+            hits += len(response.json())
+        summary = latency_summary(samples)
+        summary["mean_results"] = round(hits / args.requests, 1)
+        results["scenarios"][name] = summary
+        print(f"{name:18} p50 {summary['p50_ms']:7.2f} ms  p99 {summary['p99_ms']:7.2f} ms  "
+              f"{summary['mean_results']:5.1f} results/request")
+
+    # Walk to the last page once, then time the first page against that deep cursor
+    cursor, pages = None, 0
+    while True:
+        response = client.get("/api/events", params={"cursor": cursor} if cursor else {}, headers=headers)
+        response.raise_for_status()
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if next_cursor is None:
+            break
+        cursor, pages = next_cursor, pages + 1
+    results["pages"] = pages + 1
+    for name, params in {"events_first_page": {}, "events_deep_page": {"cursor": cursor}}.items():
+        if name == "events_deep_page" and cursor is None:
+            continue
+        samples = []
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            client.get("/api/events", params=params, headers=headers).raise_for_status()
+            samples.append((time.perf_counter() - started) * 1000)
+        summary = latency_summary(samples)
+        results["scenarios"][name] = summary
+        print(f"{name:18} p50 {summary['p50_ms']:7.2f} ms  p99 {summary['p99_ms']:7.2f} ms")
+    print(f"({results['pages']} pages of upcoming events)")
+
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results", f"catalog-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    print(f"Saved {save_results(results, output)}")
+
+if __name__ == "__main__":
+    main()
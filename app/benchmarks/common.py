@@ -0,0 +1,49 @@
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add app directory to path (same pattern as dashboard.py)
+app_dir = Path(__file__).resolve().parent.parent
+if str(app_dir) not in sys.path:
+    sys.path.insert(0, str(app_dir))
+
+def use_scratch_database(path: str = None) -> str:
+    """Point the app at a throwaway SQLite file. Must run before importing app modules."""
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="bookmemovie-bench-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ.setdefault("SECRET_KEY", "benchmark-only-secret-key")
+    # Benchmarks drive far more traffic per client than the rate limits allow
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    return path
+
+def percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers (0 for an empty list)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def latency_summary(samples_ms: list) -> dict:
+    return {
+        "count": len(samples_ms),
+        "p50_ms": round(percentile(samples_ms, 50), 2),
+        "p99_ms": round(percentile(samples_ms, 99), 2),
+        "max_ms": round(max(samples_ms), 2) if samples_ms else 0.0
+    }
+
+def save_results(results: dict, path: str) -> str:
+    """Write a benchmark run to JSON so later runs can be compared against it"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as output:
+        json.dump(results, output, indent=2, sort_keys=True)
+    return path
+
+def load_results(path: str) -> dict:
+    with open(path) as source:
+        return json.load(source)
@@ -0,0 +1,244 @@
+"""Flash-sale benchmark: many users polling a seat map while competing for seats.
+
+Every simulated user loops: GET the seat map, pick a few open seats, POST
+/book-seats, then confirm the payment or cancel the booking. The run ends
+after --duration seconds or when the event is sold out.
+
+Reports p50/p99 latency per endpoint, throughput and the booking conflict
+rate, and saves the run as JSON so it can be compared with a later one.
+
+Usage (from the app directory):
+    python benchmarks/flash_sale.py                          # in-process, scratch SQLite DB
+    python benchmarks/flash_sale.py --users 50 --seats 500 --duration 30
+    python benchmarks/flash_sale.py --compare benchmarks/results/flash_sale-20260101-120000.json
+    python benchmarks/flash_sale.py --url http://localhost:8000 \\
+        --admin-email admin@example.com --admin-password secret
+"""
+import argparse
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from common import use_scratch_database, latency_summary, save_results, load_results
+
+ENDPOINTS = ("seat_map", "book", "confirm", "cancel")
+
+def seed_in_process(args):
+    """Start the app in-process and seed one event through create_seats_for_event"""
+    use_scratch_database()
+    # Users are registered up front; cheap hashes keep setup out of the way
+    os.environ.setdefault("PASSWORD_HASH_ROUNDS", "4")
+
+    # App imports read config, so they happen after the environment is set
+    from fastapi.testclient import TestClient
+    from main import app
+    from database import SessionLocal
+    from routes.admin import create_seats_for_event
+    from models.movie import Movie
+    from models.event import Event
+
+    client = TestClient(app)
+    client.__enter__()
+
+    db = SessionLocal()
+    movie = Movie(title="Flash Sale Movie", description="Opening night")
+    db.add(movie)
+    db.commit()
+    event = Event(movie_id=movie.id, start_time=datetime.utcnow() + timedelta(days=1))
+    db.add(event)
+    db.commit()
+    event_id = event.id
+    create_seats_for_event(event_id, args.seats, db)
+    db.close()
+    return client, event_id
+
+def seed_over_http(args):
+    """Seed one event through the admin API of a running server"""
+    import httpx
+
+    client = httpx.Client(base_url=args.url, timeout=30)
+    login = client.post("/api/auth/login", json={
+        "email": args.admin_email, "password": args.admin_password
+    })
+    login.raise_for_status()
+    admin_headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    movie = client.post("/api/admin/movies", headers=admin_headers, json={
+        "title": f"Flash Sale Movie {int(time.time())}", "description": "Opening night"
+    })
+    movie.raise_for_status()
+    event = client.post("/api/admin/events", headers=admin_headers, json={
+        "movie_id": movie.json()["id"],
+        "start_time": (datetime.utcnow() + timedelta(days=1)).isoformat(),
+        "total_seats": args.seats
+    })
+    event.raise_for_status()
+    return client, event.json()["id"]
+
+def create_users(client, count: int) -> list:
+    """Register and log in `count` users, returning (email, headers) pairs"""
+    run_id = int(time.time() * 1000)
+    users = []
+    for index in range(count):
+        email = f"fan{index}-{run_id}@example.com"
+        client.post("/api/auth/register", json={
+            "email": email, "password": "flash-sale-password", "full_name": f"Fan {index}"
+        })
+        response = client.post("/api/auth/login", json={"email": email, "password": "flash-sale-password"})
+        response.raise_for_status()
+        users.append((email, {"Authorization": f"Bearer {response.json()['access_token']}"}))
+    return users
+
+def run_sale(client, event_id: int, users: list, args) -> dict:
+    latencies = defaultdict(list)
+    statuses = defaultdict(lambda: defaultdict(int))
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def timed(name, method, url, headers, json=None):
+        started = time.perf_counter()
+        if method == "GET":
+            response = client.get(url, headers=headers)
+        else:
+            response = client.post(url, headers=headers, json=json)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies[name].append(elapsed_ms)
+            statuses[name][response.status_code] += 1
+        return response
+
+    def fan(email: str, headers: dict, seed: int):
+        rng = random.Random(seed)
+        while not stop.is_set():
+            seat_map = timed("seat_map", "GET", f"/api/events/{event_id}/seats", headers)
+            if seat_map.status_code != 200:
+                time.sleep(0.05)
+                continue
+
+            open_seats = [seat["seat_id"] for seat in seat_map.json()["seats"] if seat["status"] == "open"]
+            if not open_seats:
+                # Sold out, or everything left is locked by someone else
+                if all(seat["status"] == "booked" for seat in seat_map.json()["seats"]):
+                    stop.set()
+                time.sleep(0.01)
+                continue
+
+            wanted = rng.sample(open_seats, min(len(open_seats), rng.randint(1, args.max_seats)))
+            booking = timed("book", "POST", "/api/book-seats", headers,
+                            json={"seat_ids": wanted, "user_email": email})
+            if booking.status_code != 200:
+                continue
+
+            reference = booking.json()["booking_reference"]
+            if args.think_ms:
+                time.sleep(rng.uniform(0, args.think_ms) / 1000)
+            if rng.random() < args.confirm_ratio:
+                timed("confirm", "POST", "/api/confirm-payment", headers,
+                      json={"booking_reference": reference})
+            else:
+                timed("cancel", "POST", "/api/cancel-booking", headers,
+                      json={"booking_reference": reference})
+
+    threads = [
+        threading.Thread(target=fan, args=(email, headers, args.seed + index))
+        for index, (email, headers) in enumerate(users)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    stop.wait(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    book_statuses = statuses["book"]
+    book_attempts = sum(book_statuses.values())
+    total_requests = sum(len(samples) for samples in latencies.values())
+    return {
+        "elapsed_seconds": round(elapsed, 2),
+        "requests": total_requests,
+        "throughput_rps": round(total_requests / elapsed, 1),
+        "bookings_per_second": round(book_statuses.get(200, 0) / elapsed, 1),
+        "conflict_rate": round(book_statuses.get(400, 0) / book_attempts, 3) if book_attempts else 0.0,
+        "latency": {name: latency_summary(latencies[name]) for name in ENDPOINTS},
+        "statuses": {name: {str(code): count for code, count in statuses[name].items()} for name in ENDPOINTS}
+    }
+
+def count_booked_seats(client, event_id: int, headers: dict) -> int:
+    seats = client.get(f"/api/events/{event_id}/seats", headers=headers).json()["seats"]
+    return sum(1 for seat in seats if seat["status"] == "booked")
+
+def print_report(results: dict, baseline: dict = None):
+    print()
+    print(f"{'endpoint':<10}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name in ENDPOINTS:
+        summary = results["latency"][name]
+        line = f"{name:<10}{summary['count']:>8}{summary['p50_ms']:>10}{summary['p99_ms']:>10}{summary['max_ms']:>10}"
+        if baseline and name in baseline.get("latency", {}):
+            before = baseline["latency"][name]["p99_ms"]
+            if before:
+                line += f"   p99 {(summary['p99_ms'] - before) / before * 100:+.0f}% vs baseline"
+        print(line)
+    print()
+    for key, label in (("throughput_rps", "Throughput (req/s)"),
+                       ("bookings_per_second", "Bookings locked/s"),
+                       ("seats_confirmed_per_second", "Seats confirmed/s"),
+                       ("conflict_rate", "Conflict rate")):
+        line = f"{label:<22}{results[key]}"
+        if baseline and baseline.get(key) is not None:
+            line += f"   (baseline {baseline[key]})"
+        print(line)
+    print(f"{'Seats sold':<22}{results['seats_booked']}/{results['config']['seats']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Flash-sale booking benchmark")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent users (default: 20)")
+    parser.add_argument("--seats", type=int, default=200, help="Seats in the event (default: 200)")
+    parser.add_argument("--duration", type=float, default=15, help="Max seconds to run (default: 15)")
+    parser.add_argument("--max-seats", type=int, default=4, help="Max seats per booking (default: 4)")
+    parser.add_argument("--confirm-ratio", type=float, default=0.7, help="Share of bookings paid (default: 0.7)")
+    parser.add_argument("--think-ms", type=float, default=0, help="Max pause between booking and paying (default: 0)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    parser.add_argument("--url", help="Benchmark a running server instead of an in-process app")
+    parser.add_argument("--admin-email", help="Admin login used to seed the event (--url only)")
+    parser.add_argument("--admin-password", help="Admin password (--url only)")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/flash_sale-<timestamp>.json)")
+    parser.add_argument("--compare", help="Previous results file to compare against")
+    args = parser.parse_args()
+
+    if args.url:
+        if not (args.admin_email and args.admin_password):
+            parser.error("--url needs --admin-email and --admin-password to seed the event")
+        client, event_id = seed_over_http(args)
+    else:
+        client, event_id = seed_in_process(args)
+
+    print(f"Registering {args.users} users...")
+    users = create_users(client, args.users)
+
+    print(f"Flash sale: {args.users} users, {args.seats} seats, up to {args.duration}s "
+          f"({'server ' + args.url if args.url else 'in-process'})")
+    results = run_sale(client, event_id, users, args)
+    results["seats_booked"] = count_booked_seats(client, event_id, users[0][1])
+    results["seats_confirmed_per_second"] = round(results["seats_booked"] / results["elapsed_seconds"], 1)
+    results["config"] = {
+        key: getattr(args, key)
+        for key in ("users", "seats", "duration", "max_seats", "confirm_ratio", "think_ms", "seed", "url")
+    }
+    results["finished_at"] = datetime.utcnow().isoformat()
+
+    if not args.url:
+        client.__exit__(None, None, None)
+
+    baseline = load_results(args.compare) if args.compare else None
+    print_report(results, baseline)
+
+    output = args.output or f"benchmarks/results/flash_sale-{datetime.utcnow():%Y%m%d-%H%M%S}.json"
+    print(f"\nResults saved to {save_results(results, output)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Login storm benchmark: booking latency with and without a burst of logins.
+
+Runs the API in-process against a scratch SQLite database. First measures
+the booking loop (seat map -> book -> cancel) on its own, then again while
+many clients hammer POST /api/auth/login.
+
+Usage (from the app directory):
+    python benchmarks/login_storm.py
+    python benchmarks/login_storm.py --duration 20 --login-clients 64
+"""
+import argparse
+import threading
+import time
+
+from common import use_scratch_database, latency_summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Booking latency during a login storm")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per phase (default: 10)")
+    parser.add_argument("--login-clients", type=int, default=32, help="Concurrent login clients (default: 32)")
+    parser.add_argument("--booking-clients", type=int, default=4, help="Concurrent booking clients (default: 4)")
+    parser.add_argument("--seats", type=int, default=100, help="Seats in the benchmark event (default: 100)")
+    args = parser.parse_args()
+
+    db_path = use_scratch_database()
+
+    # App imports read config, so they happen after the environment is set
+    from fastapi.testclient import TestClient
+    from datetime import datetime, timedelta
+    from main import app
+    from database import SessionLocal
+    from routes.admin import create_seats_for_event
+    from models.movie import Movie
+    from models.event import Event
+
+    client = TestClient(app)
+    client.__enter__()
+
+    # Seed one user, one event
+    password = "storm-password"
+    client.post("/api/auth/register", json={
+        "email": "storm@example.com", "password": password, "full_name": "Storm User"
+    })
+    token = client.post("/api/auth/login", json={
+        "email": "storm@example.com", "password": password
+    }).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    db = SessionLocal()
+    movie = Movie(title="Benchmark Movie", description="Login storm")
+    db.add(movie)
+    db.commit()
+    event = Event(movie_id=movie.id, start_time=datetime.utcnow() + timedelta(days=1))
+    db.add(event)
+    db.commit()
+    event_id = event.id
+    create_seats_for_event(event_id, args.seats, db)
+    db.close()
+
+    def booking_loop(stop: threading.Event, samples: list, client_index: int):
+        seat_ids = None
+        while not stop.is_set():
+            started = time.perf_counter()
+            seats = client.get(f"/api/events/{event_id}/seats", headers=headers).json()["seats"]
+            if seat_ids is None:
+                seat_ids = [seats[client_index % len(seats)]["seat_id"]]
+            booking = client.post("/api/book-seats", headers=headers, json={
+                "seat_ids": seat_ids, "user_email": "storm@example.com"
+            })
+            if booking.status_code == 200:
+                client.post("/api/cancel-booking", headers=headers, json={
+                    "booking_reference": booking.json()["booking_reference"]
+                })
+            samples.append((time.perf_counter() - started) * 1000)
+
+    login_results = {"ok": 0, "rejected": 0, "other": 0}
+    login_lock = threading.Lock()
+
+    def login_loop(stop: threading.Event):
+        while not stop.is_set():
+            response = client.post("/api/auth/login", json={
+                "email": "storm@example.com", "password": password
+            })
+            key = {200: "ok", 503: "rejected"}.get(response.status_code, "other")
+            with login_lock:
+                login_results[key] += 1
+
+    def run_phase(with_storm: bool) -> list:
+        stop = threading.Event()
+        samples = []
+        threads = [
+            threading.Thread(target=booking_loop, args=(stop, samples, i))
+            for i in range(args.booking_clients)
+        ]
+        if with_storm:
+            threads += [threading.Thread(target=login_loop, args=(stop,)) for _ in range(args.login_clients)]
+        for thread in threads:
+            thread.start()
+        time.sleep(args.duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return samples
+
+    print(f"Scratch database: {db_path}")
+    print(f"Phase 1: booking only ({args.booking_clients} clients, {args.duration}s)")
+    baseline = latency_summary(run_phase(with_storm=False))
+    print(f"Phase 2: booking + {args.login_clients} login clients ({args.duration}s)")
+    storm = latency_summary(run_phase(with_storm=True))
+
+    client.__exit__(None, None, None)
+
+    print()
+    print(f"{'booking loop':<14}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, summary in (("baseline", baseline), ("login storm", storm)):
+        print(f"{name:<14}{summary['count']:>8}{summary['p50_ms']:>10}{summary['p99_ms']:>10}{summary['max_ms']:>10}")
+    print()
+    print(f"Logins: {login_results['ok'] / args.duration:.1f}/s accepted, "
+          f"{login_results['rejected']} rejected with 503 (hash pool full), {login_results['other']} other")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""Concurrency stress harness: proves seats are never double booked.
+
+Several processes, each running the app in-process with several threads,
+hammer book-seats, confirm-payment and cancel-booking on one small event
+in a shared file-backed SQLite database. Locks are made short so lock
+expiry races happen constantly: some bookings are abandoned, some are
+paid after their lock expired, and expired seats are re-booked by others.
+
+After each round the invariants are checked against what clients saw and
+what the database holds:
+  - no seat is confirmed for two bookings
+  - a successful confirm covers exactly the seats that were booked
+  - booked seats in the database match the successful confirms
+  - no payment is accepted after its lock expired
+  - seat rows are internally consistent (status vs lock fields)
+  - once the lock window has passed, every unsold seat can be booked again
+
+Exit code is 1 if any invariant fails.
+
+Usage (from the app directory):
+    python benchmarks/stress_booking.py                       # ~10 s
+    python benchmarks/stress_booking.py --processes 4 --threads 8 --seats 20
+    python benchmarks/stress_booking.py --soak --soak-minutes 30
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from common import use_scratch_database
+
+PASSWORD = "stress-password"
+
+def _configure_environment(db_path: str, lock_seconds: float):
+    """Shared by the parent and the spawned workers (must run before app imports)"""
+    use_scratch_database(db_path)
+    os.environ["SEAT_LOCK_DURATION_MINUTES"] = str(lock_seconds / 60)
+    # Cheap hashes for setup, and nothing that rejects traffic on purpose
+    os.environ.setdefault("PASSWORD_HASH_ROUNDS", "4")
+    os.environ["LOAD_SHEDDING_ENABLED"] = "false"
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+def worker(process_index: int, db_path: str, event_id: int, users: list, args_dict: dict) -> dict:
+    """One process: `threads` clients looping until the deadline. Returns what they observed."""
+    args = argparse.Namespace(**args_dict)
+    _configure_environment(db_path, args.lock_seconds)
+
+    from fastapi.testclient import TestClient
+    from main import app
+
+    client = TestClient(app)
+    observed = {"bookings": [], "confirms": [], "cancels": [], "late_confirms": [], "errors": []}
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.duration
+
+    def record(kind, item):
+        with lock:
+            observed[kind].append(item)
+
+    def request(method, url, headers, json=None):
+        try:
+            if method == "GET":
+                response = client.get(url, headers=headers)
+            else:
+                response = client.post(url, headers=headers, json=json)
+        except Exception as exc:
+            record("errors", f"{method} {url}: {exc.__class__.__name__}: {exc}")
+            return None
+        if response.status_code >= 500:
+            record("errors", f"{method} {url}: {response.status_code} {response.text[:200]}")
+        return response
+
+    def client_loop(thread_index: int):
+        email, headers = users[(process_index * args.threads + thread_index) % len(users)]
+        rng = random.Random(args.seed * 1000 + process_index * 100 + thread_index)
+
+        while time.monotonic() < deadline:
+            seat_map = request("GET", f"/api/events/{event_id}/seats", headers)
+            if seat_map is None or seat_map.status_code != 200:
+                continue
+            seats = seat_map.json()["seats"]
+
+            # Mostly seats that look open, sometimes any seat, so stale views collide
+            candidates = [seat["seat_id"] for seat in seats if seat["status"] == "open"]
+            if not candidates or rng.random() < 0.2:
+                candidates = [seat["seat_id"] for seat in seats if seat["status"] != "booked"]
+            if not candidates:
+                time.sleep(0.01)
+                continue
+            wanted = rng.sample(candidates, min(len(candidates), rng.randint(1, args.max_seats)))
+
+            booking = request("POST", "/api/book-seats", headers, {"seat_ids": wanted, "user_email": email})
+            if booking is None or booking.status_code != 200:
+                continue
+            body = booking.json()
+            reference = body["booking_reference"]
+            expires_at = datetime.fromisoformat(body["expires_at"])
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            record("bookings", {"reference": reference, "seat_ids": sorted(wanted),
+                                "expires_at": expires_at.isoformat()})
+
+            action = rng.random()
+            if action < 0.6:
+                started = _now()
+                response = request("POST", "/api/confirm-payment", headers, {"booking_reference": reference})
+                if response is not None:
+                    record("confirms", {
+                        "reference": reference, "status": response.status_code,
+                        "seat_ids": sorted(response.json().get("seat_ids", [])) if response.status_code == 200 else [],
+                        "started_at": started.isoformat(), "expires_at": expires_at.isoformat()
+                    })
+            elif action < 0.85:
+                response = request("POST", "/api/cancel-booking", headers, {"booking_reference": reference})
+                if response is not None:
+                    record("cancels", {"reference": reference, "status": response.status_code})
+            else:
+                # Abandon the lock, then try to pay after it has expired
+                remaining = (expires_at - _now()).total_seconds()
+                if time.monotonic() + remaining + 0.1 >= deadline:
+                    continue
+                time.sleep(max(0.0, remaining) + 0.05)
+                response = request("POST", "/api/confirm-payment", headers, {"booking_reference": reference})
+                if response is not None:
+                    record("late_confirms", {"reference": reference, "status": response.status_code})
+
+    threads = [threading.Thread(target=client_loop, args=(index,)) for index in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return observed
+
+def check_invariants(db_path: str, event_id: int, observed: dict, final_booking_status: int) -> list:
+    """Return a list of failure messages (empty when every invariant holds)"""
+    failures = []
+    bookings = {booking["reference"]: booking for booking in observed["bookings"]}
+    successful_confirms = [confirm for confirm in observed["confirms"] if confirm["status"] == 200]
+
+    # 1. No seat confirmed for two different bookings
+    owner = {}
+    for confirm in successful_confirms:
+        for seat_id in confirm["seat_ids"]:
+            if seat_id in owner and owner[seat_id] != confirm["reference"]:
+                failures.append(f"Seat {seat_id} confirmed for both {owner[seat_id]} and {confirm['reference']}")
+            owner[seat_id] = confirm["reference"]
+
+    # 2. A confirm covers exactly the seats its booking locked
+    for confirm in successful_confirms:
+        booked = bookings[confirm["reference"]]["seat_ids"]
+        if confirm["seat_ids"] != booked:
+            failures.append(
+                f"Booking {confirm['reference']} locked seats {booked} but payment confirmed {confirm['seat_ids']}"
+            )
+
+    # 3. No payment accepted after the lock expired
+    for confirm in successful_confirms:
+        if datetime.fromisoformat(confirm["started_at"]) > datetime.fromisoformat(confirm["expires_at"]):
+            failures.append(f"Booking {confirm['reference']} was paid after its lock expired")
+    for confirm in observed["late_confirms"]:
+        if confirm["status"] == 200:
+            failures.append(f"Booking {confirm['reference']} was paid after its lock expired")
+
+    # 4. Database agrees with the clients, and rows are consistent
+    connection = sqlite3.connect(db_path)
+    rows = connection.execute(
+        "SELECT id, status, locked_at, booking_reference FROM seats WHERE event_id = ?", (event_id,)
+    ).fetchall()
+    connection.close()
+
+    db_booked = {seat_id: reference for seat_id, status, _, reference in rows if status == "booked"}
+    if set(db_booked) != set(owner):
+        failures.append(
+            f"Booked seats in the database {sorted(db_booked)} != confirmed by clients {sorted(owner)}"
+        )
+    for seat_id, reference in db_booked.items():
+        if seat_id in owner and owner[seat_id] != reference:
+            failures.append(f"Seat {seat_id} is booked under {reference} but was paid under {owner[seat_id]}")
+
+    for seat_id, status, locked_at, reference in rows:
+        if status == "open" and (locked_at is not None or reference is not None):
+            failures.append(f"Seat {seat_id} is open but still carries lock data")
+        if status == "locked" and (locked_at is None or reference is None):
+            failures.append(f"Seat {seat_id} is locked without a timestamp or reference")
+        if status == "booked" and reference is None:
+            failures.append(f"Seat {seat_id} is booked without a reference")
+
+    # 5. After the lock window every unsold seat must be bookable again
+    if final_booking_status not in (200, None):
+        failures.append(f"Unsold seats could not be re-booked after every lock expired (HTTP {final_booking_status})")
+
+    return failures
+
+def run_round(round_index: int, db_path: str, users: list, args) -> bool:
+    from database import SessionLocal
+    from routes.admin import create_seats_for_event
+    from models.movie import Movie
+    from models.event import Event
+
+    db = SessionLocal()
+    movie = Movie(title=f"Stress Movie {round_index}", description="Concurrency harness")
+    db.add(movie)
+    db.commit()
+    event = Event(movie_id=movie.id, start_time=datetime.utcnow() + timedelta(days=1))
+    db.add(event)
+    db.commit()
+    event_id = event.id
+    create_seats_for_event(event_id, args.seats, db)
+    db.close()
+
+    started = time.perf_counter()
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(args.processes) as pool:
+        results = pool.starmap(worker, [
+            (index, db_path, event_id, users, vars(args)) for index in range(args.processes)
+        ])
+
+    observed = {"bookings": [], "confirms": [], "cancels": [], "late_confirms": [], "errors": []}
+    for result in results:
+        for key in observed:
+            observed[key].extend(result[key])
+
+    # Let every remaining lock expire, then claim all unsold seats in one booking
+    time.sleep(args.lock_seconds + 0.2)
+    from fastapi.testclient import TestClient
+    from main import app
+    client = TestClient(app)
+    email, headers = users[0]
+    seats = client.get(f"/api/events/{event_id}/seats", headers=headers).json()["seats"]
+    unsold = [seat["seat_id"] for seat in seats if seat["status"] != "booked"]
+    final_status = None
+    if unsold:
+        final_status = client.post("/api/book-seats", headers=headers,
+                                   json={"seat_ids": unsold, "user_email": email}).status_code
+
+    failures = check_invariants(db_path, event_id, observed, final_status)
+
+    confirmed = sum(1 for confirm in observed["confirms"] if confirm["status"] == 200)
+    print(
+        f"Round {round_index}: {time.perf_counter() - started:.1f}s, {len(observed['bookings'])} bookings, "
+        f"{confirmed} paid, {len(observed['cancels'])} cancelled, "
+        f"{len(observed['late_confirms'])} late payments refused, {len(observed['errors'])} server errors"
+    )
+    for error in observed["errors"][:5]:
+        print(f"  error: {error}")
+    for failure in failures:
+        print(f"  ❌ {failure}")
+    return not failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Booking concurrency stress harness")
+    parser.add_argument("--processes", type=int, default=2, help="Worker processes (default: 2)")
+    parser.add_argument("--threads", type=int, default=4, help="Client threads per process (default: 4)")
+    parser.add_argument("--seats", type=int, default=30, help="Seats in each round's event (default: 30)")
+    parser.add_argument("--max-seats", type=int, default=3, help="Max seats per booking (default: 3)")
+    parser.add_argument("--duration", type=float, default=5, help="Seconds of traffic per round (default: 5)")
+    parser.add_argument("--lock-seconds", type=float, default=1.5, help="Seat lock window (default: 1.5)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    parser.add_argument("--soak", action="store_true", help="Repeat rounds until --soak-minutes elapse")
+    parser.add_argument("--soak-minutes", type=float, default=30, help="Soak length (default: 30)")
+    parser.add_argument("--db", help="SQLite file to use (default: a fresh temp file)")
+    args = parser.parse_args()
+
+    db_path = use_scratch_database(args.db)
+    _configure_environment(db_path, args.lock_seconds)
+
+    from fastapi.testclient import TestClient
+    from database import init_db
+    from main import app
+
+    init_db()
+    client = TestClient(app)
+    users = []
+    for index in range(args.processes * args.threads):
+        email = f"stress{index}@example.com"
+        client.post("/api/auth/register", json={"email": email, "password": PASSWORD, "full_name": f"Stress {index}"})
+        token = client.post("/api/auth/login", json={"email": email, "password": PASSWORD}).json()["access_token"]
+        users.append((email, {"Authorization": f"Bearer {token}"}))
+
+    print(f"Database: {db_path}")
+    print(f"{args.processes} processes x {args.threads} threads, {args.seats} seats, "
+          f"{args.lock_seconds}s locks, {args.duration}s per round")
+
+    soak_deadline = time.monotonic() + args.soak_minutes * 60
+    round_index = 0
+    all_passed = True
+    while True:
+        round_index += 1
+        args.seed += 1
+        if not run_round(round_index, db_path, users, args):
+            all_passed = False
+            break
+        if not args.soak or time.monotonic() >= soak_deadline:
+            break
+
+    print("✅ All invariants held" if all_passed else "❌ Invariant violated")
+    sys.exit(0 if all_passed else 1)
+
+if __name__ == "__main__":
+    main()
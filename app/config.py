@@ -14,13 +14,106 @@ class Config:
         self.debug = os.getenv("DEBUG", "true").lower() == "true"
         self.base_url = os.getenv("BASE_URL", "http://localhost:8000")
         
+        # Tables are created by `python manage.py init-db` (deploy step);
+        # enable to also create missing tables when a worker starts
+        self.create_tables_on_startup = os.getenv("CREATE_TABLES_ON_STARTUP", "false").lower() == "true"
+        
+        # Password hashing (changing scheme/rounds rehashes on next login)
+        self.password_hash_scheme = os.getenv("PASSWORD_HASH_SCHEME", "bcrypt")
+        self.password_hash_rounds = int(os.getenv("PASSWORD_HASH_ROUNDS", "12"))
+        self.password_hash_workers = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+        self.password_hash_queue_size = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "32"))
+        
+        # Authenticated-user and verified-token caches (per worker process)
+        self.token_cache_size = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+        self.user_cache_size = int(os.getenv("USER_CACHE_SIZE", "10000"))
+        self.user_cache_ttl_seconds = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+        self.auth_claims_only_reads = os.getenv("AUTH_CLAIMS_ONLY_READS", "false").lower() == "true"
+        
+        # Rate limiting ("requests/seconds"); backend "memory" is per worker,
+        # "database" shares budgets between workers through DATABASE_URL
+        self.rate_limit_enabled = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+        self.rate_limit_backend = os.getenv("RATE_LIMIT_BACKEND", "memory")
+        self.rate_limit_max_keys = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+        self.rate_limit_auth = os.getenv("RATE_LIMIT_AUTH", "10/60")
+        self.rate_limit_auth_per_ip = os.getenv("RATE_LIMIT_AUTH_PER_IP", "30/60")
+        self.rate_limit_seat_reads = os.getenv("RATE_LIMIT_SEAT_READS", "120/60")
+        self.rate_limit_booking_writes = os.getenv("RATE_LIMIT_BOOKING_WRITES", "20/60")
+        
+        # Adaptive load shedding (AIMD concurrency limit per worker)
+        self.load_shedding_enabled = os.getenv("LOAD_SHEDDING_ENABLED", "true").lower() == "true"
+        self.load_shed_min_limit = int(os.getenv("LOAD_SHED_MIN_LIMIT", "4"))
+        self.load_shed_max_limit = int(os.getenv("LOAD_SHED_MAX_LIMIT", "100"))
+        self.load_shed_target_latency_ms = float(os.getenv("LOAD_SHED_TARGET_LATENCY_MS", "500"))
+        self.load_shed_db_target_latency_ms = float(os.getenv("LOAD_SHED_DB_TARGET_LATENCY_MS", "50"))
+        
+        # Response compression (brotli/zstd need the `brotli`/`zstandard` packages)
+        self.compression_enabled = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+        self.compression_min_size = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+        self.compression_algorithms = [
+            name.strip() for name in os.getenv("COMPRESSION_ALGORITHMS", "zstd,br,gzip").split(",") if name.strip()
+        ]
+        self.compression_cache_size = int(os.getenv("COMPRESSION_CACHE_SIZE", "256"))
+        
+        # Keyset-paginated lists (events, movies, search): page size per ?limit=
+        self.page_size_default = int(os.getenv("PAGE_SIZE_DEFAULT", "100"))
+        self.page_size_max = int(os.getenv("PAGE_SIZE_MAX", "500"))
+        
+        # Opt-in per-request SQL profiling (Server-Timing header + log line)
+        self.sql_profiling = os.getenv("SQL_PROFILING", "false").lower() == "true"
+        self.sql_n_plus_one_threshold = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+        
+        # JSON access log (written off the request path by a queue listener thread)
+        self.access_log_enabled = os.getenv("ACCESS_LOG_ENABLED", "false").lower() == "true"
+        self.access_log_file = os.getenv("ACCESS_LOG_FILE", "")
+        self.access_log_sample_rate = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "1.0"))
+        self.access_log_slow_ms = float(os.getenv("ACCESS_LOG_SLOW_MS", "1000"))
+        self.access_log_queue_size = int(os.getenv("ACCESS_LOG_QUEUE_SIZE", "10000"))
+        
+        # In-process tracing (admin: /api/admin/traces, optional JSON-lines export)
+        self.tracing_enabled = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+        self.trace_sample_rate = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+        self.trace_buffer_size = int(os.getenv("TRACE_BUFFER_SIZE", "100"))
+        self.trace_export_file = os.getenv("TRACE_EXPORT_FILE", "")
+        
+        # Opt-in sampling profiler (admin: /api/admin/profiles)
+        self.profiling_enabled = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+        self.profile_sample_rate = float(os.getenv("PROFILE_SAMPLE_RATE", "0.01"))
+        self.profile_path_pattern = os.getenv("PROFILE_PATH_PATTERN", "")
+        # Header trigger: off unless named; honoured with PROFILE_SECRET as its value or an admin token
+        self.profile_header = os.getenv("PROFILE_HEADER", "")
+        self.profile_secret = os.getenv("PROFILE_SECRET", "")
+        self.profile_interval_ms = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+        self.profile_buffer_size = int(os.getenv("PROFILE_BUFFER_SIZE", "50"))
+        
+        # Health probes (readiness DB check is cached so probes stay cheap)
+        self.health_cache_seconds = float(os.getenv("HEALTH_CACHE_SECONDS", "2"))
+        self.health_max_db_latency_ms = float(os.getenv("HEALTH_MAX_DB_LATENCY_MS", "250"))
+        
+        # Streamlit dashboard HTTP client (pooled keep-alive session + cached GETs)
+        self.dashboard_http_pool_size = int(os.getenv("DASHBOARD_HTTP_POOL_SIZE", "10"))
+        self.dashboard_http_timeout_seconds = float(os.getenv("DASHBOARD_HTTP_TIMEOUT_SECONDS", "10"))
+        self.dashboard_cache_ttl_seconds = int(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "30"))
+        self.dashboard_token_refresh_margin_seconds = int(os.getenv("DASHBOARD_TOKEN_REFRESH_MARGIN_SECONDS", "60"))
+        self.dashboard_seat_grid_threshold = int(os.getenv("DASHBOARD_SEAT_GRID_THRESHOLD", "150"))
+        
+        # Archival of past events (0 interval = scheduler disabled, use archive.py)
+        self.archive_after_days = int(os.getenv("ARCHIVE_AFTER_DAYS", "7"))
+        self.archive_batch_size = int(os.getenv("ARCHIVE_BATCH_SIZE", "100"))
+        self.archive_interval_minutes = int(os.getenv("ARCHIVE_INTERVAL_MINUTES", "0"))
+        
+        # Seat reservation window (fractional minutes allowed, e.g. 0.05 for expiry tests)
+        self.seat_lock_duration_minutes = float(os.getenv("SEAT_LOCK_DURATION_MINUTES", "10"))
+        
+        # Token lifetimes
+        self.access_token_expire_minutes = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+        self.refresh_token_expire_days = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+        
         # Hardcoded constants
         self.algorithm = "HS256"
-        self.access_token_expire_minutes = 30
         self.admin_name = "System Administrator"
         self.app_name = "Movie Ticketing API"
         self.app_version = "1.0.0"
-        self.seat_lock_duration_minutes = 10
     
     def _load_env_file(self):
         try:
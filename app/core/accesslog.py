@@ -0,0 +1,119 @@
+import json
+import logging
+import queue
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from fastapi.responses import JSONResponse
+from core.context import start_request, timed_stage
+from core.tracing import get_tracer
+
+logger = logging.getLogger("bookmemovie.access")
+logger.propagate = False
+tracer = get_tracer(__name__)
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """Hand records to the listener thread untouched; drop them if the queue is full.
+
+    The stock QueueHandler formats the record in the calling thread; here
+    JSON encoding happens in the listener thread instead.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class JSONLineFormatter(logging.Formatter):
+    def format(self, record):
+        return json.dumps(record.msg, default=str)
+
+def start_access_log(path: str = "", queue_size: int = 10000) -> QueueListener:
+    """Attach the queue pipeline to the access logger; stop() the listener on shutdown"""
+    handler = logging.FileHandler(path) if path else logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JSONLineFormatter())
+    log_queue = queue.Queue(maxsize=queue_size)
+    logger.addHandler(_NonBlockingQueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    return listener
+
+def dropped_records() -> int:
+    """Records dropped because the queue was full, since the access log started"""
+    return sum(handler.dropped for handler in logger.handlers if isinstance(handler, _NonBlockingQueueHandler))
+
+def stop_access_log(listener: QueueListener):
+    listener.stop()  # flushes what is still queued
+    for handler in list(logger.handlers):
+        if isinstance(handler, _NonBlockingQueueHandler):
+            logger.removeHandler(handler)
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse that reports its rendering time as the "serialize" stage and span"""
+
+    def render(self, content) -> bytes:
+        with timed_stage("serialize"), tracer.start_as_current_span("http.render"):
+            return super().render(content)
+
+class AccessLogMiddleware:
+    """One JSON line per request with route, user, event and stage timings.
+
+    Logs a `sample_rate` fraction of requests, plus every 5xx and every
+    request slower than `slow_ms`.
+    """
+
+    def __init__(self, app, sample_rate: float = 1.0, slow_ms: float = 1000):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow = slow_ms / 1000
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_context = start_request()
+        status_holder = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            status = status_holder[0]
+            if status >= 500 or duration >= self.slow or random.random() < self.sample_rate:
+                route = scope.get("route")
+                stages = request_context.stages
+                event_id = request_context.event_id
+                if event_id is None:
+                    event_id = scope.get("path_params", {}).get("event_id")
+                logger.info({
+                    "ts": datetime.now(timezone.utc).isoformat(),
+                    "method": scope["method"],
+                    "route": getattr(route, "path", None),
+                    "path": scope["path"],
+                    "status": status,
+                    "duration_ms": round(duration * 1000, 2),
+                    "user_id": request_context.user_id,
+                    "event_id": int(event_id) if isinstance(event_id, str) and event_id.isdigit() else event_id,
+                    "auth_ms": round(stages.get("auth", 0.0) * 1000, 2),
+                    "db_ms": round(request_context.query_time * 1000, 2),
+                    "serialize_ms": round(stages.get("serialize", 0.0) * 1000, 2),
+                    "queries": request_context.query_count
+                })
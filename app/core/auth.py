@@ -1,19 +1,53 @@
+import asyncio
+import hashlib
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
 from database import get_db
 from models.user import User, UserRole
+from models.session import UserSession
+from core.cache import TTLCache
+from core.context import note_user, timed_stage
+from core.tracing import get_tracer
 from config import get_config
 
 # Get config once at module level - no more repeated env var reads!
 config = get_config()
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    """Password hashing context, built on first use (passlib is slow to import).
+    
+    The configured scheme/cost is the default, anything else (older schemes
+    or cost factors) is "deprecated" and gets rehashed on login.
+    """
+    from passlib.context import CryptContext
+    return CryptContext(
+        schemes=list(dict.fromkeys([config.password_hash_scheme, "bcrypt"])),
+        default=config.password_hash_scheme,
+        deprecated="auto",
+        **{f"{config.password_hash_scheme}__rounds": config.password_hash_rounds}
+    )
+
+# Dedicated pool for password hashing so a login burst can't starve the
+# request threadpool that serves bookings. Work beyond workers + queue is rejected.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=config.password_hash_workers,
+    thread_name_prefix="password-hash"
+)
+_hash_slots = threading.BoundedSemaphore(
+    config.password_hash_workers + config.password_hash_queue_size
+)
 
 # JWT Bearer token with better OpenAPI documentation
 security = HTTPBearer(
@@ -21,13 +55,75 @@ security = HTTPBearer(
     description="Enter your JWT token (get it from /api/auth/login)"
 )
 
+tracer = get_tracer(__name__)
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """The user fields routes need, safe to cache and share between requests"""
+    id: int
+    email: str
+    role: UserRole
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "AuthenticatedUser":
+        return cls(id=user.id, email=user.email, role=user.role, is_active=user.is_active == 1)
+
+# Verified token claims keyed by the raw token, so repeated requests from
+# the same session skip signature verification and claim parsing
+token_cache = TTLCache(
+    maxsize=config.token_cache_size,
+    ttl=config.access_token_expire_minutes * 60
+)
+
+# Authenticated users keyed by token subject (email)
+user_cache = TTLCache(maxsize=config.user_cache_size, ttl=config.user_cache_ttl_seconds)
+
+def invalidate_cached_user(email: str):
+    """Drop a user from the auth cache so the next request re-reads the database"""
+    user_cache.pop(email)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user_on_change(mapper, connection, target):
+    """Any ORM change to a user (role, deactivation, email) evicts the cached copy"""
+    invalidate_cached_user(target.email)
+    for old_email in inspect(target).attrs.email.history.deleted or ():
+        invalidate_cached_user(old_email)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+async def _run_in_hash_pool(func, *args):
+    """Run a password hashing function in the bounded hash pool"""
+    if not _hash_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many login attempts in progress. Please retry shortly.",
+            headers={"Retry-After": "1"},
+        )
+    
+    future = _hash_executor.submit(func, *args)
+    # Release the slot when the work finishes, even if the client disconnects
+    future.add_done_callback(lambda _: _hash_slots.release())
+    return await asyncio.wrap_future(future)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """Verify a password off the request threads.
+    
+    Returns (valid, new_hash); new_hash is set when the stored hash uses an
+    outdated scheme or cost factor and should be replaced.
+    """
+    return await _run_in_hash_pool(get_pwd_context().verify_and_update, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password off the request threads"""
+    return await _run_in_hash_pool(get_pwd_context().hash, password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token"""
@@ -47,46 +143,178 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     )
     return encoded_jwt
 
+def _hash_refresh_token(refresh_token: str) -> str:
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+def create_refresh_token(user_id: int, db: Session, family_id: Optional[str] = None) -> str:
+    """Start (or continue) a session and return its opaque refresh token"""
+    refresh_token = secrets.token_urlsafe(32)
+    now = datetime.now(timezone.utc)
+    
+    db.add(UserSession(
+        user_id=user_id,
+        family_id=family_id or secrets.token_hex(16),
+        token_hash=_hash_refresh_token(refresh_token),
+        expires_at=now + timedelta(days=config.refresh_token_expire_days),
+        created_at=now
+    ))
+    db.commit()
+    return refresh_token
+
+def rotate_refresh_token(refresh_token: str, db: Session) -> Optional[tuple[User, str]]:
+    """Exchange a refresh token for a new one.
+    
+    Returns (user, new_refresh_token), or None if the token is unknown,
+    expired or revoked. Presenting an already-rotated token revokes the
+    whole session family, since it means the token was copied.
+    """
+    now = datetime.now(timezone.utc)
+    session = db.query(UserSession).filter(
+        UserSession.token_hash == _hash_refresh_token(refresh_token)
+    ).first()
+    
+    if session is None:
+        return None
+    
+    if session.revoked_at is not None:
+        revoke_session_family(session.family_id, db)
+        return None
+    
+    if session.expires_at.replace(tzinfo=timezone.utc) <= now:
+        return None
+    
+    # Revoke atomically so two concurrent refreshes can't both succeed
+    revoked = db.query(UserSession).filter(
+        UserSession.id == session.id,
+        UserSession.revoked_at.is_(None)
+    ).update({UserSession.revoked_at: now}, synchronize_session=False)
+    db.commit()
+    if revoked != 1:
+        return None
+    
+    user = db.query(User).filter(User.id == session.user_id).first()
+    if user is None or user.is_active != 1:
+        return None
+    
+    return user, create_refresh_token(user.id, db, family_id=session.family_id)
+
+def revoke_session_family(family_id: str, db: Session):
+    """Revoke every refresh token issued from one login"""
+    db.query(UserSession).filter(
+        UserSession.family_id == family_id,
+        UserSession.revoked_at.is_(None)
+    ).update({UserSession.revoked_at: datetime.now(timezone.utc)}, synchronize_session=False)
+    db.commit()
+
+def revoke_refresh_token(refresh_token: str, db: Session) -> bool:
+    """Log out: revoke the session the refresh token belongs to"""
+    session = db.query(UserSession).filter(
+        UserSession.token_hash == _hash_refresh_token(refresh_token)
+    ).first()
+    if session is None:
+        return False
+    revoke_session_family(session.family_id, db)
+    return True
+
+def purge_expired_sessions(user_id: int, db: Session):
+    """Keep the session table compact by dropping a user's expired sessions"""
+    db.query(UserSession).filter(
+        UserSession.user_id == user_id,
+        UserSession.expires_at <= datetime.now(timezone.utc)
+    ).delete(synchronize_session=False)
+    db.commit()
+
 def verify_token(token: str) -> Optional[dict]:
-    """Verify and decode JWT token"""
-    try:
-        payload = jwt.decode(
-            token, 
-            config.secret_key, 
-            algorithms=[config.algorithm]
-        )
-        email: str = payload.get("sub")
-        if email is None:
+    """Verify and decode JWT token, reusing earlier verifications of the same token"""
+    token_data = token_cache.get(token)
+    if token_data is not None:
+        return token_data
+    
+    with tracer.start_as_current_span("auth.jwt_decode"):
+        try:
+            payload = jwt.decode(
+                token, 
+                config.secret_key, 
+                algorithms=[config.algorithm]
+            )
+        except JWTError:
             return None
-        return {"email": email, "role": payload.get("role")}
-    except JWTError:
+    
+    email: str = payload.get("sub")
+    if email is None:
         return None
-
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current user from JWT token"""
+    token_data = {"email": email, "role": payload.get("role"), "uid": payload.get("uid")}
+    
+    # Cache until the token expires, so expiry is still honoured on a hit
+    exp = payload.get("exp")
+    if exp is not None:
+        remaining = exp - time.time()
+        if remaining > 0:
+            token_cache.set(token, token_data, ttl=min(remaining, token_cache.ttl))
     
-    credentials_exception = HTTPException(
+    return token_data
+
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+@timed_stage("auth")
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """Get current user from JWT token (full database row)"""
     
     # Verify token
     token_data = verify_token(credentials.credentials)
     if token_data is None:
-        raise credentials_exception
+        raise credentials_exception()
     
     # Get user from database
-    user = db.query(User).filter(User.email == token_data["email"]).first()
+    with tracer.start_as_current_span("auth.user_lookup", {"cache_hit": False}):
+        user = db.query(User).filter(User.email == token_data["email"]).first()
     if user is None:
-        raise credentials_exception
+        raise credentials_exception()
     
+    user_cache.set(user.email, AuthenticatedUser.from_user(user))
+    note_user(user.id)
     return user
 
-def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
+@timed_stage("auth")
+def get_authenticated_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> AuthenticatedUser:
+    """Get current user from JWT token, served from the user cache when possible"""
+    
+    # Verify token
+    token_data = verify_token(credentials.credentials)
+    if token_data is None:
+        raise credentials_exception()
+    
+    with tracer.start_as_current_span("auth.user_lookup") as span:
+        cached_user = user_cache.get(token_data["email"])
+        span.set_attribute("cache_hit", cached_user is not None)
+        if cached_user is not None:
+            note_user(cached_user.id)
+            return cached_user
+        
+        # Cache miss - load only the columns we need
+        row = db.query(User.id, User.email, User.role, User.is_active).filter(
+            User.email == token_data["email"]
+        ).first()
+    if row is None:
+        raise credentials_exception()
+    
+    user = AuthenticatedUser(id=row.id, email=row.email, role=row.role, is_active=row.is_active == 1)
+    user_cache.set(user.email, user)
+    note_user(user.id)
+    return user
+
+def get_current_admin_user(current_user: AuthenticatedUser = Depends(get_authenticated_user)) -> AuthenticatedUser:
     """Ensure current user is an admin"""
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
@@ -95,8 +323,35 @@ def get_current_admin_user(current_user: User = Depends(get_current_user)) -> Us
         )
     return current_user
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+def get_current_active_user(current_user: AuthenticatedUser = Depends(get_authenticated_user)) -> AuthenticatedUser:
     """Ensure current user is active"""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+@timed_stage("auth")
+def get_reader_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> AuthenticatedUser:
+    """Authenticate a read-only request.
+    
+    With AUTH_CLAIMS_ONLY_READS enabled the user is built from the signed token
+    claims alone (no users-table lookup); deactivation then takes effect when
+    the token expires. Otherwise this is the same as get_current_active_user.
+    """
+    if config.auth_claims_only_reads:
+        token_data = verify_token(credentials.credentials)
+        if token_data is None:
+            raise credentials_exception()
+        if token_data["uid"] is not None and token_data["role"] is not None:
+            try:
+                role = UserRole(token_data["role"])
+            except ValueError:
+                raise credentials_exception()
+            note_user(token_data["uid"])
+            return AuthenticatedUser(
+                id=token_data["uid"], email=token_data["email"], role=role, is_active=True
+            )
+    
+    return get_current_active_user(get_authenticated_user(credentials, db))
@@ -0,0 +1,159 @@
+"""Response compression: zstd, brotli or gzip, whichever the client accepts first.
+
+brotli and zstd are used when their packages (`brotli`, `zstandard`) are
+installed; gzip always works. Only complete bodies of compressible types above
+a minimum size are compressed. Compressed bytes are cached by content hash,
+so an unchanged seat map polled by many clients is compressed once.
+"""
+import gzip
+import hashlib
+from typing import Optional
+import anyio
+from core.cache import TTLCache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Levels favour speed: responses are small and compressed on the request path
+def _gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+def _brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=4)
+
+def _zstd(data: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=3).compress(data)
+
+CODECS = {"gzip": _gzip}
+if brotli is not None:
+    CODECS["br"] = _brotli
+if zstandard is not None:
+    CODECS["zstd"] = _zstd
+
+COMPRESSIBLE_TYPES = (
+    "application/json", "text/", "application/javascript", "application/xml", "image/svg+xml"
+)
+
+# Bodies larger than this are compressed in a worker thread, not on the event loop
+_THREAD_THRESHOLD = 256 * 1024
+
+def parse_accept_encoding(header: str) -> dict:
+    """Accept-Encoding as {coding: q}"""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+class CompressionMiddleware:
+    """Compress responses of at least `min_size` bytes with the first
+    algorithm in `preference` the client accepts"""
+
+    def __init__(self, app, min_size: int = 1024, preference: tuple = ("zstd", "br", "gzip"),
+                 cache_size: int = 256):
+        self.app = app
+        self.min_size = min_size
+        self.preference = [coding for coding in preference if coding in CODECS]
+        self.cache = TTLCache(maxsize=cache_size, ttl=300)
+
+    def choose_encoding(self, accept_encoding: str) -> Optional[str]:
+        accepted = parse_accept_encoding(accept_encoding)
+        for coding in self.preference:
+            if accepted.get(coding, accepted.get("*", 0)) > 0:
+                return coding
+        return None
+
+    async def compress(self, coding: str, body: bytes) -> bytes:
+        key = (coding, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = self.cache.get(key)
+        if compressed is None:
+            if len(body) > _THREAD_THRESHOLD:
+                compressed = await anyio.to_thread.run_sync(CODECS[coding], body)
+            else:
+                compressed = CODECS[coding](body)
+            self.cache.set(key, compressed)
+        return compressed
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.preference:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        coding = self.choose_encoding(accept_encoding) if accept_encoding else None
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = {name.lower(): value for name, value in message.get("headers", [])}
+                content_type = headers.get(b"content-type", b"").decode("latin-1")
+                content_length = headers.get(b"content-length")
+                if (
+                    b"content-encoding" in headers
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                    or (content_length is not None and int(content_length) < self.min_size)
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Hold the start until the body shows whether it's worth compressing
+                    start_message = message
+                return
+
+            if message["type"] == "http.response.body":
+                body = message.get("body", b"")
+                if message.get("more_body", False) or len(body) < self.min_size:
+                    # Streaming responses and small bodies go out as they are
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                compressed = await self.compress(coding, body)
+                headers = [
+                    (name, value) for name, value in start_message.get("headers", [])
+                    if name.lower() not in (b"content-length", b"vary")
+                ]
+                vary = [value for name, value in start_message.get("headers", []) if name.lower() == b"vary"]
+                headers += [
+                    (b"content-encoding", coding.encode()),
+                    (b"content-length", str(len(compressed)).encode()),
+                    (b"vary", b", ".join(vary + [b"Accept-Encoding"]))
+                ]
+                await send({**start_message, "headers": headers})
+                await send({"type": "http.response.body", "body": compressed})
+                return
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
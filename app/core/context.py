@@ -0,0 +1,75 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+class RequestContext:
+    """Per-request measurements shared by the profiling/logging middlewares.
+
+    The object is stored in a ContextVar; FastAPI copies the context into
+    the threadpool, so dependencies and SQLAlchemy hooks running in worker
+    threads update the same instance.
+    """
+
+    def __init__(self):
+        self.query_count = 0
+        self.query_time = 0.0
+        self.statements = {}  # SQL text -> executions
+        self.stages = {}      # stage name -> seconds
+        self.open_stages = set()
+        self.user_id = None
+        self.event_id = None  # when the route's path doesn't carry it (book-seats)
+        self.profile = None   # core.profiler.Profile when this request is sampled
+
+    def record_query(self, statement: str, seconds: float):
+        self.query_count += 1
+        self.query_time += seconds
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def add_stage(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+_current_request: ContextVar[Optional[RequestContext]] = ContextVar("current_request", default=None)
+
+def current_request() -> Optional[RequestContext]:
+    """The context of the request being served, if a middleware started one"""
+    return _current_request.get()
+
+def start_request() -> RequestContext:
+    """Return the current request context, creating it if needed"""
+    context = _current_request.get()
+    if context is None:
+        context = RequestContext()
+        _current_request.set(context)
+    return context
+
+@contextmanager
+def timed_stage(name: str):
+    """Add the block's duration to a stage of the current request.
+
+    Also usable as a decorator. A stage nested in itself (a dependency that
+    calls another timed dependency) is only counted once.
+    """
+    context = _current_request.get()
+    if context is None or name in context.open_stages:
+        yield
+        return
+    context.open_stages.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        context.open_stages.discard(name)
+        context.add_stage(name, time.perf_counter() - started)
+
+def note_user(user_id):
+    """Record who the current request is for (used by the access log)"""
+    context = _current_request.get()
+    if context is not None:
+        context.user_id = user_id
+
+def note_event(event_id):
+    """Record which event the current request is about (used by the access log)"""
+    context = _current_request.get()
+    if context is not None:
+        context.event_id = event_id
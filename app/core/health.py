@@ -0,0 +1,91 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import func, text
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+from models.seat import Seat
+
+class ReadinessProbe:
+    """Database readiness check whose result is cached for a short interval.
+
+    However many load balancer probes arrive, at most one probe query runs
+    at a time and at most once per `cache_seconds`; probes arriving while
+    it runs get the previous (stale) result instead of waiting. Called on
+    the event loop: only the probe query itself goes to the threadpool, so
+    a cached answer doesn't queue behind busy request threads.
+    """
+
+    def __init__(self, engine: Engine, cache_seconds: float, max_db_latency_ms: float,
+                 lock_duration_minutes: float):
+        self.engine = engine
+        self.cache_seconds = cache_seconds
+        self.max_db_latency = max_db_latency_ms / 1000
+        self.lock_duration = timedelta(minutes=lock_duration_minutes)
+        self._result = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    async def check(self) -> dict:
+        if self._is_fresh():
+            return self._result
+
+        # Never queue behind a running probe: when the pool is exhausted it can
+        # wait up to the pool timeout, and probes would pile up exactly then
+        if not self._lock.acquire(blocking=False):
+            return self._result if self._result is not None else {"ready": False, "database": "checking"}
+        try:
+            # Another probe may have refreshed the result meanwhile
+            if not self._is_fresh():
+                self._result = await run_in_threadpool(self._probe)
+                self._checked_at = time.monotonic()
+            return self._result
+        finally:
+            self._lock.release()
+
+    def _is_fresh(self) -> bool:
+        return self._result is not None and time.monotonic() - self._checked_at < self.cache_seconds
+
+    def _pool_saturation(self) -> dict:
+        pool = self.engine.pool
+        size = getattr(pool, "size", lambda: 0)()
+        max_overflow = getattr(pool, "_max_overflow", 0)
+        checked_out = getattr(pool, "checkedout", lambda: 0)()
+        capacity = size + max(max_overflow, 0)
+        return {
+            "checked_out": checked_out,
+            "capacity": capacity,
+            "saturation": round(checked_out / capacity, 3) if capacity > 0 else 0.0
+        }
+
+    def _probe(self) -> dict:
+        started = time.perf_counter()
+        try:
+            with self.engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                db_latency = time.perf_counter() - started
+
+                # Locks past their expiry that nothing has released yet
+                cutoff = datetime.now(timezone.utc) - self.lock_duration
+                expired_locks = connection.execute(
+                    Seat.__table__.select()
+                    .with_only_columns(func.count())
+                    .where(Seat.status == "locked", Seat.locked_at < cutoff)
+                ).scalar()
+        except Exception as exc:
+            return {
+                "ready": False,
+                "database": "unavailable",
+                "error": exc.__class__.__name__,
+                "pool": self._pool_saturation()
+            }
+
+        too_slow = db_latency > self.max_db_latency
+        return {
+            "ready": not too_slow,
+            "database": "slow" if too_slow else "ok",
+            "db_latency_ms": round(db_latency * 1000, 2),
+            "pool": self._pool_saturation(),
+            "expired_lock_backlog": expired_locks,
+            "checked_at": datetime.now(timezone.utc).isoformat()
+        }
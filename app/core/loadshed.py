@@ -0,0 +1,174 @@
+import json
+import re
+import time
+from collections import deque
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Request priorities: under pressure LOW is shed first, NORMAL only when
+# badly overloaded, CRITICAL (booking and payment) never.
+LOW, NORMAL, CRITICAL = "low", "normal", "critical"
+
+_LOW_PRIORITY = [
+    ("GET", re.compile(r"^/api/events$")),        # catalog browsing
+    ("GET", re.compile(r"^/api/admin/")),         # admin lists and stats
+]
+_CRITICAL_PRIORITY = [
+    ("POST", re.compile(r"^/api/(book-seats|confirm-payment|cancel-booking)$")),
+    ("GET", re.compile(r"^/(health|metrics)")),   # probes must see the real state
+]
+
+def request_priority(method: str, path: str) -> str:
+    for route_method, pattern in _CRITICAL_PRIORITY:
+        if method == route_method and pattern.match(path):
+            return CRITICAL
+    for route_method, pattern in _LOW_PRIORITY:
+        if method == route_method and pattern.match(path):
+            return LOW
+    return NORMAL
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit driven by observed request and DB latency.
+
+    Every `window_seconds` the limit grows by one while latency is under
+    target and is multiplied by `backoff` once it is over. In-flight counts
+    are only touched from the event loop; DB latency samples come from
+    worker threads through a deque (append is atomic).
+    """
+
+    def __init__(self, min_limit: int, max_limit: int, target_latency_ms: float,
+                 db_target_latency_ms: float, window_seconds: float = 1.0, backoff: float = 0.75,
+                 normal_headroom: float = 2.0):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(max_limit)
+        self.target_latency = target_latency_ms / 1000
+        self.db_target_latency = db_target_latency_ms / 1000
+        self.window_seconds = window_seconds
+        self.backoff = backoff
+        self.normal_headroom = normal_headroom
+
+        self.in_flight = 0
+        self.shed = {LOW: 0, NORMAL: 0, CRITICAL: 0}
+        self.admitted = {LOW: 0, NORMAL: 0, CRITICAL: 0}
+        self.last_request_latency = 0.0
+        self.last_db_latency = 0.0
+
+        self._request_samples = []
+        self._db_samples = deque(maxlen=10_000)
+        self._window_started = time.monotonic()
+
+    def try_acquire(self, priority: str) -> bool:
+        """Admit or shed a request; admitted requests must call release()"""
+        if priority == LOW and self.in_flight >= self.limit:
+            self.shed[LOW] += 1
+            return False
+        if priority == NORMAL and self.in_flight >= self.limit * self.normal_headroom:
+            self.shed[NORMAL] += 1
+            return False
+
+        self.in_flight += 1
+        self.admitted[priority] += 1
+        return True
+
+    def release(self, latency: float, sample: bool = True):
+        self.in_flight -= 1
+        if sample:
+            self._request_samples.append(latency)
+
+        now = time.monotonic()
+        if now - self._window_started >= self.window_seconds:
+            self._adjust()
+            self._window_started = now
+
+    def record_db_latency(self, latency: float):
+        self._db_samples.append(latency)
+
+    def _adjust(self):
+        samples = sorted(self._request_samples)
+        self._request_samples = []
+        db_samples = [self._db_samples.popleft() for _ in range(len(self._db_samples))]
+
+        # p90 request latency, mean DB statement latency
+        self.last_request_latency = samples[int(len(samples) * 0.9)] if samples else 0.0
+        self.last_db_latency = sum(db_samples) / len(db_samples) if db_samples else 0.0
+
+        overloaded = (
+            self.last_request_latency > self.target_latency
+            or self.last_db_latency > self.db_target_latency
+        )
+        if overloaded:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1)
+
+    def stats(self) -> dict:
+        return {
+            "limit": round(self.limit, 2),
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "request_p90_ms": round(self.last_request_latency * 1000, 2),
+            "db_mean_ms": round(self.last_db_latency * 1000, 2),
+            "target_latency_ms": self.target_latency * 1000,
+            "db_target_latency_ms": self.db_target_latency * 1000,
+            "admitted": dict(self.admitted),
+            "shed": dict(self.shed)
+        }
+
+def instrument_engine(engine: Engine, limiter: AdaptiveConcurrencyLimiter):
+    """Feed the limiter with the execution time of every SQL statement"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("load_shed_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_latency(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["load_shed_start"].pop()
+        limiter.record_db_latency(time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def _record_failure(exception_context):
+        # A failed statement never reaches after_cursor_execute; pop its start here
+        starts = exception_context.connection.info.get("load_shed_start") if exception_context.connection else None
+        if starts:
+            limiter.record_db_latency(time.perf_counter() - starts.pop())
+
+class LoadSheddingMiddleware:
+    """Shed low-priority requests with 503 when the concurrency limit is reached"""
+
+    def __init__(self, app, limiter: AdaptiveConcurrencyLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        priority = request_priority(scope["method"], scope["path"])
+        if not self.limiter.try_acquire(priority):
+            body = json.dumps({"detail": "Server is busy. Please retry shortly."}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", b"1"),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # Auth latency is dominated by password hashing in its own pool,
+            # it says nothing about database health
+            self.limiter.release(
+                time.perf_counter() - started,
+                sample=not scope["path"].startswith("/api/auth/")
+            )
@@ -0,0 +1,210 @@
+import bisect
+import threading
+import time
+import weakref
+from typing import Callable, Iterable
+
+# Minimal Prometheus client. Hot-path updates go to a per-thread shard, so
+# recording never takes a lock; shards are only merged when /metrics is scraped.
+# When a thread exits (anyio retires idle workers) its shard is folded into a
+# base accumulator, so the shard list only holds live threads.
+
+class _ShardOwner:
+    """Held in the thread's local storage; collected when the thread exits"""
+    __slots__ = ("shard", "__weakref__")
+
+    def __init__(self, shard: dict):
+        self.shard = shard
+
+class _ShardedMetric:
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._local = threading.local()
+        self._shards = []
+        self._base = {}
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        owner = getattr(self._local, "owner", None)
+        if owner is None:
+            owner = _ShardOwner({})
+            self._local.owner = owner
+            # Only taken once per thread
+            with self._shards_lock:
+                self._shards.append(owner.shard)
+            weakref.finalize(owner, self._retire, owner.shard)
+        return owner.shard
+
+    def _retire(self, shard: dict):
+        """Fold a dead thread's shard into the base accumulator"""
+        with self._shards_lock:
+            for index, live in enumerate(self._shards):
+                if live is shard:
+                    del self._shards[index]
+                    break
+            self._merge(self._base, shard)
+
+    def _merge(self, into: dict, shard: dict):
+        raise NotImplementedError
+
+    def _snapshot(self) -> list:
+        with self._shards_lock:
+            shards = list(self._shards)
+            base = {labels: list(value) if isinstance(value, list) else value
+                    for labels, value in self._base.items()}
+        return [base] + [dict(shard) for shard in shards]
+
+    def _labels(self, values: tuple, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Counter(_ShardedMetric):
+    type_name = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def _merge(self, into: dict, shard: dict):
+        for labels, value in shard.items():
+            into[labels] = into.get(labels, 0) + value
+
+    def value(self, *labels) -> float:
+        return sum(shard.get(labels, 0) for shard in self._snapshot())
+
+    def collect(self) -> Iterable[str]:
+        totals = {}
+        for shard in self._snapshot():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        for labels, value in sorted(totals.items()):
+            yield f"{self.name}{self._labels(labels)} {value}"
+
+class Histogram(_ShardedMetric):
+    type_name = "histogram"
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels):
+        shard = self._shard()
+        series = shard.get(labels)
+        if series is None:
+            # [count per bucket..., +Inf count, sum]
+            series = [0] * (len(self.buckets) + 2)
+            shard[labels] = series
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def _merge(self, into: dict, shard: dict):
+        for labels, series in shard.items():
+            merged = into.setdefault(labels, [0] * len(series))
+            for index, value in enumerate(series):
+                merged[index] += value
+
+    def collect(self) -> Iterable[str]:
+        totals = {}
+        for shard in self._snapshot():
+            for labels, series in shard.items():
+                merged = totals.setdefault(labels, [0] * len(series))
+                for index, value in enumerate(list(series)):
+                    merged[index] += value
+        for labels, series in sorted(totals.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                le_label = f'le="{le}"'
+                yield f"{self.name}_bucket{self._labels(labels, le_label)} {cumulative}"
+            yield f"{self.name}_sum{self._labels(labels)} {series[-1]}"
+            yield f"{self.name}_count{self._labels(labels)} {cumulative}"
+
+class Gauge:
+    """Value computed at scrape time: callback returns [(label values, value), ...]"""
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], list], labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.labelnames = labelnames
+
+    def collect(self) -> Iterable[str]:
+        for labels, value in self.callback():
+            pairs = [f'{name}="{_escape(label)}"' for name, label in zip(self.labelnames, labels)]
+            label_text = "{" + ",".join(pairs) + "}" if pairs else ""
+            yield f"{self.name}{label_text} {value}"
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format 0.0.4"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+
+# ============ BOOKING PIPELINE METRICS ============
+
+request_duration = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "Request latency by route",
+    labelnames=("method", "route", "status")
+))
+seat_lock_events = REGISTRY.register(Counter(
+    "seat_lock_events_total", "Seat lock lifecycle events (taken, expired, confirmed, cancelled)",
+    labelnames=("event",)
+))
+booking_attempts = REGISTRY.register(Counter(
+    "booking_attempts_total", "POST /book-seats outcomes (success, conflict, not_found)",
+    labelnames=("result",)
+))
+
+class MetricsMiddleware:
+    """Record request latency per route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_holder = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_holder[0])
+            )
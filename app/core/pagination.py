@@ -0,0 +1,108 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+Pages are ordered by an indexed key - (start_time, id) for events, id for
+movies - and the next page starts strictly after the last row sent, so
+every page is an index range scan of `limit` rows however much history the
+table holds. Lists stay plain JSON arrays; the next page is advertised in
+the `X-Next-Cursor` header and as a `Link: <...>; rel="next"` URL.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import HTTPException, Query, Request, Response
+from sqlalchemy import and_, func, or_
+from models.event import Event
+from config import get_config
+
+# Get config once at module level
+config = get_config()
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def page_limit(
+    limit: Optional[int] = Query(None, ge=1, description="Page size (default PAGE_SIZE_DEFAULT, at most PAGE_SIZE_MAX)")
+) -> int:
+    """Dependency: the requested page size, defaulted and capped by config"""
+    if limit is None:
+        return config.page_size_default
+    return min(limit, config.page_size_max)
+
+def encode_cursor(*values) -> str:
+    """Opaque cursor for the key of the last row on a page"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, *types) -> tuple:
+    """Key values from a cursor, converted to `types` (400 if it was not made by encode_cursor)"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("wrong number of values")
+        return tuple(
+            datetime.fromisoformat(value) if kind is datetime else kind(value)
+            for kind, value in zip(types, payload)
+        )
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def set_next_page(request: Request, response: Response, rows: list, limit: int, key) -> list:
+    """Trim the one look-ahead row and advertise the next page if there is one.
+
+    Routes fetch `limit + 1` rows; `key(row)` gives the values to encode.
+    """
+    if len(rows) <= limit:
+        return rows
+    rows = rows[:limit]
+    cursor = encode_cursor(*key(rows[-1]))
+    response.headers[NEXT_CURSOR_HEADER] = cursor
+    response.headers["Link"] = f'<{request.url.include_query_params(cursor=cursor)}>; rel="next"'
+    return rows
+
+def not_modified_page(request: Request, not_modified: Response, keys, limit: int, key) -> Response:
+    """Give a 304 for a list page the same next-page headers as the full page.
+
+    The client keeps its cached body but still needs the next cursor; `keys`
+    is the page query reduced to its key columns, so this is an index-only scan.
+    """
+    set_next_page(request, not_modified, keys.limit(limit + 1).all(), limit, key)
+    return not_modified
+
+# ============ EVENTS ============
+
+def event_window_start(include_past: bool) -> Optional[datetime]:
+    """Earliest showtime listed: now (naive UTC, like stored showtimes) unless past events are wanted"""
+    if include_past:
+        return None
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def event_window_key(db, window_start: Optional[datetime]) -> str:
+    """ETag component for an upcoming-only list.
+
+    Such a list also changes, without any write, when its first showtime
+    starts; keying the ETag on that showtime (one index lookup) retires it then.
+    """
+    if window_start is None:
+        return ""
+    first_start = db.query(func.min(Event.start_time)).filter(Event.start_time >= window_start).scalar()
+    return f"from={first_start.isoformat() if first_start else '-'}"
+
+def event_page(query, window_start: Optional[datetime], cursor: Optional[str]):
+    """Order `query` by (start_time, id) and apply the window and cursor"""
+    after = decode_cursor(cursor, datetime, int) if cursor else None
+    if after is not None and (window_start is None or after[0] >= window_start):
+        start_time, event_id = after
+        # One lower bound on start_time (SQLite range-scans on only one), written
+        # out rather than as a row-value comparison so every database uses the index
+        query = query.filter(
+            Event.start_time >= start_time,
+            or_(Event.start_time > start_time, and_(Event.start_time == start_time, Event.id > event_id))
+        )
+    elif window_start is not None:
+        # No cursor, or one from before the window start (the page has since started)
+        query = query.filter(Event.start_time >= window_start)
+    return query.order_by(Event.start_time, Event.id)
+
+def event_key(row) -> tuple:
+    return (row.start_time, row.id)
@@ -0,0 +1,251 @@
+import asyncio
+import functools
+import hmac
+import inspect
+import itertools
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi.routing import APIRoute
+from config import get_config
+from core.context import current_request, start_request
+
+# Get config once at module level
+config = get_config()
+
+class Profile:
+    """Stack samples of one request, aggregated as folded stacks"""
+
+    def __init__(self, profile_id: int, method: str, path: str, reason: str):
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.reason = reason
+        self.route = None
+        self.status = None
+        self.started_at = datetime.now(timezone.utc)
+        self.duration_ms = None
+        self.sample_count = 0
+        self.stacks = {}  # "root;...;leaf" -> samples
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "reason": self.reason,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": self.duration_ms,
+            "samples": self.sample_count
+        }
+
+    def folded(self) -> str:
+        """Brendan Gregg's folded format, input for flamegraph.pl and speedscope"""
+        return "".join(
+            f"{stack} {count}\n"
+            for stack, count in sorted(self.stacks.items(), key=lambda item: -item[1])
+        )
+
+class SamplingProfiler:
+    """Periodically samples the stacks of threads serving profiled requests.
+
+    Worker threads are bound to a request only while they run its endpoint
+    (see ProfiledRoute), so handler time before the first query is sampled
+    and a reused thread is never charged to an earlier request. On the event
+    loop thread a sample goes to the profile of the task running at that
+    moment, which covers async handlers and middleware. The sampler thread
+    sleeps while no profiled request is in flight.
+    """
+
+    def __init__(self, interval_ms: float = 5, max_profiles: int = 50, max_depth: int = 64):
+        self.interval = interval_ms / 1000
+        self.max_depth = max_depth
+        self.profiles = deque(maxlen=max_profiles)
+        self._ids = itertools.count(1)
+        self._threads = {}  # worker thread ident -> Profile
+        self._tasks = {}  # asyncio task -> Profile
+        self._loops = {}  # event loop thread ident -> loop
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._sampler = None
+
+    def start(self, method: str, path: str, reason: str) -> Profile:
+        profile = Profile(next(self._ids), method, path, reason)
+        with self._lock:
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._sampler.start()
+        return profile
+
+    def bind_task(self, profile: Profile):
+        """Attribute the current asyncio task (the request) to `profile` until finish()"""
+        loop = asyncio.get_running_loop()
+        self._loops[threading.get_ident()] = loop
+        self._tasks[asyncio.current_task(loop)] = profile
+        self._wakeup.set()
+
+    def bind_thread(self, profile: Profile):
+        """Attribute the calling worker thread to `profile` until unbind_thread()"""
+        self._threads[threading.get_ident()] = profile
+        self._wakeup.set()
+
+    def unbind_thread(self):
+        self._threads.pop(threading.get_ident(), None)
+
+    def finish(self, profile: Profile, route: Optional[str], status: int, duration: float):
+        profile.route = route
+        profile.status = status
+        profile.duration_ms = round(duration * 1000, 2)
+        with self._lock:
+            for task, bound in list(self._tasks.items()):
+                if bound is profile:
+                    self._tasks.pop(task, None)
+            self.profiles.append(profile)
+
+    def get(self, profile_id: int) -> Optional[Profile]:
+        for profile in list(self.profiles):
+            if profile.id == profile_id:
+                return profile
+        return None
+
+    def _run(self):
+        while True:
+            if not self._threads and not self._tasks:
+                self._wakeup.clear()
+                self._wakeup.wait(timeout=1)
+                continue
+            frames = sys._current_frames()
+            bound = list(self._threads.items())
+            if self._tasks:
+                # The event loop thread belongs to whichever task it is running right now
+                for ident, loop in list(self._loops.items()):
+                    profile = self._tasks.get(asyncio.current_task(loop))
+                    if profile is not None:
+                        bound.append((ident, profile))
+            for ident, profile in bound:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                stack = self._fold(frame)
+                profile.stacks[stack] = profile.stacks.get(stack, 0) + 1
+                profile.sample_count += 1
+            del frames
+            time.sleep(self.interval)
+
+    def _fold(self, frame) -> str:
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+profiler = SamplingProfiler(
+    interval_ms=config.profile_interval_ms,
+    max_profiles=config.profile_buffer_size
+)
+
+def _bound_to_profile(endpoint):
+    """Wrap a sync endpoint so its threadpool thread is bound to the request's profile while it runs"""
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        request_context = current_request()
+        profile = request_context.profile if request_context is not None else None
+        if profile is None:
+            return endpoint(*args, **kwargs)
+        profiler.bind_thread(profile)
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            profiler.unbind_thread()
+
+    return wrapper
+
+class ProfiledRoute(APIRoute):
+    """Route class for the API routers: with profiling enabled, sync endpoints
+    bind their worker thread to the request's profile for exactly the call"""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if config.profiling_enabled and not inspect.iscoroutinefunction(endpoint):
+            endpoint = _bound_to_profile(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+class ProfilingMiddleware:
+    """Profile a sample of requests: a random fraction, paths matching a
+    pattern, or requests carrying the profiling header.
+
+    The header only counts when its value is the shared `secret` or the
+    request has an admin bearer token, so clients can't profile at will.
+    """
+
+    def __init__(self, app, sample_rate: float = 0.0, path_pattern: str = "", header: str = "",
+                 secret: str = "", is_admin=None):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.path_pattern = re.compile(path_pattern) if path_pattern else None
+        self.secret = secret.encode()
+        # Callable(token) -> bool; kept injectable so this module doesn't
+        # depend on the auth implementation
+        self.is_admin = is_admin
+        self.header = header.lower().encode() if header and (secret or is_admin) else None
+
+    def _header_trigger(self, scope) -> bool:
+        value, token = None, None
+        for name, raw in scope["headers"]:
+            if name == self.header:
+                value = raw.strip()
+            elif name == b"authorization":
+                scheme, _, token = raw.decode("latin-1").partition(" ")
+                if scheme.lower() != "bearer":
+                    token = None
+        if value is None:
+            return False
+        if self.secret and hmac.compare_digest(value, self.secret):
+            return True
+        return bool(token and self.is_admin is not None and self.is_admin(token))
+
+    def _reason(self, scope) -> Optional[str]:
+        if self.header and self._header_trigger(scope):
+            return "header"
+        if self.path_pattern and self.path_pattern.search(scope["path"]):
+            return "route"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        reason = self._reason(scope)
+        if reason is None:
+            await self.app(scope, receive, send)
+            return
+
+        request_context = start_request()
+        profile = profiler.start(scope["method"], scope["path"], reason)
+        request_context.profile = profile
+        profiler.bind_task(profile)
+        status_holder = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            profiler.finish(profile, getattr(route, "path", None), status_holder[0], time.perf_counter() - started)
@@ -0,0 +1,287 @@
+import json
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import case
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+from models.rate_limit import RateLimitBucket
+
+@dataclass(frozen=True)
+class RateLimit:
+    """`limit` requests per `period` seconds, e.g. parsed from "20/60" """
+    limit: int
+    period: float
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        limit, period = value.split("/")
+        return cls(limit=int(limit), period=float(period))
+
+    @property
+    def interval(self) -> float:
+        """Seconds between requests at the sustained rate"""
+        return self.period / self.limit
+
+@dataclass(frozen=True)
+class RouteClass:
+    """A group of routes sharing one budget"""
+    name: str
+    methods: frozenset
+    path_pattern: re.Pattern
+    rate: RateLimit
+    per_user: bool = True  # False = always keyed by client IP
+    # JSON body field added to the IP key (e.g. "email"), so clients behind
+    # one address - such as the dashboard - each get their own budget
+    body_key: Optional[str] = None
+    # Coarser budget per client IP, charged before the body-keyed one, so
+    # varying the body field doesn't lift the limit on an address
+    ip_rate: Optional[RateLimit] = None
+
+    def matches(self, method: str, path: str) -> bool:
+        return method in self.methods and self.path_pattern.match(path) is not None
+
+# ============ BACKENDS ============
+# All backends implement GCRA (generic cell rate algorithm): per key we keep
+# only the "theoretical arrival time" (TAT) of the next request, one float.
+
+class RateLimitBackend:
+    """Storage for rate limit state. Subclass to share limits between workers."""
+
+    # True if hit() does I/O and must run off the event loop
+    blocking = False
+
+    def hit(self, key: str, rate: RateLimit) -> float:
+        """Record a request; return 0 if allowed, else seconds until retry"""
+        raise NotImplementedError
+
+class MemoryBackend(RateLimitBackend):
+    """Per-process GCRA store with LRU eviction"""
+
+    def __init__(self, max_keys: int = 100_000, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._tats: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, rate: RateLimit) -> float:
+        now = self.clock()
+        with self._lock:
+            tat = max(self._tats.get(key, now), now)
+            new_tat = tat + rate.interval
+            if new_tat - now > rate.period:
+                return new_tat - rate.period - now
+
+            self._tats[key] = new_tat
+            self._tats.move_to_end(key)
+            # Evict least recently used keys (an evicted client simply
+            # starts over with a full budget)
+            while len(self._tats) > self.max_keys:
+                self._tats.popitem(last=False)
+            return 0.0
+
+class DatabaseBackend(RateLimitBackend):
+    """GCRA state in the application database, shared by all workers.
+
+    Each hit is a single atomic upsert, so concurrent workers can't both
+    spend the last unit of budget. Rows whose TAT has passed hold no state
+    (they mean a full budget) and are deleted every `prune_interval` seconds.
+    """
+
+    blocking = True
+
+    def __init__(self, engine: Engine, prune_interval: float = 60.0, clock=time.time):
+        self.engine = engine
+        # Wall clock: the TATs are shared with other processes
+        self.clock = clock
+        self.prune_interval = prune_interval
+        self._next_prune = 0.0
+        self._prune_lock = threading.Lock()
+        if engine.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        self._insert = insert
+
+    def hit(self, key: str, rate: RateLimit) -> float:
+        now = self.clock()
+        table = RateLimitBucket.__table__
+        current = case((table.c.tat > now, table.c.tat), else_=now)
+        new_tat = current + rate.interval
+
+        statement = self._insert(table).values(key=key, tat=now + rate.interval)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={"tat": new_tat},
+            where=(new_tat - now) <= rate.period
+        )
+
+        with self.engine.begin() as connection:
+            if self._prune_due(now):
+                connection.execute(table.delete().where(table.c.tat < now))
+            if connection.execute(statement).rowcount == 1:
+                return 0.0
+            tat = connection.execute(
+                table.select().with_only_columns(table.c.tat).where(table.c.key == key)
+            ).scalar()
+
+        return max(tat + rate.interval - rate.period - now, 0.001)
+
+    def _prune_due(self, now: float) -> bool:
+        """True for one hit per prune_interval in this process"""
+        with self._prune_lock:
+            if now < self._next_prune:
+                return False
+            self._next_prune = now + self.prune_interval
+            return True
+
+def default_route_classes(config) -> list:
+    """Separate budgets for auth, seat reads and booking writes"""
+    return [
+        # /refresh is not limited here: it already needs a valid refresh token
+        RouteClass(
+            name="auth",
+            methods=frozenset({"POST"}),
+            path_pattern=re.compile(r"^/api/auth/(login|register|create-admin)$"),
+            rate=RateLimit.parse(config.rate_limit_auth),
+            per_user=False,
+            body_key="email",
+            ip_rate=RateLimit.parse(config.rate_limit_auth_per_ip)
+        ),
+        RouteClass(
+            name="seat_reads",
+            methods=frozenset({"GET"}),
+            path_pattern=re.compile(r"^/api/events(/|$)"),
+            rate=RateLimit.parse(config.rate_limit_seat_reads)
+        ),
+        RouteClass(
+            name="booking_writes",
+            methods=frozenset({"POST"}),
+            path_pattern=re.compile(r"^/api/(book-seats|confirm-payment|cancel-booking)$"),
+            rate=RateLimit.parse(config.rate_limit_booking_writes)
+        ),
+    ]
+
+# ============ MIDDLEWARE ============
+
+# Larger bodies aren't parsed for body_key (auth requests are tiny)
+_MAX_KEY_BODY = 16 * 1024
+
+async def _buffer_body(receive):
+    """Read the whole request body; return it and a receive that replays it"""
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            # Client went away; the app will see the same message
+            chunks = [message]
+            break
+        chunks.append(message)
+        if not message.get("more_body", False):
+            break
+
+    body = b"".join(chunk.get("body", b"") for chunk in chunks if chunk["type"] == "http.request")
+    replay = list(chunks)
+
+    async def replay_receive():
+        if replay:
+            return replay.pop(0)
+        return await receive()
+
+    return body, replay_receive
+
+def _body_field(body: bytes, field: str) -> str:
+    """A JSON body field, normalised for use in a key ("-" if missing)"""
+    if not body or len(body) > _MAX_KEY_BODY:
+        return "-"
+    try:
+        value = json.loads(body).get(field)
+    except (ValueError, AttributeError):
+        return "-"
+    return str(value).strip().lower()[:255] if value else "-"
+
+def _ip_key(scope) -> str:
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+class RateLimitMiddleware:
+    """Reject requests over their route class budget with 429 + Retry-After"""
+
+    def __init__(self, app, route_classes: list, backend: RateLimitBackend, identify_user=None):
+        self.app = app
+        self.route_classes = route_classes
+        self.backend = backend
+        # Callable(token) -> user key or None; kept injectable so this module
+        # doesn't depend on the auth implementation
+        self.identify_user = identify_user
+
+    def _client_key(self, scope, route_class: RouteClass, body: bytes = b"") -> str:
+        if route_class.per_user and self.identify_user is not None:
+            for name, value in scope.get("headers", ()):
+                if name == b"authorization":
+                    scheme, _, token = value.decode("latin-1").partition(" ")
+                    if scheme.lower() == "bearer" and token:
+                        user_key = self.identify_user(token)
+                        if user_key:
+                            return f"user:{user_key}"
+                    break
+
+        key = _ip_key(scope)
+        if route_class.body_key:
+            key += f":{route_class.body_key}:{_body_field(body, route_class.body_key)}"
+        return key
+
+    async def _hit(self, key: str, rate: RateLimit) -> float:
+        if self.backend.blocking:
+            return await run_in_threadpool(self.backend.hit, key, rate)
+        return self.backend.hit(key, rate)
+
+    def classify(self, method: str, path: str) -> Optional[RouteClass]:
+        for route_class in self.route_classes:
+            if route_class.matches(method, path):
+                return route_class
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route_class = self.classify(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        body = b""
+        if route_class.body_key:
+            body, receive = await _buffer_body(receive)
+
+        # The per-IP budget first: a request it rejects spends no other budget
+        checks = [(f"{route_class.name}:{self._client_key(scope, route_class, body)}", route_class.rate)]
+        if route_class.ip_rate is not None:
+            checks.insert(0, (f"{route_class.name}:{_ip_key(scope)}", route_class.ip_rate))
+
+        for key, rate in checks:
+            retry_after = await self._hit(key, rate)
+            if retry_after > 0:
+                break
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        body = json.dumps({"detail": "Too many requests. Please slow down."}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(math.ceil(retry_after)).encode()),
+                (b"x-ratelimit-limit", f"{rate.limit};w={int(rate.period)}".encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,97 @@
+"""Full-text search over movie titles and descriptions.
+
+On SQLite the movies are indexed by an FTS5 table (movies_fts) that mirrors
+the movies table through triggers, so every write path - admin routes,
+sample data, archiving, raw SQL - keeps it in sync. Other databases (or a
+SQLite built without FTS5) fall back to a case-insensitive LIKE scan.
+"""
+import re
+from sqlalchemy import column, or_, select, text
+from database import engine
+from models.movie import Movie
+
+FTS_TABLE = "movies_fts"
+
+_SEARCH_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, content='movies', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS movies_fts_insert AFTER INSERT ON movies BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS movies_fts_delete AFTER DELETE ON movies BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS movies_fts_update AFTER UPDATE ON movies BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+]
+
+_fts_available = None
+
+def fts_available() -> bool:
+    """True when the FTS5 index exists (checked once per process)"""
+    global _fts_available
+    if _fts_available is None:
+        if engine.dialect.name != "sqlite":
+            _fts_available = False
+        else:
+            with engine.connect() as conn:
+                _fts_available = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {"name": FTS_TABLE}
+                ).first() is not None
+    return _fts_available
+
+def create_search_index():
+    """Create the FTS5 table and triggers if missing; a new index is filled from movies"""
+    global _fts_available
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        existed = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE}
+        ).first() is not None
+        try:
+            for statement in _SEARCH_DDL:
+                conn.execute(text(statement))
+        except Exception as e:
+            # SQLite without FTS5: search uses the LIKE fallback
+            print(f"⚠️  Full-text search unavailable, falling back to LIKE: {e}")
+            _fts_available = False
+            return
+        if not existed:
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    _fts_available = True
+
+def search_terms(query: str) -> list:
+    """Words of a user query; punctuation and FTS operators are dropped"""
+    return re.findall(r"[^\W_]+", query.lower())
+
+def movie_match(query: str):
+    """WHERE clause selecting the movies that contain every word of `query`.
+
+    FTS5 matches word prefixes; the LIKE fallback matches substrings.
+    """
+    terms = search_terms(query)
+    if fts_available():
+        # Quoted prefix terms, implicitly ANDed: "star war" matches "Star Wars"
+        match = " ".join(f'"{term}"*' for term in terms)
+        return Movie.id.in_(
+            text(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match")
+            .bindparams(match=match)
+            .columns(column("rowid"))
+        )
+    return Movie.id.in_(
+        select(Movie.id).where(*[
+            or_(Movie.title.ilike(f"%{term}%"), Movie.description.ilike(f"%{term}%"))
+            for term in terms
+        ])
+    )
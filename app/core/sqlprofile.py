@@ -0,0 +1,135 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from core.context import current_request, start_request
+
+logger = logging.getLogger("bookmemovie.sql")
+
+def instrument_engine(engine: Engine):
+    """Attribute every SQL statement to the request that ran it"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("sql_profile_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_query(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["sql_profile_start"].pop()
+        request_context = current_request()
+        if request_context is not None:
+            request_context.record_query(statement, time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def _record_failed_query(exception_context):
+        # A failed statement never reaches after_cursor_execute; pop its start here
+        starts = exception_context.connection.info.get("sql_profile_start") if exception_context.connection else None
+        if starts:
+            started = starts.pop()
+            request_context = current_request()
+            if request_context is not None:
+                request_context.record_query(exception_context.statement, time.perf_counter() - started)
+
+def find_n_plus_one(statements: dict, threshold: int) -> list:
+    """Statements run at least `threshold` times in one request (same SQL, different params)"""
+    return sorted(
+        ({"statement": sql, "count": count} for sql, count in statements.items() if count >= threshold),
+        key=lambda item: -item["count"]
+    )
+
+class SQLProfilingMiddleware:
+    """Count and time SQL per request, flag likely N+1 patterns.
+
+    Adds a `Server-Timing: db;dur=...;desc="N queries"` header and logs one
+    JSON line per request to the "bookmemovie.sql" logger.
+    """
+
+    def __init__(self, app, n_plus_one_threshold: int = 5):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_context = start_request()
+        started = time.perf_counter()
+        status_holder = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+                # The endpoint has finished its queries by the time headers go out
+                timing = (
+                    f'db;dur={request_context.query_time * 1000:.2f};'
+                    f'desc="{request_context.query_count} queries", '
+                    f'app;dur={(time.perf_counter() - started) * 1000:.2f}'
+                )
+                message = {**message, "headers": list(message.get("headers", [])) + [
+                    (b"server-timing", timing.encode())
+                ]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._log(scope, request_context, status_holder[0], started)
+
+    def _log(self, scope, request_context, status: int, started: float):
+        suspects = find_n_plus_one(request_context.statements, self.n_plus_one_threshold)
+        route = scope.get("route")
+        log_line = {
+            "method": scope["method"],
+            "route": getattr(route, "path", scope["path"]),
+            "status": status,
+            "queries": request_context.query_count,
+            "db_ms": round(request_context.query_time * 1000, 2),
+            "total_ms": round((time.perf_counter() - started) * 1000, 2),
+            "n_plus_one": [
+                {"statement": " ".join(item["statement"].split())[:200], "count": item["count"]}
+                for item in suspects
+            ]
+        }
+        if suspects:
+            logger.warning(json.dumps(log_line))
+        else:
+            logger.info(json.dumps(log_line))
+
+# ============ TEST HELPER ============
+
+@contextmanager
+def query_budget(engine: Engine, max_queries: int):
+    """Fail if the block runs more than `max_queries` SQL statements.
+
+        with query_budget(engine, 3):
+            client.get("/api/admin/events", headers=admin_headers)
+
+    Counts every statement on the engine, so use it around in-process
+    (TestClient) requests with no other traffic.
+    """
+    statements = []
+    lock = threading.Lock()
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        with lock:
+            statements.append(statement)
+
+    event.listen(engine, "after_cursor_execute", _count)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "after_cursor_execute", _count)
+
+    if len(statements) > max_queries:
+        repeated = find_n_plus_one(
+            {sql: statements.count(sql) for sql in set(statements)}, threshold=2
+        )
+        details = "; ".join(f"{item['count']}x {' '.join(item['statement'].split())[:120]}" for item in repeated)
+        raise AssertionError(
+            f"Query budget exceeded: {len(statements)} queries (budget {max_queries})"
+            + (f". Repeated: {details}" if details else "")
+        )
@@ -0,0 +1,374 @@
+"""Minimal in-process tracing with an OpenTelemetry-shaped API.
+
+    from core.tracing import get_tracer
+    tracer = get_tracer(__name__)
+
+    with tracer.start_as_current_span("book_seats.commit") as span:
+        span.set_attribute("seats", 3)
+        db.commit()
+
+Finished traces go to an in-memory ring buffer (served at /api/admin/traces)
+and optionally to a JSON-lines file, so no collector is needed. Span fields
+follow the OTLP names (trace_id, span_id, parent_span_id, *_unix_nano), and
+incoming W3C `traceparent` headers are continued.
+"""
+import json
+import queue
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from config import get_config
+
+# Get config once at module level
+config = get_config()
+
+class Span:
+    def __init__(self, processor, name: str, trace_id: str, span_id: str,
+                 parent_span_id: Optional[str], local_root: bool, attributes: Optional[dict] = None):
+        self._processor = processor
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_span_id = parent_span_id
+        self.local_root = local_root
+        self.attributes = dict(attributes or {})
+        self.events = []
+        self.status = "UNSET"
+        self.status_description = None
+        self.start_time = time.time_ns()
+        self.end_time = None
+
+    def is_recording(self) -> bool:
+        return self.end_time is None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: dict):
+        self.attributes.update(attributes)
+
+    def update_name(self, name: str):
+        self.name = name
+
+    def add_event(self, name: str, attributes: Optional[dict] = None):
+        self.events.append({"name": name, "time_unix_nano": time.time_ns(), "attributes": attributes or {}})
+
+    def record_exception(self, exc: BaseException):
+        self.add_event("exception", {"exception.type": exc.__class__.__name__, "exception.message": str(exc)})
+
+    def set_status(self, status: str, description: Optional[str] = None):
+        self.status = status
+        self.status_description = description
+
+    def end(self):
+        if self.end_time is None:
+            self.end_time = time.time_ns()
+            self._processor.on_end(self)
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "start_time_unix_nano": self.start_time,
+            "end_time_unix_nano": self.end_time,
+            "duration_ms": round((self.end_time - self.start_time) / 1e6, 3) if self.end_time else None,
+            "attributes": self.attributes,
+            "events": self.events,
+            "status": {"code": self.status, "description": self.status_description}
+        }
+
+class NonRecordingSpan:
+    """Stand-in for unsampled traces and disabled tracing; every call is a no-op"""
+    trace_id = span_id = parent_span_id = None
+
+    def is_recording(self) -> bool:
+        return False
+
+    def set_attribute(self, key, value): pass
+    def set_attributes(self, attributes): pass
+    def update_name(self, name): pass
+    def add_event(self, name, attributes=None): pass
+    def record_exception(self, exc): pass
+    def set_status(self, status, description=None): pass
+    def end(self): pass
+
+INVALID_SPAN = NonRecordingSpan()
+
+_current_span: ContextVar[Optional[object]] = ContextVar("current_span", default=None)
+
+def get_current_span():
+    span = _current_span.get()
+    return span if span is not None else INVALID_SPAN
+
+# ============ EXPORTERS ============
+
+class InMemorySpanExporter:
+    """Keeps the last `max_traces` finished traces"""
+
+    def __init__(self, max_traces: int = 100):
+        self._traces = OrderedDict()  # trace_id -> [span dict]
+        self._max_traces = max_traces
+        self._lock = threading.Lock()
+
+    def export(self, spans: list):
+        with self._lock:
+            trace_id = spans[0]["trace_id"]
+            self._traces.setdefault(trace_id, []).extend(spans)
+            self._traces.move_to_end(trace_id)
+            while len(self._traces) > self._max_traces:
+                self._traces.popitem(last=False)
+
+    def get_trace(self, trace_id: str) -> Optional[list]:
+        with self._lock:
+            spans = self._traces.get(trace_id)
+            return sorted(spans, key=lambda span: span["start_time_unix_nano"]) if spans else None
+
+    def summaries(self) -> list:
+        """Newest first: one line per trace, described by its root span"""
+        with self._lock:
+            traces = list(self._traces.items())
+        summaries = []
+        for trace_id, spans in reversed(traces):
+            root = min(spans, key=lambda span: span["start_time_unix_nano"])
+            summaries.append({
+                "trace_id": trace_id,
+                "name": root["name"],
+                "duration_ms": root["duration_ms"],
+                "spans": len(spans),
+                "status": root["status"]["code"],
+                "start_time_unix_nano": root["start_time_unix_nano"]
+            })
+        return summaries
+
+class JSONLinesSpanExporter:
+    """Appends one JSON line per span to a file from a background thread"""
+
+    def __init__(self, path: str, queue_size: int = 10000):
+        self.path = path
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def export(self, spans: list):
+        if self._thread is None:
+            # Started on first use, not at import time
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                    self._thread.start()
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += len(spans)
+
+    def _run(self):
+        with open(self.path, "a") as output:
+            while True:
+                spans = self._queue.get()
+                if spans is None:
+                    return
+                for span in spans:
+                    output.write(json.dumps(span, default=str) + "\n")
+                if self._queue.empty():
+                    output.flush()
+
+    def shutdown(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+
+class TraceAssembler:
+    """Buffers a trace's spans until its local root ends, then exports them together"""
+
+    def __init__(self, exporters: list, max_pending: int = 1000):
+        self.exporters = exporters
+        self._pending = OrderedDict()  # trace_id -> [span dict]
+        self._max_pending = max_pending
+        self._lock = threading.Lock()
+
+    def on_end(self, span: Span):
+        with self._lock:
+            spans = self._pending.setdefault(span.trace_id, [])
+            spans.append(span.to_dict())
+            if not span.local_root:
+                # Guard against traces whose root never ends
+                while len(self._pending) > self._max_pending:
+                    self._pending.popitem(last=False)
+                return
+            self._pending.pop(span.trace_id, None)
+        for exporter in self.exporters:
+            exporter.export(spans)
+
+# ============ TRACER ============
+
+class Tracer:
+    def __init__(self, name: str, provider: "TracerProvider"):
+        self.name = name
+        self._provider = provider
+
+    def start_span(self, name: str, attributes: Optional[dict] = None, parent=None):
+        """Start a span under `parent` (default: the current span); the caller must end() it"""
+        provider = self._provider
+        if not provider.enabled:
+            return INVALID_SPAN
+        if parent is None:
+            parent = _current_span.get()
+
+        if parent is None:
+            # New trace: sampling is decided once, at the root
+            if random.random() >= provider.sample_rate:
+                return INVALID_SPAN
+            return Span(provider.processor, name, _new_id(32), _new_id(16), None, True, attributes)
+        if isinstance(parent, RemoteParent):
+            # The caller's sampled flag is a precondition, not a promise to record:
+            # our own rate still applies, so a client can't force every request traced
+            if not parent.sampled or random.random() >= provider.sample_rate:
+                return INVALID_SPAN
+            return Span(provider.processor, name, parent.trace_id, _new_id(16), parent.span_id, True, attributes)
+        if isinstance(parent, NonRecordingSpan):
+            return INVALID_SPAN
+        return Span(provider.processor, name, parent.trace_id, _new_id(16), parent.span_id, False, attributes)
+
+    @contextmanager
+    def start_as_current_span(self, name: str, attributes: Optional[dict] = None, parent=None):
+        """Start a span and make it current for the block (also usable as a decorator)"""
+        span = self.start_span(name, attributes, parent)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as exc:
+            span.record_exception(exc)
+            # 4xx HTTPExceptions are expected outcomes, not failed spans
+            if getattr(exc, "status_code", 500) >= 500:
+                span.set_status("ERROR", str(exc))
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+class RemoteParent:
+    """Span context received in a `traceparent` header"""
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool = True):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+class TracerProvider:
+    def __init__(self, enabled: bool, sample_rate: float, exporters: list):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.exporters = exporters
+        self.processor = TraceAssembler(exporters)
+        self._tracers = {}
+
+    def get_tracer(self, name: str) -> Tracer:
+        tracer = self._tracers.get(name)
+        if tracer is None:
+            tracer = self._tracers[name] = Tracer(name, self)
+        return tracer
+
+    def shutdown(self):
+        for exporter in self.exporters:
+            if hasattr(exporter, "shutdown"):
+                exporter.shutdown()
+
+def _new_id(hex_digits: int) -> str:
+    return f"{random.getrandbits(hex_digits * 4):0{hex_digits}x}"
+
+memory_exporter = InMemorySpanExporter(max_traces=config.trace_buffer_size)
+_exporters = [memory_exporter]
+if config.tracing_enabled and config.trace_export_file:
+    _exporters.append(JSONLinesSpanExporter(config.trace_export_file))
+
+provider = TracerProvider(config.tracing_enabled, config.trace_sample_rate, _exporters)
+
+def get_tracer(name: str) -> Tracer:
+    return provider.get_tracer(name)
+
+# ============ INSTRUMENTATION ============
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+def instrument_engine(engine: Engine):
+    """One span per SQL statement, for statements run inside a traced request"""
+    tracer = get_tracer("sqlalchemy")
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_span(conn, cursor, statement, parameters, context, executemany):
+        if not get_current_span().is_recording():
+            conn.info.setdefault("trace_spans", []).append(INVALID_SPAN)
+            return
+        conn.info.setdefault("trace_spans", []).append(tracer.start_span("db.query", {
+            "db.system": engine.dialect.name,
+            "db.statement": " ".join(statement.split())[:300],
+            "db.executemany": executemany
+        }))
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _end_span(conn, cursor, statement, parameters, context, executemany):
+        conn.info["trace_spans"].pop().end()
+
+    @event.listens_for(engine, "handle_error")
+    def _fail_span(exception_context):
+        spans = exception_context.connection.info.get("trace_spans") if exception_context.connection else None
+        if spans:
+            span = spans.pop()
+            span.set_status("ERROR", str(exception_context.original_exception))
+            span.end()
+
+class TracingMiddleware:
+    """Root span per request; continues incoming traceparent and returns one"""
+
+    def __init__(self, app):
+        self.app = app
+        self.tracer = get_tracer("http")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        parent = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                match = _TRACEPARENT.match(value.decode("latin-1"))
+                if match:
+                    trace_id, span_id, flags = match.groups()
+                    parent = RemoteParent(trace_id, span_id, sampled=bool(int(flags, 16) & 0x01))
+                break
+
+        with self.tracer.start_as_current_span(f"{scope['method']} {scope['path']}", {
+            "http.method": scope["method"],
+            "http.target": scope["path"]
+        }, parent=parent) as span:
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status("ERROR")
+                    if span.is_recording():
+                        traceparent = f"00-{span.trace_id}-{span.span_id}-01"
+                        message = {**message, "headers": list(message.get("headers", [])) + [
+                            (b"traceparent", traceparent.encode())
+                        ]}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.update_name(f"{scope['method']} {route.path}")
+                    span.set_attribute("http.route", route.path)
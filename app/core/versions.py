@@ -0,0 +1,197 @@
+"""Version counters for conditional GETs (ETag / If-None-Match).
+
+Write routes bump a named counter in the same transaction as their change;
+read routes turn the counters into an ETag and answer a matching
+If-None-Match with 304 before running their listing queries. The counters
+live in the database, so every worker hands out the same ETags.
+
+    catalog       movies and events (titles, showtimes, deletions)
+    seats         any seat status change (admin seat statistics)
+    seats:<id>    one event's seat map
+"""
+import hashlib
+import secrets
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import Request, Response
+from sqlalchemy import case, select, update
+from sqlalchemy.exc import OperationalError
+from database import engine
+from models.data_version import DataVersion
+
+if engine.dialect.name == "postgresql":
+    from sqlalchemy.dialects.postgresql import insert
+else:
+    from sqlalchemy.dialects.sqlite import insert
+
+CATALOG = "catalog"
+SEATS = "seats"
+
+# Revalidate on every use; the 304 makes that cheap
+CACHE_CONTROL = "private, no-cache"
+
+# Stored as next_expiry_at when a seat map has no live locks
+NO_EXPIRY = datetime(9999, 12, 31)
+
+# How long a seat map read waits for the write lock to advance its counter
+ADVANCE_LOCK_TIMEOUT_MS = 50
+
+def seat_map(event_id: int) -> str:
+    return f"seats:{event_id}"
+
+def _initial_version() -> int:
+    # Random start, so a recreated database never reproduces an ETag a client still holds
+    return secrets.randbelow(2 ** 30)
+
+def _utcnow() -> datetime:
+    # Lock times are stored as naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def bump(db, *names: str, lock_expires_at: Optional[datetime] = None):
+    """Increment counters inside the caller's transaction (db: Session or Connection).
+
+    lock_expires_at (naive UTC): seats were just locked until then, so seat
+    map counters keep the earlier of it and their known next expiry.
+    """
+    table = DataVersion.__table__
+    for name in names:
+        changes = {"version": table.c.version + 1}
+        if lock_expires_at is not None and name.startswith("seats:"):
+            # NULL (unknown) stays unknown
+            changes["next_expiry_at"] = case(
+                (table.c.next_expiry_at > lock_expires_at, lock_expires_at),
+                else_=table.c.next_expiry_at
+            )
+        db.execute(
+            insert(table).values(name=name, version=_initial_version())
+            .on_conflict_do_update(index_elements=[table.c.name], set_=changes)
+        )
+
+def read_versions(db, *names: str) -> dict:
+    """name -> (version, next_expiry_at) for the counters that exist"""
+    rows = db.execute(
+        select(DataVersion.name, DataVersion.version, DataVersion.next_expiry_at)
+        .where(DataVersion.name.in_(names))
+    ).all()
+    return {row.name: (row.version, row.next_expiry_at) for row in rows}
+
+def make_etag(versions: dict, names: tuple, extra: str = "") -> str:
+    key = ";".join(f"{name}={versions[name][0] if name in versions else '-'}" for name in names)
+    if extra:
+        key += f";{extra}"
+    return f'W/"{hashlib.blake2b(key.encode(), digest_size=8).hexdigest()}"'
+
+def _client_has(request: Request, etag: str) -> bool:
+    """Weak comparison against If-None-Match (which may list several tags)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+def _set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+def conditional_get(request: Request, response: Response, db, *names: str, extra: str = "") -> Optional[Response]:
+    """ETag `response` from the named counters (and `extra`, anything else
+    the response depends on, such as a time window).
+
+    Returns a 304 response to send instead when the client's copy is current.
+    """
+    etag = make_etag(read_versions(db, *names), names, extra)
+    if _client_has(request, etag):
+        return _not_modified(etag)
+    _set_etag(response, etag)
+    return None
+
+@contextmanager
+def _short_lock_wait_transaction():
+    """engine.begin(), but waiting at most ADVANCE_LOCK_TIMEOUT_MS for the write lock"""
+    with engine.connect() as connection:
+        if engine.dialect.name == "postgresql":
+            with connection.begin():
+                connection.exec_driver_sql(f"SET LOCAL lock_timeout = {ADVANCE_LOCK_TIMEOUT_MS}")
+                yield connection
+            return
+        # busy_timeout outlives the transaction on this pooled connection: set it
+        # on the driver connection, outside SQLAlchemy's transaction, and put it back
+        driver = connection.connection.driver_connection
+        previous = driver.execute("PRAGMA busy_timeout").fetchone()[0]
+        driver.execute(f"PRAGMA busy_timeout = {ADVANCE_LOCK_TIMEOUT_MS}")
+        try:
+            with connection.begin():
+                yield connection
+        finally:
+            driver.execute(f"PRAGMA busy_timeout = {previous}")
+
+class SeatMapValidator:
+    """ETag for one event's seat map.
+
+    The map changes on writes (counter bumps) and also when a seat lock
+    expires, which involves no write. The counter row remembers the next
+    expiry; once that has passed (or is unknown) no 304 is sent, and the full
+    read bumps the counter and records the following expiry.
+    """
+
+    def __init__(self, db, event_id: int):
+        self.name = seat_map(event_id)
+        self.names = (CATALOG, self.name)
+        self.versions = read_versions(db, *self.names)
+        self.next_expiry_at = self.versions.get(self.name, (None, None))[1]
+        self.current = self.next_expiry_at is not None and _utcnow() < self.next_expiry_at
+
+    def not_modified(self, request: Request) -> Optional[Response]:
+        if not self.current:
+            return None
+        etag = make_etag(self.versions, self.names)
+        return _not_modified(etag) if _client_has(request, etag) else None
+
+    def finish(self, response: Response, next_expiry_at: datetime):
+        """After a full read: set the ETag, first advancing the counter if needed.
+
+        next_expiry_at: earliest expiry of the live locks just read, or NO_EXPIRY.
+        """
+        if not self.current or next_expiry_at < self.next_expiry_at:
+            if not self._advance(next_expiry_at):
+                # A write raced this read; send no ETag rather than a wrong one
+                return
+        _set_etag(response, make_etag(self.versions, self.names))
+
+    def _advance(self, next_expiry_at: datetime) -> bool:
+        """Compare-and-set the counter, so a concurrent bump is never overwritten.
+
+        Runs in its own short transaction rather than on the request session,
+        and waits at most ADVANCE_LOCK_TIMEOUT_MS for the write lock: when
+        bookings hold it, the read is sent without an ETag instead of waiting.
+        """
+        table = DataVersion.__table__
+        state = self.versions.get(self.name)
+        try:
+            with _short_lock_wait_transaction() as connection:
+                if state is None:
+                    version = _initial_version()
+                    changed = connection.execute(
+                        insert(table).values(name=self.name, version=version, next_expiry_at=next_expiry_at)
+                        .on_conflict_do_nothing(index_elements=[table.c.name])
+                    ).rowcount
+                else:
+                    version = state[0] + 1
+                    changed = connection.execute(
+                        update(table)
+                        .where(table.c.name == self.name, table.c.version == state[0])
+                        .values(version=version, next_expiry_at=next_expiry_at)
+                    ).rowcount
+        except OperationalError:
+            # e.g. SQLite "database is locked" under write load; serve without an ETag
+            return False
+        if changed != 1:
+            return False
+        self.versions[self.name] = (version, next_expiry_at)
+        return True
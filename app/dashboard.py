@@ -1,11 +1,14 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
+import altair as alt
 from datetime import datetime
 import sys
 from pathlib import Path
 import json
 import base64
+import time
 from urllib.parse import urlencode, parse_qs
 
 # Add app directory to path to import config
@@ -14,6 +17,7 @@ if str(app_dir) not in sys.path:
     sys.path.append(str(app_dir))
 
 from config import get_config
+from core.cache import TTLCache
 
 # Get config once (same pattern as backend)
 config = get_config()
@@ -28,7 +32,11 @@ st.set_page_config(page_title="🎬 Movie Ticketing System", layout="wide")
 
 # Session persistence using query parameters
 def save_session_to_url(access_token, user_info, is_admin):
-    """Save session data to URL query parameters"""
+    """Save session data to URL query parameters.
+    
+    Only the short-lived access token goes in the URL (browser history, Referer,
+    proxy logs); the refresh token stays in server-side session state.
+    """
     if access_token and user_info:
         # Encode session data
         session_data = {
@@ -77,6 +85,7 @@ def init_session_state():
     if 'access_token' not in st.session_state or not st.session_state.access_token:
         token, user_info, is_admin = load_session_from_url()
         st.session_state.access_token = token
+        st.session_state.refresh_token = None
         st.session_state.user_info = user_info
         st.session_state.is_admin = is_admin
     
@@ -91,20 +100,226 @@ def init_session_state():
 # Initialize session state
 init_session_state()
 
-def get_auth_headers():
-    """Get authorization headers for API requests"""
-    if st.session_state.access_token:
-        return {"Authorization": f"Bearer {st.session_state.access_token}"}
-    return {}
+# ============ API CLIENT ============
+
+class APIError(Exception):
+    """Non-200 response from the backend"""
+    def __init__(self, status_code, detail):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+@st.cache_resource
+def get_http_session():
+    """One keep-alive connection pool shared by every rerun and browser session"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config.dashboard_http_pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def api_request(method, url, token=None, **kwargs):
+    """Send a request through the pooled session, authenticated when a token is given"""
+    headers = kwargs.pop("headers", {})
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return get_http_session().request(
+        method, url, headers=headers, timeout=config.dashboard_http_timeout_seconds, **kwargs
+    )
+
+def api_json(response):
+    """Body of a successful response; anything else raises APIError"""
+    if response.status_code == 200:
+        return response.json()
+    try:
+        detail = response.json().get("detail", "Unknown error")
+    except ValueError:
+        detail = response.text or "Unknown error"
+    raise APIError(response.status_code, detail)
+
+@st.cache_resource
+def get_etag_store():
+    """Last ETag and body per URL, shared by all sessions"""
+    return TTLCache(maxsize=1000, ttl=3600)
+
+def api_get(url, token):
+    """GET with If-None-Match; a 304 reuses the body stored with the ETag.
+    
+    Keyed by URL alone: the API checks authorization before answering 304,
+    so a stored body is only reused for callers allowed to read it.
+    """
+    return conditional_get(url, token)[0]
+
+def api_get_page(url, token):
+    """api_get for a paginated list: (body, cursor of the next page or None)"""
+    body, response = conditional_get(url, token)
+    # 304s carry the next-page headers too
+    return body, response.headers.get("X-Next-Cursor")
+
+def conditional_get(url, token):
+    """(body, response) for api_get and api_get_page"""
+    store = get_etag_store()
+    stored = store.get(url)
+    headers = {"If-None-Match": stored[0]} if stored else {}
+    response = api_request("GET", url, token, headers=headers)
+    if response.status_code == 304 and stored:
+        return stored[1], response
+    body = api_json(response)
+    if response.headers.get("ETag"):
+        store.set(url, (response.headers["ETag"], body))
+    return body, response
+
+def page_url(url, **params):
+    """`url` with the non-empty query parameters added"""
+    params = {name: value for name, value in params.items() if value is not None}
+    return f"{url}?{urlencode(params)}" if params else url
+
+# Cached GETs are keyed by token, so users never see each other's data.
+# Errors raise and are not cached; mutations clear the lists they change.
+
+@st.cache_data(ttl=config.dashboard_cache_ttl_seconds, show_spinner=False)
+def get_events(token, cursor=None):
+    """One page of upcoming events for customers: (events, next cursor)"""
+    return api_get_page(page_url(f"{API_BASE}/events", cursor=cursor), token)
+
+@st.cache_data(ttl=config.dashboard_cache_ttl_seconds, show_spinner=False)
+def search_events(token, query, cursor=None):
+    """One page of upcoming events whose movie title or description matches the search words"""
+    return api_get_page(page_url(f"{API_BASE}/events/search", q=query, cursor=cursor), token)
+
+@st.cache_data(ttl=config.dashboard_cache_ttl_seconds, show_spinner=False)
+def get_admin_overview(token, cursor=None):
+    """One page of all events (past ones too) with seat counts, plus the totals: (overview, next cursor)"""
+    return api_get_page(page_url(f"{ADMIN_API}/events/overview", include_past="true", cursor=cursor), token)
+
+@st.cache_data(ttl=config.dashboard_cache_ttl_seconds, show_spinner=False)
+def get_admin_movies(token, cursor=None, query=None, limit=None):
+    """One page of movies by id, optionally only those matching `query`: (movies, next cursor)"""
+    return api_get_page(page_url(f"{ADMIN_API}/movies", q=query, cursor=cursor, limit=limit), token)
+
+# Movies offered by a movie select box; type to find others
+MOVIE_CHOICES = 20
+
+def movie_choices(token, query, current=None):
+    """{label: movie id} for a movie select box: the first matches of `query`, plus `current` (id, title)"""
+    movies, _ = get_admin_movies(token, query=query or None, limit=MOVIE_CHOICES)
+    choices = {f"{movie['title']} (#{movie['id']})": movie['id'] for movie in movies}
+    if current and current[0] not in choices.values():
+        choices = {f"{current[1]} (#{current[0]})": current[0], **choices}
+    return choices
+
+def invalidate_catalog():
+    """After movie, event or booking changes (seat counts and titles are in the lists)"""
+    get_events.clear()
+    search_events.clear()
+    get_admin_overview.clear()
+    get_admin_movies.clear()
+
+# ============ PAGING ============
+# Each list keeps the cursors of the pages walked so far; the last one is shown
+
+def page_cursor(name):
+    """Cursor of the page of list `name` on screen (None for the first page)"""
+    return st.session_state.get(f"{name}_pages", [None])[-1]
+
+def reset_pages(name):
+    st.session_state[f"{name}_pages"] = [None]
+
+def page_controls(name, next_cursor, key=""):
+    """Previous / Next buttons for list `name`; `key` tells apart copies on one screen"""
+    pages = st.session_state.setdefault(f"{name}_pages", [None])
+    if len(pages) == 1 and next_cursor is None:
+        return
+    col_prev, col_page, col_next = st.columns([1, 1, 1])
+    with col_prev:
+        if st.button("⬅️ Previous", key=f"{name}_prev{key}", disabled=len(pages) == 1):
+            pages.pop()
+            st.rerun()
+    with col_page:
+        st.caption(f"Page {len(pages)}")
+    with col_next:
+        if st.button("Next ➡️", key=f"{name}_next{key}", disabled=next_cursor is None):
+            pages.append(next_cursor)
+            st.rerun()
+
+def show_api_error(error, message):
+    """Report a failed call; a 401 renews the access token or ends the session"""
+    if error.status_code == 401:
+        if refresh_access_token():
+            st.rerun()
+        st.error("🔒 Authentication failed. Please login again.")
+        logout_user()
+        st.rerun()
+    elif error.status_code == 403:
+        st.error("🚫 Access denied. Admin privileges required.")
+    else:
+        st.error(f"❌ {message}: {error.detail}")
+
+def token_expiry(token):
+    """The `exp` claim of a JWT, decoded locally (the API still verifies the signature)"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+    except (IndexError, ValueError, AttributeError):
+        return None
+
+def token_fresh(token):
+    """True while the token is more than the refresh margin away from expiry"""
+    exp = token_expiry(token)
+    return exp is not None and exp - time.time() > config.dashboard_token_refresh_margin_seconds
+
+def store_tokens(data):
+    """Store a login/refresh response in session state (and the access token in the URL)"""
+    st.session_state.access_token = data["access_token"]
+    # Just issued by the server, no need to check it with /me
+    st.session_state.validated_token = data["access_token"]
+    st.session_state.refresh_token = data.get("refresh_token")
+    st.session_state.user_info = data["user"]
+    st.session_state.is_admin = data["user"]["role"] == "admin"
+    
+    # Save to URL for persistence across page reloads
+    save_session_to_url(data["access_token"], data["user"], st.session_state.is_admin)
+
+def refresh_access_token():
+    """Renew the access token with the refresh token (no password needed)"""
+    refresh_token = st.session_state.get("refresh_token")
+    if not refresh_token:
+        return False
+    
+    try:
+        response = api_request("POST", f"{AUTH_API}/refresh", json={"refresh_token": refresh_token})
+        if response.status_code == 200:
+            store_tokens(response.json())
+            return True
+    except requests.RequestException:
+        pass
+    return False
 
 def validate_token():
-    """Validate if current token is still valid"""
-    if not st.session_state.access_token:
+    """Validate if current token is still valid.
+    
+    A token the server has accepted once is trusted until shortly before its
+    `exp`; then it is renewed with the refresh token. /me is only called for
+    tokens not seen by the server in this session (e.g. restored from the URL).
+    A 401 from a real call goes through show_api_error instead.
+    """
+    token = st.session_state.access_token
+    if not token:
         return False
     
+    if token_fresh(token):
+        if st.session_state.get("validated_token") == token:
+            return True
+    elif refresh_access_token():
+        return True
+    
     try:
-        response = requests.get(f"{AUTH_API}/me", headers=get_auth_headers())
+        response = api_request("GET", f"{AUTH_API}/me", token)
         if response.status_code == 200:
+            st.session_state.validated_token = token
+            return True
+        elif response.status_code == 401 and refresh_access_token():
             return True
         else:
             # Token is invalid, logout user
@@ -138,20 +353,14 @@ check_auth_on_page_load()
 def login_user(email, password):
     """Login user and store token"""
     try:
-        response = requests.post(f"{AUTH_API}/login", json={
+        response = api_request("POST", f"{AUTH_API}/login", json={
             "email": email,
             "password": password
         })
         
         if response.status_code == 200:
-            data = response.json()
-            # Store in session state
-            st.session_state.access_token = data["access_token"]
-            st.session_state.user_info = data["user"]
-            st.session_state.is_admin = data["user"]["role"] == "admin"
-            
-            # Save to URL for persistence across page reloads
-            save_session_to_url(data["access_token"], data["user"], data["user"]["role"] == "admin")
+            # Store in session state and URL
+            store_tokens(response.json())
             
             return True, "Login successful!"
         else:
@@ -162,8 +371,17 @@ def login_user(email, password):
 
 def logout_user():
     """Logout user and clear session"""
+    # Revoke the refresh token server-side
+    if st.session_state.get("refresh_token"):
+        try:
+            api_request("POST", f"{AUTH_API}/logout", json={"refresh_token": st.session_state.refresh_token})
+        except requests.RequestException:
+            pass
+    
     # Clear session state
     st.session_state.access_token = None
+    st.session_state.validated_token = None
+    st.session_state.refresh_token = None
     st.session_state.user_info = None
     st.session_state.is_admin = False
     
@@ -173,7 +391,7 @@ def logout_user():
 def register_user(email, password, full_name):
     """Register new user"""
     try:
-        response = requests.post(f"{AUTH_API}/register", json={
+        response = api_request("POST", f"{AUTH_API}/register", json={
             "email": email,
             "password": password,
             "full_name": full_name
@@ -190,7 +408,7 @@ def register_user(email, password, full_name):
 def create_admin_user(email, password, full_name="System Administrator"):
     """Create admin user"""
     try:
-        response = requests.post(f"{AUTH_API}/create-admin", json={
+        response = api_request("POST", f"{AUTH_API}/create-admin", json={
             "email": email,
             "password": password,
             "full_name": full_name
@@ -204,6 +422,49 @@ def create_admin_user(email, password, full_name="System Administrator"):
     except Exception as e:
         return False, f"Connection error: {e}"
 
+# ============ SEAT MAP ============
+
+SEAT_COLORS = {"open": "#2e7d32", "locked": "#f9a825", "booked": "#c62828"}
+
+def seat_frame(seats):
+    """Seats as a DataFrame, with row label and seat number parsed from the description.
+    
+    None when any description isn't "Row X Seat N" (e.g. custom seat names);
+    such venues are shown as a plain list.
+    """
+    seat_df = pd.DataFrame(seats)
+    parts = seat_df["description"].str.extract(r"^Row (\w+) Seat (\d+)$")
+    numbers = pd.to_numeric(parts[1], errors="coerce")
+    if parts[0].isna().any() or numbers.isna().any():
+        return None
+    seat_df["row"] = parts[0]
+    seat_df["number"] = numbers.astype(int)
+    return seat_df
+
+def seat_map_chart(seat_df):
+    """The whole venue as one heatmap; clicking open seats selects them"""
+    # A..Z before AA..AZ
+    row_order = sorted(seat_df["row"].unique(), key=lambda row: (len(row), row))
+    selection = alt.selection_point(name="seats", fields=["seat_id"], toggle="true", empty=False)
+    return alt.Chart(seat_df).mark_rect(cornerRadius=2).encode(
+        x=alt.X("number:O", title="Seat", axis=alt.Axis(labelAngle=0)),
+        y=alt.Y("row:O", title="Row", sort=row_order),
+        color=alt.Color(
+            "status:N",
+            scale=alt.Scale(domain=list(SEAT_COLORS), range=list(SEAT_COLORS.values())),
+            legend=alt.Legend(orient="top", title=None)
+        ),
+        stroke=alt.condition(selection, alt.value("#1565c0"), alt.value(None)),
+        strokeWidth=alt.condition(selection, alt.value(3), alt.value(0)),
+        tooltip=["seat_id", "description", "price", "status"]
+    ).add_params(selection).properties(height=max(len(row_order) * 18, 120))
+
+def selected_map_seats(selection_event, seat_df):
+    """Open seats clicked on the seat map"""
+    clicked = {point["seat_id"] for point in selection_event["selection"].get("seats", [])}
+    open_seats = seat_df.loc[seat_df["status"] == "open", "seat_id"]
+    return [int(seat_id) for seat_id in open_seats if seat_id in clicked]
+
 # Header with authentication
 col1, col2, col3 = st.columns([2, 2, 1])
 
@@ -317,37 +578,50 @@ else:
 
     if page == "🎥 Browse Movies":
         st.header("Available Movies")
+        search_query = st.text_input("🔍 Search movies", placeholder="Title or description words")
+        
+        # A new search starts from its first page
+        list_name = "search" if search_query.strip() else "events"
+        if st.session_state.get("search_pages_query") != search_query.strip():
+            st.session_state.search_pages_query = search_query.strip()
+            reset_pages("search")
         
         try:
             # ALL API calls need auth headers - including user endpoints
-            response = requests.get(f"{API_BASE}/events", headers=get_auth_headers())
-            if response.status_code == 200:
-                events = response.json()
-                
-                if events:
-                    # Display movies in a nice format
-                    for event in events:
-                        with st.container():
-                            col1, col2, col3 = st.columns([3, 2, 2])
-                            
-                            with col1:
-                                st.subheader(event['movie_title'])
-                                st.write(event['movie_description'])
-                            
-                            with col2:
-                                st.write(f"**Show Time:** {event['start_time'][:19]}")
-                                st.write(f"**Event ID:** {event['event_id']}")
-                            
-                            with col3:
-                                if st.button(f"Book Now", key=f"book_{event['event_id']}"):
-                                    st.session_state.selected_event = event['event_id']
-                                    st.success(f"✅ Selected Event {event['event_id']}! Go to 'Book Tickets' page to continue.")
-                            
-                            st.divider()
-                else:
-                    st.info("No movies available at the moment.")
+            if search_query.strip():
+                events, next_cursor = search_events(
+                    st.session_state.access_token, search_query.strip(), page_cursor(list_name)
+                )
             else:
-                st.error("Failed to fetch movies from API")
+                events, next_cursor = get_events(st.session_state.access_token, page_cursor(list_name))
+            
+            if events:
+                # Display movies in a nice format
+                for event in events:
+                    with st.container():
+                        col1, col2, col3 = st.columns([3, 2, 2])
+                        
+                        with col1:
+                            st.subheader(event['movie_title'])
+                            st.write(event['movie_description'])
+                        
+                        with col2:
+                            st.write(f"**Show Time:** {event['start_time'][:19]}")
+                            st.write(f"**Event ID:** {event['event_id']}")
+                        
+                        with col3:
+                            if st.button(f"Book Now", key=f"book_{event['event_id']}"):
+                                st.session_state.selected_event = event['event_id']
+                                st.success(f"✅ Selected Event {event['event_id']}! Go to 'Book Tickets' page to continue.")
+                        
+                        st.divider()
+            elif search_query.strip():
+                st.info(f"No movies match '{search_query.strip()}'.")
+            else:
+                st.info("No movies available at the moment.")
+            page_controls(list_name, next_cursor)
+        except APIError as e:
+            show_api_error(e, "Failed to fetch movies from API")
         except Exception as e:
             st.error(f"Error connecting to API: {e}")
 
@@ -367,15 +641,13 @@ else:
             with st.spinner("Loading seats..."):
                 try:
                     # ALL API calls need auth headers
-                    response = requests.get(f"{API_BASE}/events/{event_id}/seats", headers=get_auth_headers())
-                    if response.status_code == 200:
-                        st.session_state.seat_data = response.json()
-                        st.session_state.seats_loaded = True
-                        st.session_state.current_event_id = event_id
-                        st.success("✅ Seats loaded successfully!")
-                    else:
-                        st.error("Failed to load seats")
-                        st.session_state.seats_loaded = False
+                    st.session_state.seat_data = api_get(f"{API_BASE}/events/{event_id}/seats", st.session_state.access_token)
+                    st.session_state.seats_loaded = True
+                    st.session_state.current_event_id = event_id
+                    st.success("✅ Seats loaded successfully!")
+                except APIError:
+                    st.error("Failed to load seats")
+                    st.session_state.seats_loaded = False
                 except Exception as e:
                     st.error(f"Error: {e}")
                     st.session_state.seats_loaded = False
@@ -405,27 +677,41 @@ else:
             # Create a visual seat map
             st.subheader("Seat Layout")
             
-            # Group seats by row for better display
-            seat_rows = {}
-            for seat in seats:
-                row = seat['description'].split()[1]  # Extract row from "Row A Seat 1"
-                if row not in seat_rows:
-                    seat_rows[row] = []
-                seat_rows[row].append(seat)
-            
-            # Display seats row by row
-            for row_name in sorted(seat_rows.keys()):
-                row_seats = sorted(seat_rows[row_name], key=lambda x: int(x['description'].split()[-1]))
-                
-                st.write(f"**Row {row_name}**")
-                cols = st.columns(len(row_seats))
+            map_seats = []
+            seat_df = seat_frame(seats)
+            if seat_df is None:
+                # Seat names without rows and numbers: no layout to draw
+                st.dataframe(
+                    pd.DataFrame(seats)[["seat_id", "description", "price", "status"]],
+                    hide_index=True, use_container_width=True
+                )
+            elif len(seats) > config.dashboard_seat_grid_threshold:
+                # Large venue: one chart instead of thousands of elements
+                st.caption("Click open seats to select them (click again to deselect).")
+                selection_event = st.altair_chart(
+                    seat_map_chart(seat_df), use_container_width=True,
+                    on_select="rerun", key=f"seat_map_{st.session_state.current_event_id}"
+                )
+                map_seats = selected_map_seats(selection_event, seat_df)
+            else:
+                # Group seats by row for better display
+                seat_rows = {}
+                for seat in seat_df.to_dict("records"):
+                    seat_rows.setdefault(seat['row'], []).append(seat)
                 
-                for i, seat in enumerate(row_seats):
-                    with cols[i]:
-                        status_color = {"open": "🟢", "locked": "🟡", "booked": "🔴"}
-                        color = status_color.get(seat['status'], "⚪")
-                        st.write(f"{color} {seat['seat_id']}")
-                        st.caption(f"${seat['price']}")
+                # Display seats row by row
+                for row_name in sorted(seat_rows.keys(), key=lambda row: (len(row), row)):
+                    row_seats = sorted(seat_rows[row_name], key=lambda x: x['number'])
+                    
+                    st.write(f"**Row {row_name}**")
+                    cols = st.columns(len(row_seats))
+                    
+                    for i, seat in enumerate(row_seats):
+                        with cols[i]:
+                            status_color = {"open": "🟢", "locked": "🟡", "booked": "🔴"}
+                            color = status_color.get(seat['status'], "⚪")
+                            st.write(f"{color} {seat['seat_id']}")
+                            st.caption(f"${seat['price']}")
             
             st.divider()
             
@@ -440,6 +726,7 @@ else:
                     selected_seats = st.multiselect(
                         "Select Seats (you can select multiple):", 
                         available_seats,
+                        default=map_seats,
                         help="Choose the seats you want to book"
                     )
                     
@@ -466,7 +753,7 @@ else:
                                 }
                                 
                                 # ALL API calls need auth headers
-                                response = requests.post(f"{API_BASE}/book-seats", json=booking_data, headers=get_auth_headers())
+                                response = api_request("POST", f"{API_BASE}/book-seats", st.session_state.access_token, json=booking_data)
                                 
                                 if response.status_code == 200:
                                     result = response.json()
@@ -490,6 +777,7 @@ else:
                                     
                                     # Force refresh seat data
                                     st.session_state.seats_loaded = False
+                                    invalidate_catalog()
                                     
                                 else:
                                     error_detail = response.json().get('detail', 'Unknown error')
@@ -524,11 +812,12 @@ else:
                 if confirm_payment and booking_ref:
                     try:
                         # ALL API calls need auth headers
-                        response = requests.post(f"{API_BASE}/confirm-payment", 
-                                               json={"booking_reference": booking_ref}, headers=get_auth_headers())
+                        response = api_request("POST", f"{API_BASE}/confirm-payment", st.session_state.access_token,
+                                               json={"booking_reference": booking_ref})
                         if response.status_code == 200:
                             result = response.json()
                             st.success(f"✅ {result['message']}")
+                            invalidate_catalog()
                             st.balloons()  # Celebration effect!
                         else:
                             error_detail = response.json().get('detail', 'Unknown error')
@@ -539,8 +828,8 @@ else:
                 if cancel_booking and booking_ref:
                     try:
                         # ALL API calls need auth headers
-                        response = requests.post(f"{API_BASE}/cancel-booking", 
-                                               json={"booking_reference": booking_ref}, headers=get_auth_headers())
+                        response = api_request("POST", f"{API_BASE}/cancel-booking", st.session_state.access_token,
+                                               json={"booking_reference": booking_ref})
                         if response.status_code == 200:
                             result = response.json()
                             st.success(f"✅ {result['message']}")
@@ -548,6 +837,7 @@ else:
                                 del st.session_state.last_booking
                             # Force refresh seat data
                             st.session_state.seats_loaded = False
+                            invalidate_catalog()
                         else:
                             error_detail = response.json().get('detail', 'Unknown error')
                             st.error(f"❌ Cancellation failed: {error_detail}")
@@ -566,6 +856,7 @@ else:
             col1, col2 = st.columns([1, 4])
             with col1:
                 if st.button("🔄 Refresh", type="primary"):
+                    invalidate_catalog()
                     st.rerun()
             
             # System stats
@@ -573,62 +864,55 @@ else:
             
             try:
                 # Use ADMIN endpoint with auth headers
-                response = requests.get(f"{ADMIN_API}/events", headers=get_auth_headers())
-                if response.status_code == 200:
-                    events = response.json()
-                    
-                    total_events = len(events)
-                    
-                    # Calculate stats from admin event data
-                    total_seats = sum(event['total_seats'] for event in events)
-                    total_booked = sum(event['booked_seats'] for event in events)
-                    total_locked = sum(event['locked_seats'] for event in events)
-                    
-                    # Display metrics
-                    col1, col2, col3, col4, col5 = st.columns(5)
-                    with col1:
-                        st.metric("🎬 Total Events", total_events)
-                    with col2:
-                        st.metric("🎭 Total Seats", total_seats)
-                    with col3:
-                        st.metric("🔴 Confirmed Bookings", total_booked)
-                    with col4:
-                        st.metric("🟡 Pending Bookings", total_locked)
-                    with col5:
-                        available = total_seats - total_booked - total_locked
-                        st.metric("🟢 Available Seats", available)
-                    
-                    # Occupancy rate
-                    if total_seats > 0:
-                        occupancy_rate = ((total_booked + total_locked) / total_seats) * 100
-                        st.metric("📈 Overall Occupancy Rate", f"{occupancy_rate:.1f}%")
+                overview, next_cursor = get_admin_overview(st.session_state.access_token, page_cursor("admin_events"))
+                events = overview["events"]
+                
+                # Totals over all events come from the server; the list below is one page
+                total_events = overview["total_events"]
+                total_seats = overview["total_seats"]
+                total_booked = overview["booked_seats"]
+                total_locked = overview["locked_seats"]
+                
+                # Display metrics
+                col1, col2, col3, col4, col5 = st.columns(5)
+                with col1:
+                    st.metric("🎬 Total Events", total_events)
+                with col2:
+                    st.metric("🎭 Total Seats", total_seats)
+                with col3:
+                    st.metric("🔴 Confirmed Bookings", total_booked)
+                with col4:
+                    st.metric("🟡 Pending Bookings", total_locked)
+                with col5:
+                    available = total_seats - total_booked - total_locked
+                    st.metric("🟢 Available Seats", available)
+                
+                # Occupancy rate
+                if total_seats > 0:
+                    occupancy_rate = ((total_booked + total_locked) / total_seats) * 100
+                    st.metric("📈 Overall Occupancy Rate", f"{occupancy_rate:.1f}%")
+                
+                # Show events table
+                if events:
+                    st.divider()
+                    st.subheader("📋 All Events")
+                    # Convert to DataFrame for better display
+                    events_df = pd.DataFrame(events)
+                    st.dataframe(events_df, use_container_width=True)
+                    page_controls("admin_events", next_cursor, key="_overview")
                     
-                    # Show events table
-                    if events:
-                        st.divider()
-                        st.subheader("📋 All Active Events")
-                        # Convert to DataFrame for better display
-                        events_df = pd.DataFrame(events)
-                        st.dataframe(events_df, use_container_width=True)
-                        
-                        # Quick insights (removed revenue)
-                        st.subheader("🔍 Quick Insights")
-                        if total_events > 0:
-                            avg_seats_per_event = total_seats / total_events
-                            st.write(f"• **Average seats per event:** {avg_seats_per_event:.1f}")
-                            if total_booked > 0:
-                                st.write(f"• **Total confirmed bookings:** {total_booked}")
-                        else:
-                            st.info("No events available for analysis.")
-                elif response.status_code == 401:
-                    st.error("🔒 Authentication failed. Please login again.")
-                    logout_user()
-                    st.rerun()
-                elif response.status_code == 403:
-                    st.error("🚫 Access denied. Admin privileges required.")
-                else:
-                    st.error("Failed to fetch events from API")
+                    # Quick insights (removed revenue)
+                    st.subheader("🔍 Quick Insights")
+                    if total_events > 0:
+                        avg_seats_per_event = total_seats / total_events
+                        st.write(f"• **Average seats per event:** {avg_seats_per_event:.1f}")
+                        if total_booked > 0:
+                            st.write(f"• **Total confirmed bookings:** {total_booked}")
+                    else:
+                        st.info("No events available for analysis.")
                 
+            except APIError as e:
+                show_api_error(e, "Failed to fetch events from API")
             except Exception as e:
                 st.error(f"Error loading admin data: {e}")
         
@@ -638,85 +922,80 @@ else:
             
             # Display existing movies
             try:
-                response = requests.get(f"{ADMIN_API}/movies", headers=get_auth_headers())
-                if response.status_code == 200:
-                    movies = response.json()
+                movies, next_cursor = get_admin_movies(st.session_state.access_token, page_cursor("admin_movies"))
+                
+                if movies:
+                    st.write("### Current Movie Catalog")
                     
-                    if movies:
-                        st.write("### Current Movie Catalog")
-                        
-                        # Display movies with action buttons
-                        for movie in movies:
-                            with st.container():
-                                col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
-                                
-                                with col1:
-                                    st.write(f"**{movie['title']}**")
-                                    st.caption(movie['description'] or "No description")
-                                
-                                with col2:
-                                    st.write(f"**Movie ID:** {movie['id']}")
-                                
-                                with col3:
-                                    # Edit button
-                                    if st.button("✏️ Edit", key=f"edit_movie_{movie['id']}"):
-                                        st.session_state[f"editing_movie_{movie['id']}"] = True
-                                
-                                with col4:
-                                    # Delete button
-                                    if st.button("🗑️ Delete", key=f"delete_movie_{movie['id']}", type="secondary"):
-                                        try:
-                                            del_response = requests.delete(f"{ADMIN_API}/movies/{movie['id']}", headers=get_auth_headers())
-                                            if del_response.status_code == 200:
-                                                st.success("✅ Movie deleted successfully!")
-                                                st.rerun()
-                                            else:
-                                                st.error("❌ Failed to delete movie")
-                                        except Exception as e:
-                                            st.error(f"❌ Error: {e}")
-                                
-                                # Edit form (shown when edit button is clicked)
-                                if st.session_state.get(f"editing_movie_{movie['id']}", False):
-                                    with st.form(f"edit_movie_form_{movie['id']}"):
-                                        st.write(f"### ✏️ Edit: {movie['title']}")
-                                        new_title = st.text_input("Title:", value=movie['title'])
-                                        new_description = st.text_area("Description:", value=movie['description'] or "")
-                                        
-                                        col_save, col_cancel = st.columns(2)
-                                        with col_save:
-                                            if st.form_submit_button("💾 Save Changes", type="primary"):
-                                                try:
-                                                    update_data = {
-                                                        "title": new_title,
-                                                        "description": new_description
-                                                    }
-                                                    update_response = requests.put(f"{ADMIN_API}/movies/{movie['id']}", 
-                                                                                 json=update_data, headers=get_auth_headers())
-                                                    if update_response.status_code == 200:
-                                                        st.success("✅ Movie updated successfully!")
-                                                        st.session_state[f"editing_movie_{movie['id']}"] = False
-                                                        st.rerun()
-                                                    else:
-                                                        st.error("❌ Failed to update movie")
-                                                except Exception as e:
-                                                    st.error(f"❌ Error: {e}")
-                                        
-                                        with col_cancel:
-                                            if st.form_submit_button("❌ Cancel"):
-                                                st.session_state[f"editing_movie_{movie['id']}"] = False
-                                                st.rerun()
-                                
-                                st.divider()
-                    else:
-                        st.info("📽️ No movies in catalog. Add your first movie below!")
-                elif response.status_code == 401:
-                    st.error("🔒 Authentication failed. Please login again.")
-                    logout_user()
-                    st.rerun()
-                elif response.status_code == 403:
-                    st.error("🚫 Access denied. Admin privileges required.")
+                    # Display movies with action buttons
+                    for movie in movies:
+                        with st.container():
+                            col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+                            
+                            with col1:
+                                st.write(f"**{movie['title']}**")
+                                st.caption(movie['description'] or "No description")
+                            
+                            with col2:
+                                st.write(f"**Movie ID:** {movie['id']}")
+                            
+                            with col3:
+                                # Edit button
+                                if st.button("✏️ Edit", key=f"edit_movie_{movie['id']}"):
+                                    st.session_state[f"editing_movie_{movie['id']}"] = True
+                            
+                            with col4:
+                                # Delete button
+                                if st.button("🗑️ Delete", key=f"delete_movie_{movie['id']}", type="secondary"):
+                                    try:
+                                        del_response = api_request("DELETE", f"{ADMIN_API}/movies/{movie['id']}", st.session_state.access_token)
+                                        if del_response.status_code == 200:
+                                            invalidate_catalog()
+                                            st.success("✅ Movie deleted successfully!")
+                                            st.rerun()
+                                        else:
+                                            st.error("❌ Failed to delete movie")
+                                    except Exception as e:
+                                        st.error(f"❌ Error: {e}")
+                            
+                            # Edit form (shown when edit button is clicked)
+                            if st.session_state.get(f"editing_movie_{movie['id']}", False):
+                                with st.form(f"edit_movie_form_{movie['id']}"):
+                                    st.write(f"### ✏️ Edit: {movie['title']}")
+                                    new_title = st.text_input("Title:", value=movie['title'])
+                                    new_description = st.text_area("Description:", value=movie['description'] or "")
+                                    
+                                    col_save, col_cancel = st.columns(2)
+                                    with col_save:
+                                        if st.form_submit_button("💾 Save Changes", type="primary"):
+                                            try:
+                                                update_data = {
+                                                    "title": new_title,
+                                                    "description": new_description
+                                                }
+                                                update_response = api_request("PUT", f"{ADMIN_API}/movies/{movie['id']}", st.session_state.access_token,
+                                                                             json=update_data)
+                                                if update_response.status_code == 200:
+                                                    invalidate_catalog()
+                                                    st.success("✅ Movie updated successfully!")
+                                                    st.session_state[f"editing_movie_{movie['id']}"] = False
+                                                    st.rerun()
+                                                else:
+                                                    st.error("❌ Failed to update movie")
+                                            except Exception as e:
+                                                st.error(f"❌ Error: {e}")
+                                    
+                                    with col_cancel:
+                                        if st.form_submit_button("❌ Cancel"):
+                                            st.session_state[f"editing_movie_{movie['id']}"] = False
+                                            st.rerun()
+                            
+                            st.divider()
                 else:
-                    st.error("❌ Failed to load movies")
+                    st.info("📽️ No movies in catalog. Add your first movie below!")
+                page_controls("admin_movies", next_cursor)
+            except APIError as e:
+                show_api_error(e, "Failed to load movies")
             except Exception as e:
                 st.error(f"❌ Error loading movies: {e}")
             
@@ -736,9 +1015,10 @@ else:
                                 "description": movie_description if movie_description else None
                             }
                             
-                            response = requests.post(f"{ADMIN_API}/movies", json=movie_data, headers=get_auth_headers())
+                            response = api_request("POST", f"{ADMIN_API}/movies", st.session_state.access_token, json=movie_data)
                             
                             if response.status_code == 200:
+                                invalidate_catalog()
                                 result = response.json()
                                 st.success(f"✅ Movie '{result['title']}' added to catalog!")
                                 st.rerun()
@@ -758,118 +1038,115 @@ else:
             
             # Display existing events
             try:
-                response = requests.get(f"{ADMIN_API}/events", headers=get_auth_headers())
-                if response.status_code == 200:
-                    events = response.json()
+                overview, next_cursor = get_admin_overview(st.session_state.access_token, page_cursor("admin_events"))
+                events = overview["events"]
+                
+                if events:
+                    st.write("### Current Events & Showtimes")
                     
-                    if events:
-                        st.write("### Current Events & Showtimes")
-                        
-                        # Display events with action buttons
-                        for event in events:
-                            with st.container():
-                                col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
-                                
-                                with col1:
-                                    st.write(f"**{event['movie_title']}**")
-                                    st.caption(f"🕐 {event['start_time'][:19].replace('T', ' at ')}")
-                                
-                                with col2:
-                                    st.write(f"**Event ID:** {event['id']}")
-                                    st.write(f"🎭 {event['available_seats']}/{event['total_seats']} available")
-                                    if event['booked_seats'] > 0:
-                                        st.write(f"💰 {event['booked_seats']} confirmed bookings")
-                                
-                                with col3:
-                                    # Edit button
-                                    if st.button("✏️ Edit", key=f"edit_event_{event['id']}"):
-                                        st.session_state[f"editing_event_{event['id']}"] = True
-                                
-                                with col4:
-                                    # Delete button (with business logic)
-                                    if event['booked_seats'] > 0:
-                                        st.button("🔒 Protected", key=f"protected_event_{event['id']}", 
-                                                 disabled=True, help=f"Cannot delete: {event['booked_seats']} confirmed bookings")
-                                    else:
-                                        if st.button("🗑️ Delete", key=f"delete_event_{event['id']}", type="secondary"):
-                                            try:
-                                                del_response = requests.delete(f"{ADMIN_API}/events/{event['id']}", headers=get_auth_headers())
-                                                if del_response.status_code == 200:
-                                                    st.success("✅ Event deleted successfully!")
-                                                    st.rerun()
-                                                else:
-                                                    st.error("❌ Failed to delete event")
-                                            except Exception as e:
-                                                st.error(f"❌ Error: {e}")
-                                
-                                # Edit form (shown when edit button is clicked)
-                                if st.session_state.get(f"editing_event_{event['id']}", False):
-                                    with st.form(f"edit_event_form_{event['id']}"):
-                                        st.write(f"### ✏️ Edit Event: {event['movie_title']}")
-                                        
-                                        # Get movies for dropdown
+                    # Display events with action buttons
+                    for event in events:
+                        with st.container():
+                            col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+                            
+                            with col1:
+                                st.write(f"**{event['movie_title']}**")
+                                st.caption(f"🕐 {event['start_time'][:19].replace('T', ' at ')}")
+                            
+                            with col2:
+                                st.write(f"**Event ID:** {event['id']}")
+                                st.write(f"🎭 {event['available_seats']}/{event['total_seats']} available")
+                                if event['booked_seats'] > 0:
+                                    st.write(f"💰 {event['booked_seats']} confirmed bookings")
+                            
+                            with col3:
+                                # Edit button
+                                if st.button("✏️ Edit", key=f"edit_event_{event['id']}"):
+                                    st.session_state[f"editing_event_{event['id']}"] = True
+                            
+                            with col4:
+                                # Delete button (with business logic)
+                                if event['booked_seats'] > 0:
+                                    st.button("🔒 Protected", key=f"protected_event_{event['id']}", 
+                                             disabled=True, help=f"Cannot delete: {event['booked_seats']} confirmed bookings")
+                                else:
+                                    if st.button("🗑️ Delete", key=f"delete_event_{event['id']}", type="secondary"):
                                         try:
-                                            movies_response = requests.get(f"{ADMIN_API}/movies", headers=get_auth_headers())
-                                            if movies_response.status_code == 200:
-                                                movies = movies_response.json()
-                                                movie_options = {movie['title']: movie['id'] for movie in movies}
-                                                
-                                                # Find current movie
-                                                current_movie = next((title for title, id in movie_options.items() if id == event['movie_id']), event['movie_title'])
-                                                
-                                                selected_movie = st.selectbox("Movie:", options=list(movie_options.keys()), 
-                                                                             index=list(movie_options.keys()).index(current_movie) if current_movie in movie_options else 0)
-                                                
-                                                # Parse current start time
-                                                current_datetime = datetime.fromisoformat(event['start_time'].replace('Z', '+00:00'))
-                                                
-                                                col1, col2 = st.columns(2)
-                                                with col1:
-                                                    event_date = st.date_input("Event Date:", value=current_datetime.date())
-                                                with col2:
-                                                    event_time = st.time_input("Start Time:", value=current_datetime.time())
-                                                
-                                                col_save, col_cancel = st.columns(2)
-                                                with col_save:
-                                                    if st.form_submit_button("💾 Save Changes", type="primary"):
-                                                        try:
-                                                            # Combine date and time
-                                                            new_datetime = datetime.combine(event_date, event_time)
-                                                            
-                                                            update_data = {
-                                                                "movie_id": movie_options[selected_movie],
-                                                                "start_time": new_datetime.isoformat()
-                                                            }
-                                                            
-                                                            update_response = requests.put(f"{ADMIN_API}/events/{event['id']}", 
-                                                                                         json=update_data, headers=get_auth_headers())
-                                                            if update_response.status_code == 200:
-                                                                st.success("✅ Event updated successfully!")
-                                                                st.session_state[f"editing_event_{event['id']}"] = False
-                                                                st.rerun()
-                                                            else:
-                                                                st.error("❌ Failed to update event")
-                                                        except Exception as e:
-                                                            st.error(f"❌ Error: {e}")
-                                                
-                                                with col_cancel:
-                                                    if st.form_submit_button("❌ Cancel"):
-                                                        st.session_state[f"editing_event_{event['id']}"] = False
-                                                        st.rerun()
+                                            del_response = api_request("DELETE", f"{ADMIN_API}/events/{event['id']}", st.session_state.access_token)
+                                            if del_response.status_code == 200:
+                                                invalidate_catalog()
+                                                st.success("✅ Event deleted successfully!")
+                                                st.rerun()
                                             else:
-                                                st.error("❌ Failed to load movies for editing")
+                                                st.error("❌ Failed to delete event")
                                         except Exception as e:
-                                            st.error(f"❌ Error loading movies: {e}")
-                                
-                                st.divider()
-                    else:
-                        st.info("🎭 No events scheduled. Create your first event below!")
-                elif response.status_code == 401:
-                    st.error("🔒 Authentication failed. Please login again.")
-                    logout_user()
-                    st.rerun()
+                                            st.error(f"❌ Error: {e}")
+                            
+                            # Edit form (shown when edit button is clicked)
+                            if st.session_state.get(f"editing_event_{event['id']}", False):
+                                # Outside the form, so the movie choices follow it as you type
+                                movie_query = st.text_input("Find movie:", key=f"edit_event_movie_query_{event['id']}",
+                                                            placeholder="Title words")
+                                with st.form(f"edit_event_form_{event['id']}"):
+                                    st.write(f"### ✏️ Edit Event: {event['movie_title']}")
+                                    
+                                    # Matching movies for the dropdown, the current one first
+                                    try:
+                                        movie_options = movie_choices(st.session_state.access_token, movie_query.strip(),
+                                                                      current=(event['movie_id'], event['movie_title']))
+                                        current_movie = next(label for label, id in movie_options.items() if id == event['movie_id'])
+                                        
+                                        selected_movie = st.selectbox("Movie:", options=list(movie_options.keys()), 
+                                                                     index=list(movie_options.keys()).index(current_movie))
+                                        
+                                        # Parse current start time
+                                        current_datetime = datetime.fromisoformat(event['start_time'].replace('Z', '+00:00'))
+                                        
+                                        col1, col2 = st.columns(2)
+                                        with col1:
+                                            event_date = st.date_input("Event Date:", value=current_datetime.date())
+                                        with col2:
+                                            event_time = st.time_input("Start Time:", value=current_datetime.time())
+                                        
+                                        col_save, col_cancel = st.columns(2)
+                                        with col_save:
+                                            if st.form_submit_button("💾 Save Changes", type="primary"):
+                                                try:
+                                                    # Combine date and time
+                                                    new_datetime = datetime.combine(event_date, event_time)
+                                                    
+                                                    update_data = {
+                                                        "movie_id": movie_options[selected_movie],
+                                                        "start_time": new_datetime.isoformat()
+                                                    }
+                                                    
+                                                    update_response = api_request("PUT", f"{ADMIN_API}/events/{event['id']}", st.session_state.access_token,
+                                                                                 json=update_data)
+                                                    if update_response.status_code == 200:
+                                                        invalidate_catalog()
+                                                        st.success("✅ Event updated successfully!")
+                                                        st.session_state[f"editing_event_{event['id']}"] = False
+                                                        st.rerun()
+                                                    else:
+                                                        st.error("❌ Failed to update event")
+                                                except Exception as e:
+                                                    st.error(f"❌ Error: {e}")
+                                        
+                                        with col_cancel:
+                                            if st.form_submit_button("❌ Cancel"):
+                                                st.session_state[f"editing_event_{event['id']}"] = False
+                                                st.rerun()
+                                    except APIError as e:
+                                        show_api_error(e, "Failed to load movies for editing")
+                                    except Exception as e:
+                                        st.error(f"❌ Error loading movies: {e}")
+                            
+                            st.divider()
                 else:
-                    st.error("❌ Failed to load events")
+                    st.info("🎭 No events scheduled. Create your first event below!")
+                page_controls("admin_events", next_cursor, key="_manage")
+            except APIError as e:
+                show_api_error(e, "Failed to load events")
             except Exception as e:
                 st.error(f"❌ Error loading events: {e}")
             
@@ -877,56 +1154,58 @@ else:
             st.divider()
             st.subheader("➕ Schedule New Event")
             
+            # Outside the form, so the movie choices follow it as you type
+            movie_query = st.text_input("Find movie:", key="add_event_movie_query", placeholder="Title words")
             with st.form("add_event_form"):
-                # Get movies for dropdown
+                # Matching movies for the dropdown
                 try:
-                    movies_response = requests.get(f"{ADMIN_API}/movies", headers=get_auth_headers())
-                    if movies_response.status_code == 200:
-                        movies = movies_response.json()
+                    movie_options = movie_choices(st.session_state.access_token, movie_query.strip())
+                    
+                    if movie_options:
+                        selected_movie = st.selectbox("Select Movie:", options=list(movie_options.keys()))
                         
-                        if movies:
-                            movie_options = {movie['title']: movie['id'] for movie in movies}
-                            selected_movie = st.selectbox("Select Movie:", options=list(movie_options.keys()))
-                            
-                            col1, col2 = st.columns(2)
-                            with col1:
-                                event_date = st.date_input("Event Date:")
-                            with col2:
-                                event_time = st.time_input("Start Time:")
-                            
-                            total_seats = st.number_input("Theater Capacity (seats):", min_value=1, value=25, max_value=200,
-                                                        help="Total number of seats to generate for this showing")
-                            
-                            if st.form_submit_button("🎭 Schedule Event", type="primary"):
-                                try:
-                                    # Combine date and time
-                                    event_datetime = datetime.combine(event_date, event_time)
-                                    
-                                    event_data = {
-                                        "movie_id": movie_options[selected_movie],
-                                        "start_time": event_datetime.isoformat(),
-                                        "total_seats": total_seats
-                                    }
-                                    
-                                    response = requests.post(f"{ADMIN_API}/events", json=event_data, headers=get_auth_headers())
-                                    
-                                    if response.status_code == 200:
-                                        result = response.json()
-                                        st.success(f"✅ Event scheduled! '{selected_movie}' with {result['total_seats']} seats available for booking.")
-                                        st.rerun()
-                                    elif response.status_code == 401:
-                                        st.error("🔒 Authentication failed. Please login again.")
-                                        logout_user()
-                                        st.rerun()
-                                    else:
-                                        error_detail = response.json().get('detail', 'Unknown error')
-                                        st.error(f"❌ Failed to schedule event: {error_detail}")
-                                except Exception as e:
-                                    st.error(f"❌ Error scheduling event: {e}")
-                        else:
-                            st.warning("⚠️ No movies available. Please add movies first in the 'Manage Movies' tab.")
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            event_date = st.date_input("Event Date:")
+                        with col2:
+                            event_time = st.time_input("Start Time:")
+                        
+                        total_seats = st.number_input("Theater Capacity (seats):", min_value=1, value=25, max_value=200,
+                                                    help="Total number of seats to generate for this showing")
+                        
+                        if st.form_submit_button("🎭 Schedule Event", type="primary"):
+                            try:
+                                # Combine date and time
+                                event_datetime = datetime.combine(event_date, event_time)
+                                
+                                event_data = {
+                                    "movie_id": movie_options[selected_movie],
+                                    "start_time": event_datetime.isoformat(),
+                                    "total_seats": total_seats
+                                }
+                                
+                                response = api_request("POST", f"{ADMIN_API}/events", st.session_state.access_token, json=event_data)
+                                
+                                if response.status_code == 200:
+                                    invalidate_catalog()
+                                    result = response.json()
+                                    st.success(f"✅ Event scheduled! '{selected_movie}' with {result['total_seats']} seats available for booking.")
+                                    st.rerun()
+                                elif response.status_code == 401:
+                                    st.error("🔒 Authentication failed. Please login again.")
+                                    logout_user()
+                                    st.rerun()
+                                else:
+                                    error_detail = response.json().get('detail', 'Unknown error')
+                                    st.error(f"❌ Failed to schedule event: {error_detail}")
+                            except Exception as e:
+                                st.error(f"❌ Error scheduling event: {e}")
+                    elif movie_query.strip():
+                        st.warning(f"⚠️ No movies match '{movie_query.strip()}'.")
                     else:
-                        st.error("❌ Failed to load movies")
+                        st.warning("⚠️ No movies available. Please add movies first in the 'Manage Movies' tab.")
+                except APIError as e:
+                    show_api_error(e, "Failed to load movies")
                 except Exception as e:
                     st.error(f"❌ Error loading movies: {e}")
 
@@ -1,13 +1,10 @@
 from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import declarative_base, sessionmaker
 from config import get_config
+from core.tracing import get_tracer
 
 # Get config once at module level
 config = get_config()
-
-# Database configuration from config object
-config = get_config()
 DATABASE_URL = config.database_url
 
 # Configure connection based on database type
@@ -23,10 +20,34 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+tracer = get_tracer(__name__)
+
 def get_db():
     """Database dependency for FastAPI"""
+    # Setup and teardown may run on different threads, so the span is not made current
+    span = tracer.start_span("db.session")
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+        span.end()
+
+def init_db():
+    """Create any missing tables.
+    
+    Run once per deploy (`python manage.py init-db`), or at worker startup
+    when CREATE_TABLES_ON_STARTUP is enabled - never at import time.
+    """
+    # Import every model so it is registered on Base.metadata
+    from models import movie, event, seat, user, session, archive, rate_limit, data_version  # noqa: F401
+    Base.metadata.create_all(bind=engine)
+    
+    # create_all skips tables that already exist, so add indexes introduced later
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    
+    # Movie search index (SQLite FTS5) and the triggers that keep it current
+    from core.search import create_search_index
+    create_search_index()
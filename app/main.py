@@ -1,21 +1,78 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+import anyio
 from fastapi import FastAPI
-from database import engine, Base
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from database import engine, init_db
 from routes.seat import router as seats_router
 from routes.admin import router as admin_router
 from routes.auth import router as auth_router
 from config import get_config
+from archive import run_archive_job
+from core.auth import verify_token
+from models.user import UserRole
+from core.health import ReadinessProbe
+from core.ratelimit import RateLimitMiddleware, MemoryBackend, DatabaseBackend, default_route_classes
+from core.loadshed import AdaptiveConcurrencyLimiter, LoadSheddingMiddleware, instrument_engine
+from core.metrics import REGISTRY, Gauge, MetricsMiddleware
+from core.sqlprofile import SQLProfilingMiddleware, instrument_engine as instrument_sql_profiling
+from core.accesslog import AccessLogMiddleware, TimedJSONResponse, dropped_records, start_access_log, stop_access_log
+from core.tracing import TracingMiddleware, instrument_engine as instrument_tracing, provider as tracer_provider
+from core.profiler import ProfilingMiddleware
+from core.compression import CompressionMiddleware
 
 # Import ALL models explicitly so SQLAlchemy knows about them
 from models.movie import Movie     # noqa: F401
 from models.event import Event     # noqa: F401
 from models.seat import Seat       # noqa: F401
 from models.user import User       # noqa: F401
+from models.session import UserSession  # noqa: F401
+from models.rate_limit import RateLimitBucket  # noqa: F401
+from models.archive import ArchivedEvent, ArchivedSeat  # noqa: F401
+from models.data_version import DataVersion  # noqa: F401
 
 # Get config once - this validates everything at startup
 config = get_config()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+logger = logging.getLogger(__name__)
+
+async def archive_scheduler(interval_minutes: int):
+    """Periodically move past events into the archive tables"""
+    while True:
+        try:
+            result = await run_in_threadpool(run_archive_job)
+            if result["events_archived"]:
+                logger.info(
+                    "Archived %s events and %s seats",
+                    result["events_archived"], result["seats_archived"]
+                )
+        except Exception:
+            logger.exception("Archive job failed")
+        await asyncio.sleep(interval_minutes * 60)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema creation is a deploy step; workers only do it when asked to
+    if config.create_tables_on_startup:
+        await run_in_threadpool(init_db)
+    
+    access_log = None
+    if config.access_log_enabled:
+        access_log = start_access_log(config.access_log_file, config.access_log_queue_size)
+    
+    archive_task = None
+    if config.archive_interval_minutes > 0:
+        archive_task = asyncio.create_task(archive_scheduler(config.archive_interval_minutes))
+    
+    yield
+    
+    if archive_task:
+        archive_task.cancel()
+    if access_log:
+        stop_access_log(access_log)
+    tracer_provider.shutdown()
 
 app = FastAPI(
     title=config.app_name,
@@ -42,8 +99,92 @@ app = FastAPI(
     - Seat Lock Duration: `{config.seat_lock_duration_minutes} minutes`
     """,
     version=config.app_version,
-    debug=config.debug
+    debug=config.debug,
+    lifespan=lifespan,
+    default_response_class=TimedJSONResponse
+)
+
+def rate_limit_user_key(token: str):
+    """Identify the client of a bearer token for per-user rate limits"""
+    token_data = verify_token(token)
+    return token_data["email"] if token_data else None
+
+def is_admin_token(token: str) -> bool:
+    """Whether a bearer token belongs to an admin, for admin-only request triggers"""
+    token_data = verify_token(token)
+    return token_data is not None and token_data["role"] == UserRole.ADMIN.value
+
+# Compress large JSON/text responses (gzip, plus brotli/zstd when installed)
+if config.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        min_size=config.compression_min_size,
+        preference=tuple(config.compression_algorithms),
+        cache_size=config.compression_cache_size
+    )
+
+# Per-request query counts/time, read by SQL profiling and the access log
+if config.sql_profiling or config.access_log_enabled:
+    instrument_sql_profiling(engine)
+
+# Opt-in SQL profiling: query counts, N+1 detection, Server-Timing
+if config.sql_profiling:
+    sql_logger = logging.getLogger("bookmemovie.sql")
+    sql_logger.setLevel(logging.INFO)
+    if not sql_logger.handlers:
+        sql_logger.addHandler(logging.StreamHandler())
+    app.add_middleware(SQLProfilingMiddleware, n_plus_one_threshold=config.sql_n_plus_one_threshold)
+
+# Opt-in sampling profiler for live requests
+if config.profiling_enabled:
+    app.add_middleware(
+        ProfilingMiddleware,
+        sample_rate=config.profile_sample_rate,
+        path_pattern=config.profile_path_pattern,
+        header=config.profile_header,
+        secret=config.profile_secret,
+        is_admin=is_admin_token
+    )
+
+# In-process tracing: root span per request, child spans for auth, SQL and rendering
+if config.tracing_enabled:
+    instrument_tracing(engine)
+    app.add_middleware(TracingMiddleware)
+
+# Request latency histograms (inside rate limiting/shedding, so rejected requests aren't timed)
+app.add_middleware(MetricsMiddleware)
+
+# Rate limiting per route class - outside the metrics middleware, so 429s are not timed
+if config.rate_limit_enabled:
+    if config.rate_limit_backend == "database":
+        rate_limit_backend = DatabaseBackend(engine)
+    else:
+        rate_limit_backend = MemoryBackend(max_keys=config.rate_limit_max_keys)
+    app.add_middleware(
+        RateLimitMiddleware,
+        route_classes=default_route_classes(config),
+        backend=rate_limit_backend,
+        identify_user=rate_limit_user_key
+    )
+
+# Adaptive load shedding - added late so it runs before the app middlewares
+limiter = AdaptiveConcurrencyLimiter(
+    min_limit=config.load_shed_min_limit,
+    max_limit=config.load_shed_max_limit,
+    target_latency_ms=config.load_shed_target_latency_ms,
+    db_target_latency_ms=config.load_shed_db_target_latency_ms
 )
+if config.load_shedding_enabled:
+    instrument_engine(engine, limiter)
+    app.add_middleware(LoadSheddingMiddleware, limiter=limiter)
+
+# Access log outermost, so shed and rate-limited requests are logged too
+if config.access_log_enabled:
+    app.add_middleware(
+        AccessLogMiddleware,
+        sample_rate=config.access_log_sample_rate,
+        slow_ms=config.access_log_slow_ms
+    )
 
 # Include routers
 app.include_router(auth_router, prefix="/api/auth", tags=["🔐 Authentication"])
@@ -60,13 +201,82 @@ def read_root():
         "setup": "Create admin user first via frontend or POST /api/auth/create-admin"
     }
 
+# ============ HEALTH PROBES ============
+
+readiness_probe = ReadinessProbe(
+    engine,
+    cache_seconds=config.health_cache_seconds,
+    max_db_latency_ms=config.health_max_db_latency_ms,
+    lock_duration_minutes=config.seat_lock_duration_minutes
+)
+
 @app.get("/health", tags=["📋 System Info"])
-def health_check():
+async def health_check():
     """Health check endpoint"""
+    readiness = await readiness_probe.check()
     return {
-        "status": "healthy",
+        "status": "healthy" if readiness["ready"] else "degraded",
         "app": config.app_name,
         "version": config.app_version,
-        "database": "connected" if engine else "disconnected",
+        "database": "connected" if readiness["database"] != "unavailable" else "disconnected",
         "config_valid": True
     }
+
+@app.get("/health/live", tags=["📋 System Info"])
+async def liveness_check():
+    """Liveness: the worker is up and its event loop is responsive (no DB access)"""
+    return {"status": "alive"}
+
+@app.get("/health/ready", tags=["📋 System Info"])
+async def readiness_check():
+    """Readiness: DB reachable and fast enough; 503 takes the worker out of rotation"""
+    readiness = await readiness_probe.check()
+    return JSONResponse(readiness, status_code=200 if readiness["ready"] else 503)
+
+@app.get("/metrics/load", tags=["📋 System Info"])
+def load_metrics():
+    """Current concurrency limit, latency signals and shed counts for this worker"""
+    return {
+        "enabled": config.load_shedding_enabled,
+        **limiter.stats()
+    }
+
+# ============ PROMETHEUS METRICS ============
+
+def _pool_stats():
+    pool = engine.pool
+    stats = []
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats.append(((name,), method()))
+    return stats
+
+def _threadpool_stats():
+    # Must be read on the event loop thread (the /metrics handler is async)
+    statistics = anyio.to_thread.current_default_thread_limiter().statistics()
+    return [
+        (("total_tokens",), statistics.total_tokens),
+        (("borrowed_tokens",), statistics.borrowed_tokens),
+        (("tasks_waiting",), statistics.tasks_waiting),
+    ]
+
+def _load_shed_stats():
+    stats = limiter.stats()
+    return [
+        (("limit", ""), stats["limit"]),
+        (("in_flight", ""), stats["in_flight"]),
+    ] + [(("shed", priority), count) for priority, count in stats["shed"].items()]
+
+def _access_log_stats():
+    return [((), dropped_records())]
+
+REGISTRY.register(Gauge("db_pool_connections", "SQLAlchemy connection pool state", _pool_stats, ("state",)))
+REGISTRY.register(Gauge("threadpool_workers", "Request threadpool usage; tasks_waiting is the queue depth", _threadpool_stats, ("state",)))
+REGISTRY.register(Gauge("load_shed", "Adaptive concurrency limit, in-flight requests and shed totals", _load_shed_stats, ("stat", "priority")))
+REGISTRY.register(Gauge("access_log_dropped_records", "Access log records dropped on a full queue since startup", _access_log_stats))
+
+@app.get("/metrics", tags=["📋 System Info"], response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,69 @@
+"""Operational commands.
+
+Usage (from the app directory):
+    python manage.py init-db                       # create missing tables (deploy step)
+    python manage.py check-startup                 # import-time regression check
+    python manage.py check-startup --budget-ms 300 --top 15
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+def init_db_command(args):
+    from database import init_db, DATABASE_URL
+    init_db()
+    print(f"Tables are up to date ({DATABASE_URL})")
+
+def check_startup_command(args):
+    """Import the API in a fresh interpreter under -X importtime and enforce a budget"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr)
+        sys.exit(result.returncode)
+
+    # Lines look like: "import time:  self [us] | cumulative | imported package"
+    timings = []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)", line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            timings.append((name, int(self_us), int(cumulative_us), len(indent)))
+
+    total_ms = next(cumulative for name, _, cumulative, _ in reversed(timings) if name == "main") / 1000
+
+    print("Slowest top-level imports of main (cumulative):")
+    direct = [t for t in timings if t[3] <= 3 and t[0] != "main"]
+    for name, _, cumulative_us, _ in sorted(direct, key=lambda t: -t[2])[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+    print(f"\nimport main: {total_ms:.1f} ms (budget {args.budget_ms} ms)")
+
+    if total_ms > args.budget_ms:
+        print("❌ Startup import time is over budget")
+        sys.exit(1)
+    print("✅ Startup import time is within budget")
+
+def main():
+    parser = argparse.ArgumentParser(description="Movie Ticketing API management commands")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    subcommands.add_parser("init-db", help="Create missing database tables")
+
+    check_startup = subcommands.add_parser("check-startup", help="Fail if importing the API is over budget")
+    check_startup.add_argument("--budget-ms", type=float, default=600, help="Import time budget (default: 600)")
+    check_startup.add_argument("--top", type=int, default=10, help="Number of slow imports to list (default: 10)")
+
+    args = parser.parse_args()
+    if args.command == "init-db":
+        init_db_command(args)
+    elif args.command == "check-startup":
+        check_startup_command(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float
+from sqlalchemy.orm import relationship
+from database import Base
+from datetime import datetime, timezone
+
+class ArchivedEvent(Base):
+    __tablename__ = "archived_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer, nullable=False, index=True)  # id in the live events table
+    movie_id = Column(Integer, nullable=False)
+    movie_title = Column(String(255), nullable=False)  # snapshot, the movie may be deleted later
+    start_time = Column(DateTime, nullable=False, index=True)
+    total_seats = Column(Integer, default=0)
+    booked_seats = Column(Integer, default=0)
+    created_at = Column(DateTime)
+    archived_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    # Relationship
+    seats = relationship("ArchivedSeat", back_populates="event")
+
+class ArchivedSeat(Base):
+    __tablename__ = "archived_seats"
+
+    id = Column(Integer, primary_key=True, index=True)
+    archived_event_id = Column(Integer, ForeignKey("archived_events.id"), nullable=False, index=True)
+    seat_id = Column(Integer, nullable=False)  # id in the live seats table
+    price = Column(Float, nullable=False)
+    description = Column(String(255), nullable=False)
+    status = Column(String(20))
+    locked_at = Column(DateTime, nullable=True)
+    booking_reference = Column(String(50), nullable=True, index=True)
+    created_at = Column(DateTime)
+
+    # Relationship
+    event = relationship("ArchivedEvent", back_populates="seats")
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from database import Base
+
+class DataVersion(Base):
+    """Change counter behind the ETags of list and seat map endpoints (see core/versions.py)"""
+    __tablename__ = "data_versions"
+
+    name = Column(String(100), primary_key=True)  # "catalog", "seats" or "seats:<event_id>"
+    version = Column(Integer, nullable=False)
+    # Seat maps only: when the next seat lock expires, i.e. when the map changes
+    # without a write. NULL = unknown, the next full read works it out.
+    next_expiry_at = Column(DateTime, nullable=True)
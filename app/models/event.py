@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime, timezone
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # Showtime range filters and keyset pagination on (start_time, id)
+        Index("ix_events_start_time_id", "start_time", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     movie_id = Column(Integer, ForeignKey("movies.id"), nullable=False)
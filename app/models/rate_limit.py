@@ -0,0 +1,9 @@
+from sqlalchemy import Column, String, Float
+from database import Base
+
+class RateLimitBucket(Base):
+    """Shared rate limit state (DatabaseBackend): one row per client and route class"""
+    __tablename__ = "rate_limits"
+
+    key = Column(String(255), primary_key=True)
+    tat = Column(Float, nullable=False)  # theoretical arrival time, unix seconds
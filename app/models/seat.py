@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime, timezone
 
 class Seat(Base):
     __tablename__ = "seats"
+    __table_args__ = (
+        # Expired-lock lookups (readiness probe, lock expiry)
+        Index("ix_seats_status_locked_at", "status", "locked_at"),
+        # Seat maps and per-event seat counts
+        Index("ix_seats_event_id_status", "event_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)  #seat_id
     event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
@@ -1,36 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import and_, case, func, insert, or_
 from sqlalchemy.orm import Session
 from database import get_db
 from models.movie import Movie
 from models.event import Event
 from models.seat import Seat
-from models.user import User
+from models.archive import ArchivedEvent
 from schemas.admin import (
     CreateMovieRequest, UpdateMovieRequest, MovieResponse,
     CreateEventRequest, UpdateEventRequest, EventAdminResponse,
-    DeleteResponse
+    EventsOverviewResponse, DeleteResponse, ArchivedEventResponse
 )
-from core.auth import get_current_admin_user
+from core.auth import AuthenticatedUser, get_current_admin_user, token_cache, user_cache
+from core.pagination import (
+    decode_cursor, event_key, event_page, event_window_key, event_window_start,
+    not_modified_page, page_limit, set_next_page
+)
+from core.profiler import ProfiledRoute, profiler
+from core.search import movie_match, search_terms
+from core.tracing import memory_exporter
+from core.versions import CATALOG, SEATS, bump, conditional_get
 from datetime import datetime, timezone
+from typing import Optional
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 # ============ MOVIE MANAGEMENT ============
 
 @router.get("/movies", response_model=list[MovieResponse])
 def get_all_movies(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    q: Optional[str] = Query(None, max_length=200, description="Only movies whose title or description has these words"),
+    limit: int = Depends(page_limit),
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin_user)
+    current_admin: AuthenticatedUser = Depends(get_current_admin_user)
 ):
-    """Get all movies (Admin only)"""
-    movies = db.query(Movie).all()
-    return movies
+    """Get movies by id, one page at a time, optionally matching a search (Admin only)"""
+    def movie_page(*columns):
+        query = db.query(*columns)
+        if q and search_terms(q):
+            query = query.filter(movie_match(q))
+        if cursor:
+            (after_id,) = decode_cursor(cursor, int)
+            query = query.filter(Movie.id > after_id)
+        return query.order_by(Movie.id)
+    
+    not_modified = conditional_get(request, response, db, CATALOG)
+    if not_modified:
+        return not_modified_page(request, not_modified, movie_page(Movie.id), limit, lambda row: (row.id,))
+    
+    movies = movie_page(Movie).limit(limit + 1).all()
+    return set_next_page(request, response, movies, limit, lambda movie: (movie.id,))
 
 @router.post("/movies", response_model=MovieResponse)
 def create_movie(
     movie_request: CreateMovieRequest, 
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin_user)
+    current_admin: AuthenticatedUser = Depends(get_current_admin_user)
 ):
     """Create a new movie (Admin only)"""
     movie = Movie(
@@ -39,6 +68,7 @@ def create_movie(
     )
     
     db.add(movie)
+    bump(db, CATALOG)
     db.commit()
     db.refresh(movie)
     
@@ -49,7 +79,7 @@ def update_movie(
     movie_id: int, 
     movie_request: UpdateMovieRequest, 
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin_user)
+    current_admin: AuthenticatedUser = Depends(get_current_admin_user)
 ):
     """Update an existing movie (Admin only)"""
     movie = db.query(Movie).filter(Movie.id == movie_id).first()
@@ -63,6 +93,7 @@ def update_movie(
     if movie_request.description is not None:
         movie.description = movie_request.description
     
+    bump(db, CATALOG)
     db.commit()
     db.refresh(movie)
     
@@ -72,7 +103,7 @@ def update_movie(
 def delete_movie(
     movie_id: int, 
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin_user)
+    current_admin: AuthenticatedUser = Depends(get_current_admin_user)
 ):
     """Delete a movie and all its events (Admin only)"""
     movie = db.query(Movie).filter(Movie.id == movie_id).first()
@@ -93,6 +124,7 @@ def delete_movie(
     
     # Delete the movie
     db.delete(movie)
+    bump(db, CATALOG)
     db.commit()
     
     return DeleteResponse(
@@ -102,43 +134,112 @@ def delete_movie(
 
 # ============ EVENT/SHOWTIME MANAGEMENT ============
 
-@router.get("/events", response_model=list[EventAdminResponse])
-def get_all_events_admin(
-    db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin_user)
-):
-    """Get all events with detailed information (Admin only)"""
-    events = db.query(Event).join(Movie).all()
+def event_summaries(db: Session, rows: list) -> list[EventAdminResponse]:
+    """Seat statistics for a page of events, counted by one GROUP BY over just those events"""
+    seat_counts = {
+        row.event_id: row for row in db.query(
+            Seat.event_id,
+            func.count(Seat.id).label("total_seats"),
+            func.sum(case((Seat.status == "booked", 1), else_=0)).label("booked_seats"),
+            func.sum(case((Seat.status == "locked", 1), else_=0)).label("locked_seats")
+        ).filter(Seat.event_id.in_([row.id for row in rows])).group_by(Seat.event_id).all()
+    } if rows else {}
     
     event_responses = []
-    for event in events:
-        # Get seat statistics
-        seats = db.query(Seat).filter(Seat.event_id == event.id).all()
-        
-        total_seats = len(seats)
-        booked_seats = len([s for s in seats if s.status == "booked"])
-        locked_seats = len([s for s in seats if s.status == "locked"])
-        available_seats = total_seats - booked_seats - locked_seats
-        
-        event_response = EventAdminResponse(
-            id=event.id,
-            movie_id=event.movie_id,
-            movie_title=event.movie.title,
-            start_time=event.start_time,
+    for row in rows:
+        counts = seat_counts.get(row.id)
+        total_seats = counts.total_seats if counts else 0
+        booked_seats = counts.booked_seats if counts else 0
+        locked_seats = counts.locked_seats if counts else 0
+        event_responses.append(EventAdminResponse(
+            id=row.id,
+            movie_id=row.movie_id,
+            movie_title=row.title,
+            start_time=row.start_time,
             total_seats=total_seats,
             booked_seats=booked_seats,
             locked_seats=locked_seats,
-            available_seats=available_seats
-        )
-        event_responses.append(event_response)
+            available_seats=total_seats - booked_seats - locked_seats
+        ))
     
     return event_responses
 
+def event_summary_page(request: Request, response: Response, db: Session,
+                       cursor: Optional[str], window_start: Optional[datetime], limit: int) -> list[EventAdminResponse]:
+    """One page of events in showtime order, with seat statistics"""
+    query = db.query(Event.id, Event.movie_id, Movie.title, Event.start_time).join(Movie, Movie.id == Event.movie_id)
+    rows = event_page(query, window_start, cursor).limit(limit + 1).all()
+    return event_summaries(db, set_next_page(request, response, rows, limit, event_key))
+
+def event_totals(db: Session, window_start: Optional[datetime]) -> dict:
+    """Event and seat counts over the whole window, for the overview's totals"""
+    events = db.query(func.count(Event.id))
+    seats = db.query(
+        func.count(Seat.id),
+        func.sum(case((Seat.status == "booked", 1), else_=0)),
+        func.sum(case((Seat.status == "locked", 1), else_=0))
+    ).join(Event, Event.id == Seat.event_id)
+    if window_start is not None:
+        events = events.filter(Event.start_time >= window_start)
+        seats = seats.filter(Event.start_time >= window_start)
+    total_seats, booked_seats, locked_seats = seats.one()
+    return {
+        "total_events": events.scalar(),
+        "total_seats": total_seats,
+        "booked_seats": booked_seats or 0,
+        "locked_seats": locked_seats or 0
+    }
+
+def event_summary_not_modified(request: Request, not_modified: Response, db: Session,
+                               cursor: Optional[str], window_start: Optional[datetime], limit: int) -> Response:
+    """The 304 for an event summary page, with its next-page headers"""
+    keys = event_page(db.query(Event.id, Event.start_time), window_start, cursor)
+    return not_modified_page(request, not_modified, keys, limit, event_key)
+
+@router.get("/events", response_model=list[EventAdminResponse])
+def get_all_events_admin(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_past: bool = Query(False, description="Also list showtimes that have started"),
+    limit: int = Depends(page_limit),
+    db: Session = Depends(get_db),
+    current_admin: AuthenticatedUser = Depends(get_current_admin_user)
+):
+    """Get events with detailed information, one page at a time (Admin only)"""
+    window_start = event_window_start(include_past)
+    not_modified = conditional_get(request, response, db, CATALOG, SEATS, extra=event_window_key(db, window_start))
+    if not_modified:
+        return event_summary_not_modified(request, not_modified, db, cursor, window_start, limit)
+    
+    return event_summary_page(request, response, db, cursor, window_start, limit)
+
+@router.get("/events/overview", response_model=EventsOverviewResponse)
+def get_events_overview(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_past: bool = Query(False, description="Also list showtimes that have started"),
+    limit: int = Depends(page_limit),
+    db: Session = Depends(get_db),
+    current_admin: AuthenticatedUser = Depends(get_current_admin_user)
+):
+    """A page of events with seat statistics plus window totals, for the admin dashboard in one call (Admin only)"""
+    window_start = event_window_start(include_past)
+    not_modified = conditional_get(request, response, db, CATALOG, SEATS, extra=event_window_key(db, window_start))
+    if not_modified:
+        return event_summary_not_modified(request, not_modified, db, cursor, window_start, limit)
+    
+    return EventsOverviewResponse(
+        events=event_summary_page(request, response, db, cursor, window_start, limit),
+        **event_totals(db, window_start)
+    )
+
 @router.post("/events", response_model=EventAdminResponse)
 def create_event(
     event_request: CreateEventRequest, 
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin_user)
+    current_admin: AuthenticatedUser = Depends(get_current_admin_user)
 ):
     """Create a new event/showtime and generate seats (Admin only)"""
     
@@ -177,7 +278,7 @@ def update_event(
     event_id: int, 
     event_request: UpdateEventRequest, 
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin_user)
+    current_admin: AuthenticatedUser = Depends(get_current_admin_user)
 ):
     """Update an existing event (Admin only)"""
     event = db.query(Event).filter(Event.id == event_id).first()
@@ -196,6 +297,7 @@ def update_event(
     if event_request.start_time is not None:
         event.start_time = event_request.start_time
     
+    bump(db, CATALOG)
     db.commit()
     db.refresh(event)
     
@@ -221,7 +323,7 @@ def update_event(
 def delete_event(
     event_id: int, 
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin_user)
+    current_admin: AuthenticatedUser = Depends(get_current_admin_user)
 ):
     """Delete an event and all its seats (Admin only)"""
     event = db.query(Event).filter(Event.id == event_id).first()
@@ -245,6 +347,7 @@ def delete_event(
     # Delete the event
     movie_title = event.movie.title
     db.delete(event)
+    bump(db, CATALOG)
     db.commit()
     
     return DeleteResponse(
@@ -252,46 +355,126 @@ def delete_event(
         deleted_id=event_id
     )
 
+# ============ ARCHIVE REPORTING ============
+
+@router.get("/archive/events", response_model=list[ArchivedEventResponse])
+def get_archived_events(
+    request: Request,
+    response: Response,
+    start_from: Optional[datetime] = None,
+    start_to: Optional[datetime] = None,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    limit: int = Depends(page_limit),
+    db: Session = Depends(get_db),
+    current_admin: AuthenticatedUser = Depends(get_current_admin_user)
+):
+    """Get archived (past) events, newest first, with their final seat statistics (Admin only)"""
+    query = db.query(ArchivedEvent)
+    
+    if start_from is not None:
+        query = query.filter(ArchivedEvent.start_time >= start_from)
+    if start_to is not None:
+        query = query.filter(ArchivedEvent.start_time < start_to)
+    if cursor:
+        start_time, archived_id = decode_cursor(cursor, datetime, int)
+        # Newest first: continue strictly before the last (start_time, id) sent
+        query = query.filter(
+            ArchivedEvent.start_time <= start_time,
+            or_(ArchivedEvent.start_time < start_time,
+                and_(ArchivedEvent.start_time == start_time, ArchivedEvent.id < archived_id))
+        )
+    
+    archived = query.order_by(ArchivedEvent.start_time.desc(), ArchivedEvent.id.desc()).limit(limit + 1).all()
+    return set_next_page(request, response, archived, limit, lambda row: (row.start_time, row.id))
+
+# ============ SYSTEM TUNING ============
+
+@router.get("/cache-stats")
+def get_cache_stats(current_admin: AuthenticatedUser = Depends(get_current_admin_user)):
+    """Size and hit rate of this worker's auth caches (Admin only)"""
+    return {
+        "token_cache": token_cache.stats(),
+        "user_cache": user_cache.stats()
+    }
+
+@router.get("/profiles")
+def list_profiles(current_admin: AuthenticatedUser = Depends(get_current_admin_user)):
+    """Recently profiled requests on this worker, newest first (Admin only)"""
+    return [profile.summary() for profile in reversed(profiler.profiles)]
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+def get_profile(
+    profile_id: int,
+    current_admin: AuthenticatedUser = Depends(get_current_admin_user)
+):
+    """Folded stacks of one profiled request, for flamegraph.pl or speedscope (Admin only)"""
+    profile = profiler.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found (it may have rotated out)")
+    return PlainTextResponse(profile.folded())
+
+@router.get("/traces")
+def list_traces(current_admin: AuthenticatedUser = Depends(get_current_admin_user)):
+    """Recently finished traces on this worker, newest first (Admin only)"""
+    return memory_exporter.summaries()
+
+@router.get("/traces/{trace_id}")
+def get_trace(
+    trace_id: str,
+    current_admin: AuthenticatedUser = Depends(get_current_admin_user)
+):
+    """All spans of one trace, in start order (Admin only)"""
+    spans = memory_exporter.get_trace(trace_id)
+    if not spans:
+        raise HTTPException(status_code=404, detail="Trace not found (it may have rotated out)")
+    return spans
+
 # ============ HELPER FUNCTIONS ============
 
-def create_seats_for_event(event_id: int, total_seats: int, db: Session):
-    """Helper function to create seats for an event"""
+def _row_label(row_idx: int) -> str:
+    """A, B, ..., Z, AA, AB, ... for large auditoriums"""
+    label = ""
+    row_idx += 1
+    while row_idx:
+        row_idx, remainder = divmod(row_idx - 1, 26)
+        label = chr(65 + remainder) + label  # A=65 in ASCII
+    return label
+
+def seat_layout(total_seats: int) -> list:
+    """(description, price) for each seat of a roughly square auditorium"""
     
     # Calculate grid size (try to make it roughly square)
     import math
     rows = int(math.sqrt(total_seats))
     cols = math.ceil(total_seats / rows)
     
-    # Generate seat letters (A, B, C, ...)
-    seat_letters = [chr(65 + i) for i in range(rows)]  # A=65 in ASCII
-    
-    seats_created = 0
-    
-    for row_idx, row_letter in enumerate(seat_letters):
-        for seat_num in range(1, cols + 1):
-            if seats_created >= total_seats:
-                break
-            
-            # Price based on row (front rows more expensive)
-            if row_idx < rows // 3:  # First third - premium
-                price = 18.0
-            elif row_idx < 2 * rows // 3:  # Middle third - standard
-                price = 15.0
-            else:  # Back third - economy
-                price = 12.0
-            
-            seat = Seat(
-                event_id=event_id,
-                price=price,
-                description=f"Row {row_letter} Seat {seat_num}",
-                status="open"
-            )
-            
-            db.add(seat)
-            seats_created += 1
+    layout = []
+    for row_idx in range(rows):
+        # Price based on row (front rows more expensive)
+        if row_idx < rows // 3:  # First third - premium
+            price = 18.0
+        elif row_idx < 2 * rows // 3:  # Middle third - standard
+            price = 15.0
+        else:  # Back third - economy
+            price = 12.0
         
-        if seats_created >= total_seats:
-            break
+        for seat_num in range(1, cols + 1):
+            if len(layout) >= total_seats:
+                return layout
+            layout.append((f"Row {_row_label(row_idx)} Seat {seat_num}", price))
     
+    return layout
+
+def create_seats_for_event(event_id: int, total_seats: int, db: Session):
+    """Helper function to create seats for an event"""
+    rows = [
+        {"event_id": event_id, "price": price, "description": description, "status": "open"}
+        for description, price in seat_layout(total_seats)
+    ]
+    
+    # Bulk INSERT instead of an ORM object per seat
+    db.execute(insert(Seat), rows)
+    # The new event becomes visible to conditional GETs together with its seats
+    bump(db, CATALOG)
     db.commit()
-    return seats_created
+    return len(rows)
@@ -1,28 +1,70 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from database import get_db
 from models.user import User, UserRole
-from schemas.auth import UserLogin, UserRegister, Token, UserResponse, CreateAdminRequest
+from schemas.auth import UserLogin, UserRegister, Token, UserResponse, CreateAdminRequest, RefreshRequest
 from core.auth import (
-    verify_password, 
-    get_password_hash, 
+    verify_password_async, 
+    get_password_hash_async, 
     create_access_token,
+    create_refresh_token,
+    rotate_refresh_token,
+    revoke_refresh_token,
+    purge_expired_sessions,
     get_current_user,
 )
+from core.profiler import ProfiledRoute
 from config import get_config
 
 # Get config once at module level
 config = get_config()
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
+
+# Password hashing runs in its own pool, so these routes are async and push
+# their (short) database work to the request threadpool explicitly.
+
+def _get_user_by_email(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+def _get_first_admin(db: Session):
+    return db.query(User).filter(User.role == UserRole.ADMIN).first()
+
+def _save_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+def _issue_tokens(user: User, refresh_token: str) -> dict:
+    """Build the token response for an authenticated user"""
+    access_token_expires = timedelta(minutes=config.access_token_expire_minutes)
+    access_token = create_access_token(
+        data={"sub": user.email, "role": user.role.value, "uid": user.id},
+        expires_delta=access_token_expires
+    )
+    
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+        "user": user
+    }
+
+def _start_session(db: Session, user: User) -> dict:
+    purge_expired_sessions(user.id, db)
+    refresh_token = create_refresh_token(user.id, db)
+    db.refresh(user)
+    return _issue_tokens(user, refresh_token)
 
 @router.post("/register", response_model=UserResponse)
-def register_user(user_data: UserRegister, db: Session = Depends(get_db)):
+async def register_user(user_data: UserRegister, db: Session = Depends(get_db)):
     """Register a new user"""
     
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await run_in_threadpool(_get_user_by_email, db, user_data.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -30,7 +72,7 @@ def register_user(user_data: UserRegister, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     new_user = User(
         email=user_data.email,
         hashed_password=hashed_password,
@@ -39,21 +81,23 @@ def register_user(user_data: UserRegister, db: Session = Depends(get_db)):
         is_active=1  # Explicitly set active
     )
     
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    
-    return new_user
+    return await run_in_threadpool(_save_user, db, new_user)
 
 @router.post("/login", response_model=Token)
-def login_user(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login_user(user_credentials: UserLogin, db: Session = Depends(get_db)):
     """Login user and return JWT token"""
     
     # Find user
-    user = db.query(User).filter(User.email == user_credentials.email).first()
+    user = await run_in_threadpool(_get_user_by_email, db, user_credentials.email)
     
     # Verify user and password
-    if not user or not verify_password(user_credentials.password, user.hashed_password):
+    password_valid, new_hash = False, None
+    if user:
+        password_valid, new_hash = await verify_password_async(
+            user_credentials.password, user.hashed_password
+        )
+    
+    if not user or not password_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -67,18 +111,36 @@ def login_user(user_credentials: UserLogin, db: Session = Depends(get_db)):
             detail="Inactive user"
         )
     
-    # Create access token using config
-    access_token_expires = timedelta(minutes=config.access_token_expire_minutes)
-    access_token = create_access_token(
-        data={"sub": user.email, "role": user.role.value},
-        expires_delta=access_token_expires
-    )
+    # Stored hash uses an outdated scheme/cost - upgrade it transparently
+    if new_hash:
+        user.hashed_password = new_hash
+        user = await run_in_threadpool(_save_user, db, user)
     
-    return {
-        "access_token": access_token,
-        "token_type": "bearer",
-        "user": user
-    }
+    # Access token plus a refresh token for cheap renewal
+    return await run_in_threadpool(_start_session, db, user)
+
+@router.post("/refresh", response_model=Token)
+def refresh_access_token(refresh_request: RefreshRequest, db: Session = Depends(get_db)):
+    """Exchange a refresh token for a new access token (no password needed).
+    
+    The refresh token is rotated: the one sent is revoked and a new one returned.
+    """
+    result = rotate_refresh_token(refresh_request.refresh_token, db)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    user, new_refresh_token = result
+    return _issue_tokens(user, new_refresh_token)
+
+@router.post("/logout")
+def logout_user(refresh_request: RefreshRequest, db: Session = Depends(get_db)):
+    """Revoke the session behind a refresh token"""
+    revoke_refresh_token(refresh_request.refresh_token, db)
+    return {"message": "Logged out"}
 
 @router.get("/me", response_model=UserResponse)
 def get_current_user_info(current_user: User = Depends(get_current_user)):
@@ -86,11 +148,11 @@ def get_current_user_info(current_user: User = Depends(get_current_user)):
     return current_user
 
 @router.post("/create-admin")
-def create_admin_user(admin_request: CreateAdminRequest, db: Session = Depends(get_db)):
+async def create_admin_user(admin_request: CreateAdminRequest, db: Session = Depends(get_db)):
     """Create admin user with provided credentials"""
     
     # Check if admin already exists
-    admin_exists = db.query(User).filter(User.role == UserRole.ADMIN).first()
+    admin_exists = await run_in_threadpool(_get_first_admin, db)
     if admin_exists:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -100,15 +162,13 @@ def create_admin_user(admin_request: CreateAdminRequest, db: Session = Depends(g
     # Create admin user using request data
     admin_user = User(
         email=admin_request.email,
-        hashed_password=get_password_hash(admin_request.password),
+        hashed_password=await get_password_hash_async(admin_request.password),
         full_name=admin_request.full_name,
         role=UserRole.ADMIN,
         is_active=1  # Explicitly set active
     )
     
-    db.add(admin_user)
-    db.commit()
-    db.refresh(admin_user)
+    await run_in_threadpool(_save_user, db, admin_user)
     
     return {
         "message": "Admin user created successfully",
@@ -1,52 +1,139 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 from database import get_db
 from models.seat import Seat
 from models.event import Event
 from models.movie import Movie
-from models.user import User
 from schemas.seat import (
     SeatArrangementResponse, SeatResponse, BookSeatRequest, BookSeatResponse, 
     EventResponse, CancelBookingRequest, CancelBookingResponse, 
     PaymentRequest, PaymentResponse
 )
-from core.auth import get_current_active_user
+from core.metrics import seat_lock_events, booking_attempts
+from core.auth import AuthenticatedUser, get_current_active_user, get_reader_user
+from core.context import note_event
+from core.tracing import get_tracer
+from core.pagination import (
+    event_key, event_page, event_window_key, event_window_start, not_modified_page, page_limit, set_next_page
+)
+from core.search import movie_match, search_terms
+from core.versions import CATALOG, NO_EXPIRY, SEATS, SeatMapValidator, bump, conditional_get, seat_map
+from core.profiler import ProfiledRoute
 from datetime import datetime, timedelta, timezone
+from typing import Optional
 from config import get_config
 import uuid
 
 # Get config once at module level
 config = get_config()
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
+tracer = get_tracer(__name__)
+
+def _seat_maps(seats) -> list:
+    """Version counters of the seat maps these seats appear on"""
+    return [seat_map(event_id) for event_id in sorted({seat.event_id for seat in seats})]
 
 @router.get("/events", response_model=list[EventResponse])
 def get_available_events(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_past: bool = Query(False, description="Also list showtimes that have started"),
+    limit: int = Depends(page_limit),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthenticatedUser = Depends(get_reader_user)
 ):
-    """Get all events with movie details (Authentication required)"""
-    events = db.query(Event).join(Movie).all()
-    
-    event_responses = []
-    for event in events:
-        event_response = EventResponse(
-            event_id=event.id,
-            movie_title=event.movie.title,
-            movie_description=event.movie.description,
-            start_time=event.start_time
+    """Get upcoming events with movie details, one page at a time (Authentication required)"""
+    window_start = event_window_start(include_past)
+    not_modified = conditional_get(request, response, db, CATALOG, extra=event_window_key(db, window_start))
+    if not_modified:
+        keys = event_page(db.query(Event.id, Event.start_time), window_start, cursor)
+        return not_modified_page(request, not_modified, keys, limit, event_key)
+    
+    query = db.query(Event.id, Event.start_time, Movie.title, Movie.description).join(Movie)
+    rows = event_page(query, window_start, cursor).limit(limit + 1).all()
+    rows = set_next_page(request, response, rows, limit, event_key)
+    
+    return [
+        EventResponse(
+            event_id=row.id,
+            movie_title=row.title,
+            movie_description=row.description,
+            start_time=row.start_time
         )
-        event_responses.append(event_response)
+        for row in rows
+    ]
+
+@router.get("/events/search", response_model=list[EventResponse])
+def search_events(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in movie titles and descriptions"),
+    start_from: Optional[datetime] = Query(None, alias="from", description="Earliest showtime (inclusive)"),
+    start_to: Optional[datetime] = Query(None, alias="to", description="Latest showtime (exclusive)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_past: bool = Query(False, description="Also list showtimes that have started"),
+    limit: int = Depends(page_limit),
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_reader_user)
+):
+    """Search upcoming events by movie title/description and showtime range (Authentication required)"""
+    if not search_terms(q):
+        return []
+    
+    # Naive UTC, like the stored showtimes
+    if start_from is not None and start_from.tzinfo is not None:
+        start_from = start_from.astimezone(timezone.utc).replace(tzinfo=None)
+    if start_to is not None and start_to.tzinfo is not None:
+        start_to = start_to.astimezone(timezone.utc).replace(tzinfo=None)
+    
+    # Same upcoming window as /events; an explicit `from` can only narrow it
+    window_start = event_window_start(include_past)
+    if start_from is not None and (window_start is None or start_from > window_start):
+        window_start = start_from
+    
+    def matching(*columns):
+        query = db.query(*columns).join(Movie).filter(movie_match(q))
+        if start_to is not None:
+            query = query.filter(Event.start_time < start_to)
+        return query
     
-    return event_responses
+    not_modified = conditional_get(request, response, db, CATALOG, extra=event_window_key(db, window_start))
+    if not_modified:
+        keys = event_page(matching(Event.id, Event.start_time), window_start, cursor)
+        return not_modified_page(request, not_modified, keys, limit, event_key)
+    
+    query = matching(Event.id, Event.start_time, Movie.title, Movie.description)
+    with tracer.start_as_current_span("events.search", {"terms": len(search_terms(q))}):
+        rows = event_page(query, window_start, cursor).limit(limit + 1).all()
+    rows = set_next_page(request, response, rows, limit, event_key)
+    
+    return [
+        EventResponse(
+            event_id=row.id,
+            movie_title=row.title,
+            movie_description=row.description,
+            start_time=row.start_time
+        )
+        for row in rows
+    ]
 
 @router.get("/events/{event_id}/seats", response_model=SeatArrangementResponse)
 def get_seats_for_event(
     event_id: int, 
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthenticatedUser = Depends(get_reader_user)
 ):
     """Get seats for an event (Authentication required)"""
+    validator = SeatMapValidator(db, event_id)
+    not_modified = validator.not_modified(request)
+    if not_modified:
+        return not_modified
+    
     # Check if event exists
     event = db.query(Event).filter(Event.id == event_id).first()
     if not event:
@@ -61,6 +148,8 @@ def get_seats_for_event(
     
     # Use config for seat lock duration
     lock_duration_seconds = config.seat_lock_duration_minutes * 60
+    lock_duration = timedelta(seconds=lock_duration_seconds)
+    next_expiry_at = NO_EXPIRY
     
     for seat in seats:
         # Determine current status - handle expired locks
@@ -71,6 +160,8 @@ def get_seats_for_event(
             time_diff = current_time - seat.locked_at.replace(tzinfo=timezone.utc)
             if time_diff.total_seconds() > lock_duration_seconds:
                 current_status = "open"
+            else:
+                next_expiry_at = min(next_expiry_at, seat.locked_at + lock_duration)
         
         seat_response = SeatResponse(
             seat_id=seat.id,
@@ -80,6 +171,8 @@ def get_seats_for_event(
         )
         seat_responses.append(seat_response)
     
+    validator.finish(response, next_expiry_at)
+    
     return SeatArrangementResponse(
         event_id=event_id,
         seats=seat_responses
@@ -89,20 +182,28 @@ def get_seats_for_event(
 def book_seats(
     booking_request: BookSeatRequest, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """Book seats for an event (Authentication required)"""
     current_time = datetime.now(timezone.utc)
     
     # Check if all seats exist and are available
-    seats = db.query(Seat).filter(Seat.id.in_(booking_request.seat_ids)).all()
+    with tracer.start_as_current_span("book_seats.seat_query", {"seats": len(booking_request.seat_ids)}):
+        seats = db.query(Seat).filter(Seat.id.in_(booking_request.seat_ids)).all()
+    
+    # The body only names seats; log the event they belong to
+    event_ids = {seat.event_id for seat in seats}
+    if len(event_ids) == 1:
+        note_event(event_ids.pop())
     
     if len(seats) != len(booking_request.seat_ids):
+        booking_attempts.inc("not_found")
         raise HTTPException(status_code=404, detail="One or more seats not found")
     
     # Check seat availability using config for lock duration
     lock_duration_seconds = config.seat_lock_duration_minutes * 60
     unavailable_seats = []
+    expired_locks = 0
     total_amount = 0
     
     for seat in seats:
@@ -113,6 +214,7 @@ def book_seats(
             time_diff = current_time - seat.locked_at.replace(tzinfo=timezone.utc)
             if time_diff.total_seconds() > lock_duration_seconds:
                 current_status = "open"
+                expired_locks += 1
         
         if current_status != "open":
             unavailable_seats.append(seat.id)
@@ -120,6 +222,7 @@ def book_seats(
             total_amount += seat.price
     
     if unavailable_seats:
+        booking_attempts.inc("conflict")
         raise HTTPException(
             status_code=400, 
             detail=f"Seats {unavailable_seats} are not available"
@@ -128,13 +231,41 @@ def book_seats(
     # Lock the seats using config duration
     booking_reference = str(uuid.uuid4())[:8].upper()
     expires_at = current_time + timedelta(minutes=config.seat_lock_duration_minutes)
+    lock_cutoff = current_time - timedelta(seconds=lock_duration_seconds)
     
-    for seat in seats:
-        seat.status = "locked"
-        seat.locked_at = current_time
-        seat.booking_reference = booking_reference
+    # Compare-and-set: only seats that are still open (or whose lock expired)
+    # are taken, so a concurrent booking of the same seat cannot slip in
+    # between the check above and this write
+    with tracer.start_as_current_span("book_seats.lock_seats") as span:
+        locked_count = db.query(Seat).filter(
+            Seat.id.in_(booking_request.seat_ids),
+            or_(
+                Seat.status == "open",
+                and_(Seat.status == "locked", Seat.locked_at < lock_cutoff)
+            )
+        ).update({
+            Seat.status: "locked",
+            Seat.locked_at: current_time,
+            Seat.booking_reference: booking_reference
+        }, synchronize_session=False)
+        span.set_attribute("locked", locked_count)
     
-    db.commit()
+    if locked_count != len(booking_request.seat_ids):
+        db.rollback()
+        booking_attempts.inc("conflict")
+        raise HTTPException(
+            status_code=400, 
+            detail="One or more seats were just taken by another booking"
+        )
+    
+    with tracer.start_as_current_span("book_seats.commit"):
+        bump(db, SEATS, *_seat_maps(seats), lock_expires_at=expires_at.replace(tzinfo=None))
+        db.commit()
+    
+    booking_attempts.inc("success")
+    seat_lock_events.inc("taken", amount=len(seats))
+    if expired_locks:
+        seat_lock_events.inc("expired", amount=expired_locks)
     
     return BookSeatResponse(
         booking_reference=booking_reference,
@@ -142,14 +273,14 @@ def book_seats(
         total_amount=total_amount,
         status="locked",
         expires_at=expires_at,
-        message=f"Seats locked for {config.seat_lock_duration_minutes} minutes. Complete payment before {expires_at.strftime('%H:%M:%S')}"
+        message=f"Seats locked for {config.seat_lock_duration_minutes:g} minutes. Complete payment before {expires_at.strftime('%H:%M:%S')}"
     )
 
 @router.post("/confirm-payment", response_model=PaymentResponse)
 def confirm_payment(
     payment_request: PaymentRequest, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """Confirm payment for booking (Authentication required)"""
     current_time = datetime.now(timezone.utc)
@@ -160,34 +291,46 @@ def confirm_payment(
     if not seats:
         raise HTTPException(status_code=404, detail="Booking not found")
     
-    # Check if booking has expired using config
-    lock_duration_seconds = config.seat_lock_duration_minutes * 60
-    booking_expired = False
+    seat_ids = [seat.id for seat in seats]
     
-    for seat in seats:
-        if seat.locked_at:
-            time_diff = current_time - seat.locked_at.replace(tzinfo=timezone.utc)
-            if time_diff.total_seconds() > lock_duration_seconds:
-                booking_expired = True
-                break
-    
-    if booking_expired:
-        # Auto-cancel expired booking
-        for seat in seats:
-            seat.status = "open"
-            seat.locked_at = None
-            seat.booking_reference = None
-        db.commit()
-        raise HTTPException(status_code=400, detail="Booking has expired. Please book again.")
+    # Already paid (e.g. a retried request)
+    if all(seat.status == "booked" for seat in seats):
+        return PaymentResponse(
+            booking_reference=payment_request.booking_reference,
+            seat_ids=seat_ids,
+            message=f"Payment confirmed! Seats {seat_ids} are now booked."
+        )
     
-    seat_ids = [seat.id for seat in seats]
+    # Payment successful - confirm booking, but only while every lock is still live
+    lock_cutoff = current_time - timedelta(minutes=config.seat_lock_duration_minutes)
+    confirmed_count = db.query(Seat).filter(
+        Seat.booking_reference == payment_request.booking_reference,
+        Seat.status == "locked",
+        Seat.locked_at >= lock_cutoff
+    ).update({Seat.status: "booked"}, synchronize_session=False)
+    # Keep booking_reference for record keeping
     
-    # Payment successful - confirm booking
-    for seat in seats:
-        seat.status = "booked"
-        # Keep booking_reference for record keeping
+    if confirmed_count != len(seats):
+        db.rollback()
+        # Auto-cancel expired booking (seats re-booked by someone else no longer carry this reference)
+        released_count = db.query(Seat).filter(
+            Seat.booking_reference == payment_request.booking_reference,
+            Seat.status == "locked"
+        ).update({
+            Seat.status: "open",
+            Seat.locked_at: None,
+            Seat.booking_reference: None
+        }, synchronize_session=False)
+        if released_count:
+            bump(db, SEATS, *_seat_maps(seats))
+        db.commit()
+        if released_count:
+            seat_lock_events.inc("expired", amount=released_count)
+        raise HTTPException(status_code=400, detail="Booking has expired. Please book again.")
     
+    bump(db, SEATS, *_seat_maps(seats))
     db.commit()
+    seat_lock_events.inc("confirmed", amount=len(seats))
     
     return PaymentResponse(
         booking_reference=payment_request.booking_reference,
@@ -199,7 +342,7 @@ def confirm_payment(
 def cancel_booking(
     cancel_request: CancelBookingRequest, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """Cancel a booking (Authentication required)"""
     # Find seats with this booking reference
@@ -208,15 +351,25 @@ def cancel_booking(
     if not seats:
         raise HTTPException(status_code=404, detail="Booking not found")
     
-    # Cancel the booking - reset seats to open
-    cancelled_seat_ids = []
-    for seat in seats:
-        seat.status = "open"
-        seat.locked_at = None
-        seat.booking_reference = None
-        cancelled_seat_ids.append(seat.id)
+    # Cancel the booking - reset seats to open. Matching on the reference makes
+    # this safe against seats that were meanwhile re-booked after expiring.
+    cancelled_seat_ids = [seat.id for seat in seats]
+    cancelled_count = db.query(Seat).filter(
+        Seat.id.in_(cancelled_seat_ids),
+        Seat.booking_reference == cancel_request.booking_reference
+    ).update({
+        Seat.status: "open",
+        Seat.locked_at: None,
+        Seat.booking_reference: None
+    }, synchronize_session=False)
+    
+    if cancelled_count == 0:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Booking not found")
     
+    bump(db, SEATS, *_seat_maps(seats))
     db.commit()
+    seat_lock_events.inc("cancelled", amount=cancelled_count)
     
     return CancelBookingResponse(
         booking_reference=cancel_request.booking_reference,
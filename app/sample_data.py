@@ -1,53 +1,187 @@
-from database import SessionLocal, engine, Base
-from models.movie import Movie
-from models.event import Event
-from models.seat import Seat
-from datetime import datetime, timedelta, timezone
-
-# Create all tables first
-Base.metadata.create_all(bind=engine)
-
-db = SessionLocal()
-
-# Add a sample movie
-movie = Movie(
-    title="Avengers: Endgame",
-    description="The epic conclusion to the Infinity Saga"
-)
-db.add(movie)
-db.commit()
-db.refresh(movie)
-
-# Add a sample event (showtime)
-event = Event(
-    movie_id=movie.id,
-    start_time=datetime.now(timezone.utc) + timedelta(hours=2)
-)
-db.add(event)
-db.commit()
-db.refresh(event)
-
-# Add sample seats (simple 5x5 grid)
-for row in ['A', 'B', 'C', 'D', 'E']:
-    for seat_num in range(1, 6):
-        price = 15.0 if row in ['A', 'B'] else 12.0  # Front rows cost more
-        seat = Seat(
-            event_id=event.id,
-            price=price,
-            description=f"Row {row} Seat {seat_num}",
-            status="open"
-        )
-        db.add(seat)
-
-db.commit()
-
-# Get IDs before closing session
-movie_id = movie.id
-event_id = event.id
-
-db.close()
-
-print(f"Sample data added!")
-print(f"Movie ID: {movie_id}")
-print(f"Event ID: {event_id}")
-print("Added 25 seats (5x5 grid)")
+"""Synthetic data generator for demos and performance work.
+
+Generates N movies with M showtimes each, auditoriums of realistic sizes
+and a configurable share of booked and locked seats. Rows are written with
+bulk INSERTs in large transactions, and a fixed --seed reproduces the same
+dataset, so millions of seats load in seconds.
+
+Usage (from the app directory):
+    python sample_data.py                                   # small demo dataset
+    python sample_data.py --movies 500 --showtimes 20       # ~2M seats
+    python sample_data.py --booked 0.6 --locked 0.1 --seed 7
+    python sample_data.py --reset                           # wipe movies/events/seats first
+    python sample_data.py --append                          # add to existing data
+"""
+import argparse
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+# (seats, weight): mostly mid-sized screens, a few large premium halls
+AUDITORIUM_SIZES = [(60, 0.2), (120, 0.35), (200, 0.25), (300, 0.12), (500, 0.06), (800, 0.02)]
+
+SHOWTIME_SLOTS = [(11, 0), (14, 0), (16, 30), (19, 0), (21, 30)]
+
+ADJECTIVES = [
+    "Silent", "Crimson", "Eternal", "Hidden", "Last", "Broken", "Golden", "Midnight",
+    "Frozen", "Wild", "Lost", "Electric", "Shattered", "Distant", "Burning", "Hollow"
+]
+NOUNS = [
+    "Horizon", "Empire", "Echo", "Kingdom", "Signal", "River", "Storm", "Legacy",
+    "Frontier", "Garden", "Protocol", "Harbor", "Machine", "Voyage", "Requiem", "Orbit"
+]
+GENRES = ["thriller", "comedy", "drama", "sci-fi epic", "animated adventure", "mystery", "documentary"]
+
+def movie_rows(count: int, first_id: int, rng: random.Random) -> list:
+    titles = [f"{adjective} {noun}" for adjective in ADJECTIVES for noun in NOUNS]
+    rng.shuffle(titles)
+    rows = []
+    for index in range(count):
+        title = titles[index % len(titles)]
+        sequel = index // len(titles)
+        if sequel:
+            title += f" {sequel + 1}"
+        rows.append({
+            "id": first_id + index,
+            "title": title,
+            "description": f"A {rng.choice(GENRES)} ({rng.randint(85, 180)} min)"
+        })
+    return rows
+
+def event_rows(movie_ids: list, showtimes: int, days: int, first_id: int, rng: random.Random) -> list:
+    tomorrow = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    sizes, weights = zip(*AUDITORIUM_SIZES)
+    rows = []
+    for movie_id in movie_ids:
+        for _ in range(showtimes):
+            hour, minute = rng.choice(SHOWTIME_SLOTS)
+            rows.append({
+                "id": first_id + len(rows),
+                "movie_id": movie_id,
+                "start_time": tomorrow + timedelta(days=rng.randrange(days), hours=hour, minutes=minute),
+                "created_at": datetime.utcnow(),
+                # Not a column; consumed when generating seats
+                "total_seats": rng.choices(sizes, weights)[0]
+            })
+    return rows
+
+def seat_rows(event: dict, layout: list, booked: float, locked: float, lock_minutes: float,
+              now: datetime, rng: random.Random):
+    """Seats for one event; booked and locked seats come in groups of 1-4 sharing a reference"""
+    status, reference, locked_at, group_left = "open", None, None, 0
+    for description, price in layout:
+        if group_left == 0:
+            group_left = rng.randint(1, 4)
+            roll = rng.random()
+            if roll < booked:
+                status = "booked"
+            elif roll < booked + locked:
+                status = "locked"
+            else:
+                status = "open"
+            reference = uuid.UUID(int=rng.getrandbits(128)).hex[:8].upper() if status != "open" else None
+            locked_at = now - timedelta(minutes=rng.uniform(0, lock_minutes)) if status != "open" else None
+        group_left -= 1
+        yield {
+            "event_id": event["id"],
+            "price": price,
+            "description": description,
+            "status": status,
+            "locked_at": locked_at,
+            "booking_reference": reference,
+            "created_at": now
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic movies, showtimes and seats")
+    parser.add_argument("--movies", type=int, default=5, help="Number of movies (default: 5)")
+    parser.add_argument("--showtimes", type=int, default=4, help="Showtimes per movie (default: 4)")
+    parser.add_argument("--days", type=int, default=14, help="Spread showtimes over this many days (default: 14)")
+    parser.add_argument("--booked", type=float, default=0.3, help="Share of seats booked (default: 0.3)")
+    parser.add_argument("--locked", type=float, default=0.05, help="Share of seats locked (default: 0.05)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducible data (default: 42)")
+    parser.add_argument("--batch-size", type=int, default=50000, help="Seat rows per INSERT batch (default: 50000)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--reset", action="store_true", help="Delete existing movies, events and seats first")
+    mode.add_argument("--append", action="store_true", help="Add to existing data")
+    args = parser.parse_args()
+
+    if args.booked + args.locked > 1:
+        parser.error("--booked + --locked must not exceed 1")
+
+    from sqlalchemy import delete, func, insert, select
+    from config import get_config
+    from database import engine, init_db
+    from models.movie import Movie
+    from models.event import Event
+    from models.seat import Seat
+    from routes.admin import seat_layout
+    from core.versions import CATALOG, SEATS, bump
+
+    config = get_config()
+    init_db()
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+
+    with engine.begin() as connection:
+        existing_movies = connection.execute(select(func.count()).select_from(Movie)).scalar()
+        if existing_movies and not (args.reset or args.append):
+            print(f"Database already has {existing_movies} movies. Use --reset to replace them or --append to add more.")
+            sys.exit(1)
+        if args.reset:
+            connection.execute(delete(Seat))
+            connection.execute(delete(Event))
+            connection.execute(delete(Movie))
+
+        first_movie_id = (connection.execute(select(func.max(Movie.id))).scalar() or 0) + 1
+        first_event_id = (connection.execute(select(func.max(Event.id))).scalar() or 0) + 1
+
+        movies = movie_rows(args.movies, first_movie_id, rng)
+        connection.execute(insert(Movie), movies)
+
+        events = event_rows([movie["id"] for movie in movies], args.showtimes, args.days, first_event_id, rng)
+        connection.execute(insert(Event), [
+            {key: value for key, value in event.items() if key != "total_seats"} for event in events
+        ])
+
+    # Seats in large batches, one transaction per batch
+    now = datetime.utcnow()
+    layouts = {}
+    batch = []
+    seat_count = 0
+    with engine.connect() as connection:
+        if engine.dialect.name == "sqlite":
+            # Bulk load: don't fsync every batch (a crash means re-running the generator)
+            connection.exec_driver_sql("PRAGMA synchronous = OFF")
+        for event in events:
+            layout = layouts.get(event["total_seats"])
+            if layout is None:
+                layout = layouts[event["total_seats"]] = seat_layout(event["total_seats"])
+            batch.extend(seat_rows(event, layout, args.booked, args.locked,
+                                   config.seat_lock_duration_minutes, now, rng))
+            if len(batch) >= args.batch_size:
+                connection.execute(insert(Seat), batch)
+                connection.commit()
+                seat_count += len(batch)
+                batch = []
+        if batch:
+            connection.execute(insert(Seat), batch)
+            connection.commit()
+            seat_count += len(batch)
+        if engine.dialect.name == "sqlite":
+            connection.exec_driver_sql("PRAGMA synchronous = FULL")
+
+    # Invalidate ETags clients hold for the old data (seat map ETags include the catalog version)
+    with engine.begin() as connection:
+        bump(connection, CATALOG, SEATS)
+
+    elapsed = time.perf_counter() - started
+    print(f"Sample data added in {elapsed:.1f}s (seed {args.seed})")
+    print(f"Movies: {len(movies)} (IDs {first_movie_id}-{first_movie_id + len(movies) - 1})")
+    print(f"Events: {len(events)}")
+    print(f"Seats:  {seat_count} ({seat_count / elapsed:,.0f}/s)")
+
+if __name__ == "__main__":
+    main()
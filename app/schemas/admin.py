@@ -42,6 +42,29 @@ class EventAdminResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class EventsOverviewResponse(BaseModel):
+    """A page of events plus totals for the admin event screens, in one payload"""
+    events: list[EventAdminResponse]
+    # Across every event in the window, not just this page
+    total_events: int
+    total_seats: int
+    booked_seats: int
+    locked_seats: int
+
 class DeleteResponse(BaseModel):
     message: str
     deleted_id: int
+
+# Archive schemas
+class ArchivedEventResponse(BaseModel):
+    id: int
+    event_id: int
+    movie_id: int
+    movie_title: str
+    start_time: datetime
+    total_seats: int
+    booked_seats: int
+    archived_at: datetime
+    
+    class Config:
+        from_attributes = True
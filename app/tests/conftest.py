@@ -0,0 +1,88 @@
+"""Shared fixtures: the app in-process (TestClient) on a scratch SQLite database.
+
+The environment is set before any app module is imported, since config,
+the engine and the middlewares are built at import time. Every test runs
+against the same database, so tests create their own movies, events and
+users and only assert on those.
+"""
+import os
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add app directory to path (same pattern as dashboard.py)
+app_dir = Path(__file__).resolve().parent.parent
+if str(app_dir) not in sys.path:
+    sys.path.insert(0, str(app_dir))
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bookmemovie-test-'), 'test.db')}"
+os.environ.setdefault("SECRET_KEY", "test-only-secret-key")
+os.environ["CREATE_TABLES_ON_STARTUP"] = "true"
+# Cheap hashes, and nothing that rejects traffic on purpose
+os.environ["PASSWORD_HASH_ROUNDS"] = "4"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["LOAD_SHEDDING_ENABLED"] = "false"
+
+PASSWORD = "test-password"
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+def _login(client, email: str) -> dict:
+    response = client.post("/api/auth/login", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+@pytest.fixture(scope="session")
+def admin_headers(client) -> dict:
+    response = client.post(
+        "/api/auth/create-admin", json={"email": "admin@example.com", "password": PASSWORD, "full_name": "Admin"}
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {_login(client, 'admin@example.com')['access_token']}"}
+
+@pytest.fixture
+def make_user(client):
+    """Register a new customer; returns (email, login response)"""
+    def make():
+        email = f"user-{uuid.uuid4().hex[:8]}@example.com"
+        response = client.post("/api/auth/register", json={"email": email, "password": PASSWORD, "full_name": "User"})
+        assert response.status_code == 200, response.text
+        return email, _login(client, email)
+    return make
+
+@pytest.fixture
+def user_headers(make_user) -> dict:
+    return {"Authorization": f"Bearer {make_user()[1]['access_token']}"}
+
+@pytest.fixture
+def make_event(client, admin_headers):
+    """Create a movie (unless movie_id is given) and an event with seats; returns the event"""
+    def make(title: str = None, description: str = "A test movie", start_time: datetime = None,
+             total_seats: int = 10, movie_id: int = None):
+        if movie_id is None:
+            movie = client.post(
+                "/api/admin/movies",
+                json={"title": title or f"Movie {uuid.uuid4().hex[:8]}", "description": description},
+                headers=admin_headers
+            )
+            assert movie.status_code == 200, movie.text
+            movie_id = movie.json()["id"]
+        start_time = start_time or datetime.utcnow() + timedelta(days=30)
+        event = client.post(
+            "/api/admin/events",
+            json={"movie_id": movie_id, "start_time": start_time.isoformat(), "total_seats": total_seats},
+            headers=admin_headers
+        )
+        assert event.status_code == 200, event.text
+        return event.json()
+    return make
@@ -0,0 +1,71 @@
+"""Access log: one record per request, the event it was about, and dropped records"""
+import logging
+import queue
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.accesslog import AccessLogMiddleware, _NonBlockingQueueHandler, dropped_records, logger
+
+class _Collect(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record.msg)
+
+@pytest.fixture
+def access_records():
+    """Records the access logger emits during the test"""
+    handler = _Collect()
+    level = logger.level
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    try:
+        yield handler.records
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+
+@pytest.fixture
+def logged_client(client):
+    """The app behind an access log middleware (`client` has created the tables)"""
+    return TestClient(AccessLogMiddleware(client.app))
+
+def test_seat_map_record_has_route_user_and_event(logged_client, access_records, make_user, make_event):
+    event = make_event(total_seats=2)
+    headers = {"Authorization": f"Bearer {make_user()[1]['access_token']}"}
+    assert logged_client.get(f"/api/events/{event['id']}/seats", headers=headers).status_code == 200
+
+    [record] = access_records
+    assert record["route"] == "/api/events/{event_id}/seats"
+    assert record["status"] == 200
+    assert record["event_id"] == event["id"]
+    assert record["user_id"] is not None
+
+def test_book_seats_record_has_the_event_of_the_seats(logged_client, access_records, make_user, make_event):
+    event = make_event(total_seats=2)
+    email, login = make_user()
+    headers = {"Authorization": f"Bearer {login['access_token']}"}
+    seat_id = logged_client.get(f"/api/events/{event['id']}/seats", headers=headers).json()["seats"][0]["seat_id"]
+
+    booking = logged_client.post("/api/book-seats", json={"seat_ids": [seat_id], "user_email": email}, headers=headers)
+    assert booking.status_code == 200
+
+    record = access_records[-1]
+    assert record["route"] == "/api/book-seats"
+    assert record["event_id"] == event["id"]
+
+def test_full_queue_drops_and_counts(client):
+    handler = _NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    before = dropped_records()
+    logger.addHandler(handler)
+    try:
+        for _ in range(3):
+            handler.handle(logging.makeLogRecord({"msg": {"status": 200}}))
+        assert handler.dropped == 2
+        assert dropped_records() == before + 2
+        assert f"access_log_dropped_records {before + 2}" in client.get("/metrics").text
+    finally:
+        logger.removeHandler(handler)
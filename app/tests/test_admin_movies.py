@@ -0,0 +1,24 @@
+"""Admin movie lookups: the overview carries no catalog; movies are paged and searchable"""
+import uuid
+
+def test_overview_has_no_movie_catalog(client, admin_headers, make_event):
+    make_event()
+    overview = client.get("/api/admin/events/overview", headers=admin_headers).json()
+    assert "movies" not in overview
+    assert overview["total_events"] >= 1
+
+def test_movie_search_for_select_boxes(client, admin_headers, make_event):
+    word = "zq" + uuid.uuid4().hex[:10]
+    ids = {make_event(title=f"{word} part {part}")["movie_id"] for part in range(3)}
+    make_event()
+
+    response = client.get("/api/admin/movies", params={"q": word, "limit": 2}, headers=admin_headers)
+    assert response.status_code == 200
+    first = response.json()
+    assert len(first) == 2
+
+    rest = client.get(
+        "/api/admin/movies", params={"q": word, "limit": 2, "cursor": response.headers["X-Next-Cursor"]},
+        headers=admin_headers
+    ).json()
+    assert {movie["id"] for movie in first + rest} == ids
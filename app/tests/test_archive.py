@@ -0,0 +1,107 @@
+"""Archive job: past events move, with their seats, into the archive tables"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from archive import archive_past_events
+from core.sqlprofile import query_budget
+from database import SessionLocal, engine
+from models.archive import ArchivedEvent, ArchivedSeat
+from models.event import Event
+from models.seat import Seat
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+def test_archives_old_events_with_their_bookings(client, db, make_user, make_event):
+    old = make_event(start_time=datetime.utcnow() - timedelta(days=30), total_seats=4)
+    recent = make_event(start_time=datetime.utcnow() - timedelta(days=1), total_seats=4)
+
+    email, login = make_user()
+    headers = {"Authorization": f"Bearer {login['access_token']}"}
+    seat_id = client.get(f"/api/events/{old['id']}/seats", headers=headers).json()["seats"][0]["seat_id"]
+    reference = client.post(
+        "/api/book-seats", json={"seat_ids": [seat_id], "user_email": email}, headers=headers
+    ).json()["booking_reference"]
+    assert client.post("/api/confirm-payment", json={"booking_reference": reference}, headers=headers).status_code == 200
+
+    pending = archive_past_events(db, older_than_days=7, dry_run=True)["events_pending"]
+    assert pending >= 1
+    result = archive_past_events(db, older_than_days=7, batch_size=1)
+    assert result["events_archived"] == pending
+    assert archive_past_events(db, older_than_days=7, dry_run=True)["events_pending"] == 0
+
+    # Gone from the live tables, the recent one untouched
+    assert db.query(Event).filter(Event.id == old["id"]).count() == 0
+    assert db.query(Seat).filter(Seat.event_id == old["id"]).count() == 0
+    assert db.query(Event).filter(Event.id == recent["id"]).count() == 1
+
+    archived = db.query(ArchivedEvent).filter(ArchivedEvent.event_id == old["id"]) \
+        .order_by(ArchivedEvent.id.desc()).first()
+    assert (archived.total_seats, archived.booked_seats) == (4, 1)
+    seats = db.query(ArchivedSeat).filter(ArchivedSeat.archived_event_id == archived.id).all()
+    assert len(seats) == 4
+    assert [seat.booking_reference for seat in seats if seat.status == "booked"] == [reference]
+
+def test_archiving_changes_the_event_list_etag(client, db, admin_headers, make_event):
+    make_event(start_time=datetime.utcnow() - timedelta(days=30))
+    url = "/api/admin/events?include_past=true"
+    etag = client.get(url, headers=admin_headers).headers["ETag"]
+
+    archive_past_events(db, older_than_days=7)
+    assert client.get(url, headers={**admin_headers, "If-None-Match": etag}).status_code == 200
+
+def test_archived_events_endpoint(client, db, admin_headers, make_event):
+    old = make_event(start_time=datetime.utcnow() - timedelta(days=30))
+    archive_past_events(db, older_than_days=7)
+
+    response = client.get("/api/admin/archive/events", headers=admin_headers)
+    assert response.status_code == 200
+    assert old["id"] in {event["event_id"] for event in response.json()}
+
+def test_archive_moves_a_batch_with_per_event_seat_counts(client, db, make_event):
+    start = datetime.utcnow() - timedelta(days=40)
+    events = [make_event(start_time=start + timedelta(hours=index), total_seats=index + 1) for index in range(6)]
+
+    # Per batch, not per event: batch ids, events, seat counts, two INSERTs,
+    # two DELETEs and the catalog bump, then the empty next batch
+    with query_budget(engine, 9):
+        result = archive_past_events(db, older_than_days=7, batch_size=50)
+    assert result["events_archived"] >= 6
+
+    for event in events:
+        # Live ids are reused once archived; this run's copy is the newest
+        archived = db.query(ArchivedEvent).filter(ArchivedEvent.event_id == event["id"]) \
+            .order_by(ArchivedEvent.id.desc()).first()
+        assert archived.total_seats == event["total_seats"]
+        seats = db.query(ArchivedSeat).filter(ArchivedSeat.archived_event_id == archived.id).count()
+        assert seats == event["total_seats"]
+
+def test_archived_events_are_paged_newest_first(client, db, admin_headers, make_event):
+    # A window of their own, so other tests' archived events stay out of it
+    start = datetime(2001, 1, 1, 18, 0)
+    for hours in (0, 0, 1, 2, 3):
+        make_event(start_time=start + timedelta(hours=hours))
+    archive_past_events(db, older_than_days=7)
+
+    url = f"/api/admin/archive/events?start_from={start.isoformat()}&start_to={(start + timedelta(days=1)).isoformat()}"
+    seen, cursor = [], None
+    while True:
+        response = client.get(url + "&limit=2" + (f"&cursor={cursor}" if cursor else ""), headers=admin_headers)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        seen.extend(page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert len(seen) == 5
+    assert len({event["id"] for event in seen}) == 5
+    keys = [(event["start_time"], event["id"]) for event in seen]
+    assert keys == sorted(keys, reverse=True)
@@ -0,0 +1,42 @@
+"""Refresh tokens: rotation, reuse detection and logout"""
+
+def _refresh(client, refresh_token: str):
+    return client.post("/api/auth/refresh", json={"refresh_token": refresh_token})
+
+def test_refresh_rotates_the_token(client, make_user):
+    email, login = make_user()
+    response = _refresh(client, login["refresh_token"])
+    assert response.status_code == 200
+    tokens = response.json()
+    assert tokens["refresh_token"] != login["refresh_token"]
+
+    me = client.get("/api/auth/me", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    assert me.status_code == 200
+    assert me.json()["email"] == email
+
+    # The new token rotates in turn
+    assert _refresh(client, tokens["refresh_token"]).status_code == 200
+
+def test_reusing_a_rotated_token_revokes_the_session(client, make_user):
+    _, login = make_user()
+    rotated = _refresh(client, login["refresh_token"]).json()["refresh_token"]
+
+    # The old token again: it was copied, so the whole family is revoked
+    assert _refresh(client, login["refresh_token"]).status_code == 401
+    assert _refresh(client, rotated).status_code == 401
+
+def test_other_sessions_survive_a_reuse(client, make_user):
+    email, first = make_user()
+    second = client.post("/api/auth/login", json={"email": email, "password": "test-password"}).json()
+    _refresh(client, first["refresh_token"])
+    _refresh(client, first["refresh_token"])
+
+    assert _refresh(client, second["refresh_token"]).status_code == 200
+
+def test_logout_revokes_the_refresh_token(client, make_user):
+    _, login = make_user()
+    assert client.post("/api/auth/logout", json={"refresh_token": login["refresh_token"]}).status_code == 200
+    assert _refresh(client, login["refresh_token"]).status_code == 401
+
+def test_unknown_refresh_token(client):
+    assert _refresh(client, "not-a-refresh-token").status_code == 401
@@ -0,0 +1,93 @@
+"""Concurrent book-seats / confirm-payment never sell a seat twice"""
+import threading
+from collections import Counter
+
+from database import SessionLocal
+from models.seat import Seat
+
+THREADS = 12
+
+def _seat_ids(client, headers, event_id: int) -> list:
+    response = client.get(f"/api/events/{event_id}/seats", headers=headers)
+    assert response.status_code == 200, response.text
+    return [seat["seat_id"] for seat in response.json()["seats"]]
+
+def _run_together(target, count: int):
+    """Start `count` threads at once (behind a barrier) and wait for them"""
+    barrier = threading.Barrier(count)
+
+    def run(index):
+        barrier.wait()
+        target(index)
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def test_same_seats_booked_once(client, make_user, make_event):
+    event = make_event(total_seats=4)
+    users = [make_user() for _ in range(THREADS)]
+    headers = [{"Authorization": f"Bearer {login['access_token']}"} for _, login in users]
+    seat_ids = _seat_ids(client, headers[0], event["id"])[:2]
+    results = [None] * THREADS
+
+    def book(index):
+        results[index] = client.post(
+            "/api/book-seats", json={"seat_ids": seat_ids, "user_email": users[index][0]}, headers=headers[index]
+        )
+
+    _run_together(book, THREADS)
+
+    statuses = Counter(response.status_code for response in results)
+    assert statuses[200] == 1, statuses
+    assert statuses[200] + statuses[400] == THREADS, statuses
+
+def test_no_seat_confirmed_twice(client, make_user, make_event):
+    """Overlapping bookings race to lock and pay; every seat ends up sold at most once"""
+    event = make_event(total_seats=6)
+    users = [make_user() for _ in range(THREADS)]
+    headers = [{"Authorization": f"Bearer {login['access_token']}"} for _, login in users]
+    seat_ids = _seat_ids(client, headers[0], event["id"])
+    confirmed = []
+    errors = []
+    lock = threading.Lock()
+
+    def book_and_pay(index):
+        # Each client wants two neighbouring seats, so bookings overlap
+        wanted = [seat_ids[index % len(seat_ids)], seat_ids[(index + 1) % len(seat_ids)]]
+        booking = client.post(
+            "/api/book-seats", json={"seat_ids": wanted, "user_email": users[index][0]}, headers=headers[index]
+        )
+        if booking.status_code >= 500:
+            errors.append(booking.text)
+        if booking.status_code != 200:
+            return
+        reference = booking.json()["booking_reference"]
+        # Pay twice at once, as a client retrying on a timeout would
+        payments = []
+        _run_together(lambda _: payments.append(client.post(
+            "/api/confirm-payment", json={"booking_reference": reference}, headers=headers[index]
+        )), 2)
+        for payment in payments:
+            if payment.status_code == 200:
+                with lock:
+                    confirmed.append((reference, tuple(payment.json()["seat_ids"])))
+
+    _run_together(book_and_pay, THREADS)
+
+    assert not errors
+    # A retried payment reports the same seats; count each booking once
+    sold = Counter(seat_id for _, seats in set(confirmed) for seat_id in seats)
+    assert sold and max(sold.values()) == 1, sold
+
+    db = SessionLocal()
+    try:
+        booked = db.query(Seat.id, Seat.booking_reference).filter(
+            Seat.event_id == event["id"], Seat.status == "booked"
+        ).all()
+    finally:
+        db.close()
+    assert {seat_id for seat_id, _ in booked} == set(sold)
+    assert {reference for _, reference in booked} == {reference for reference, _ in confirmed}
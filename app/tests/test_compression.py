@@ -0,0 +1,80 @@
+"""Response compression: negotiation, what is left alone, and the compressed-body cache"""
+import gzip
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.compression import CODECS, CompressionMiddleware, parse_accept_encoding
+
+BIG = b'{"seats": [' + b",".join(b'{"seat_id": %d, "status": "open"}' % index for index in range(200)) + b"]}"
+
+def _app(body: bytes = BIG, content_type: bytes = b"application/json", headers: list = (), more_body: bool = False):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [
+            (b"content-type", content_type), (b"content-length", str(len(body)).encode()), *headers
+        ]})
+        if more_body:
+            await send({"type": "http.response.body", "body": body, "more_body": True})
+        await send({"type": "http.response.body", "body": b"" if more_body else body})
+    return app
+
+def _get(middleware: CompressionMiddleware, accept_encoding: str = "gzip"):
+    # The TestClient would otherwise send (and undo) its own Accept-Encoding
+    return TestClient(middleware).get("/", headers={"Accept-Encoding": accept_encoding})
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip, br;q=0.5, zstd;q=0, x;q=bad") == {"gzip": 1.0, "br": 0.5, "zstd": 0.0, "x": 0.0}
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("*", "gzip"),
+    ("identity", None),
+    ("gzip;q=0", None),
+])
+def test_choose_encoding(accept_encoding, expected):
+    middleware = CompressionMiddleware(_app(), preference=("gzip",))
+    assert middleware.choose_encoding(accept_encoding) == expected
+
+def test_server_preference_wins_over_header_order():
+    middleware = CompressionMiddleware(_app(), preference=("br", "gzip"))
+    assert middleware.choose_encoding("gzip, br") == ("br" if "br" in CODECS else "gzip")
+
+def test_large_json_is_gzipped():
+    response = _get(CompressionMiddleware(_app(headers=[(b"vary", b"Authorization")]), preference=("gzip",)))
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Authorization, Accept-Encoding"
+    # httpx decodes the body; the length on the wire is the compressed one
+    assert response.content == BIG
+    assert int(response.headers["Content-Length"]) < len(BIG)
+
+@pytest.mark.parametrize("app", [
+    _app(body=b'{"small": true}'),
+    _app(content_type=b"image/png"),
+    _app(headers=[(b"content-encoding", b"x-custom")]),
+    _app(more_body=True),
+], ids=["small", "not-compressible", "already-encoded", "streaming"])
+def test_left_alone(app):
+    response = _get(CompressionMiddleware(app, preference=("gzip",)))
+    assert response.headers.get("Content-Encoding") in (None, "x-custom")
+    assert "Accept-Encoding" not in response.headers.get("Vary", "")
+
+def test_no_accept_encoding_is_left_alone():
+    response = _get(CompressionMiddleware(_app(), preference=("gzip",)), accept_encoding="identity")
+    assert "Content-Encoding" not in response.headers
+    assert response.content == BIG
+
+def test_same_body_is_compressed_once(monkeypatch):
+    calls = []
+    monkeypatch.setitem(CODECS, "gzip", lambda data: calls.append(data) or gzip.compress(data))
+    middleware = CompressionMiddleware(_app(), preference=("gzip",))
+    for _ in range(3):
+        assert _get(middleware).content == BIG
+    assert len(calls) == 1
+
+def test_app_responses_are_compressed(client, user_headers, make_event):
+    event = make_event(total_seats=100)
+    response = client.get(f"/api/events/{event['id']}/seats", headers={**user_headers, "Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert len(response.json()["seats"]) == 100
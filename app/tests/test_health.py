@@ -0,0 +1,58 @@
+"""Health probes: liveness, readiness and the cached readiness check"""
+import asyncio
+import time
+
+from sqlalchemy import create_engine
+
+import core.health
+from core.health import ReadinessProbe
+from database import engine
+
+def _probe(cache_seconds: float = 60, max_db_latency_ms: float = 1000, probe_engine=engine) -> ReadinessProbe:
+    return ReadinessProbe(probe_engine, cache_seconds, max_db_latency_ms, lock_duration_minutes=10)
+
+def test_live_and_ready(client):
+    assert client.get("/health/live").json() == {"status": "alive"}
+    ready = client.get("/health/ready")
+    assert ready.status_code == 200
+    assert ready.json()["ready"] is True and ready.json()["database"] == "ok"
+    assert client.get("/health").json()["status"] == "healthy"
+
+def test_cached_result_skips_the_threadpool(client, monkeypatch):
+    probe = _probe()
+    calls = []
+
+    async def counting_threadpool(func, *args):
+        calls.append(func)
+        return func(*args)
+
+    monkeypatch.setattr(core.health, "run_in_threadpool", counting_threadpool)
+    first = asyncio.run(probe.check())
+    assert asyncio.run(probe.check()) is first
+    assert len(calls) == 1
+
+def test_probes_during_a_running_check_do_not_wait(client, monkeypatch):
+    probe = _probe()
+    monkeypatch.setattr(probe, "_probe", lambda: time.sleep(0.3) or {"ready": True, "database": "ok"})
+
+    async def two_probes():
+        first = asyncio.create_task(probe.check())
+        await asyncio.sleep(0.05)
+        started = time.monotonic()
+        second = await probe.check()
+        waited = time.monotonic() - started
+        return await first, second, waited
+
+    first, second, waited = asyncio.run(two_probes())
+    assert first == {"ready": True, "database": "ok"}
+    assert second == {"ready": False, "database": "checking"}
+    assert waited < 0.1
+
+def test_unreachable_database_is_not_ready(tmp_path):
+    missing = create_engine(f"sqlite:///{tmp_path / 'missing' / 'db.sqlite'}")
+    result = asyncio.run(_probe(probe_engine=missing).check())
+    assert result["ready"] is False and result["database"] == "unavailable"
+
+def test_slow_database_is_not_ready(client):
+    result = asyncio.run(_probe(max_db_latency_ms=0).check())
+    assert result["ready"] is False and result["database"] == "slow"
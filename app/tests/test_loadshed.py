@@ -0,0 +1,80 @@
+"""Load shedding: request priorities, the AIMD limit and the 503 middleware"""
+import pytest
+from fastapi.testclient import TestClient
+
+from core.loadshed import CRITICAL, LOW, NORMAL, AdaptiveConcurrencyLimiter, LoadSheddingMiddleware, request_priority
+
+def _limiter(**overrides) -> AdaptiveConcurrencyLimiter:
+    # window_seconds=0: every release closes a window and adjusts the limit
+    options = dict(min_limit=2, max_limit=10, target_latency_ms=100, db_target_latency_ms=50, window_seconds=0)
+    return AdaptiveConcurrencyLimiter(**{**options, **overrides})
+
+async def _ok(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+@pytest.mark.parametrize("method, path, priority", [
+    ("GET", "/api/events", LOW),
+    ("GET", "/api/admin/events", LOW),
+    ("GET", "/api/events/1/seats", NORMAL),
+    ("POST", "/api/auth/login", NORMAL),
+    ("POST", "/api/book-seats", CRITICAL),
+    ("POST", "/api/confirm-payment", CRITICAL),
+    ("GET", "/health/ready", CRITICAL),
+    ("GET", "/metrics", CRITICAL),
+])
+def test_request_priority(method, path, priority):
+    assert request_priority(method, path) == priority
+
+def test_slow_requests_back_off_multiplicatively_then_recover_additively():
+    limiter = _limiter()
+    limiter.try_acquire(NORMAL)
+    limiter.release(0.5)
+    assert limiter.limit == pytest.approx(7.5)
+    for _ in range(10):
+        limiter.try_acquire(NORMAL)
+        limiter.release(0.5)
+    assert limiter.limit == 2
+
+    limiter.try_acquire(NORMAL)
+    limiter.release(0.01)
+    assert limiter.limit == 3
+
+def test_slow_database_backs_off_even_with_fast_requests():
+    limiter = _limiter()
+    limiter.record_db_latency(0.2)
+    limiter.try_acquire(NORMAL)
+    limiter.release(0.01)
+    assert limiter.limit == pytest.approx(7.5)
+    assert limiter.stats()["db_mean_ms"] == 200
+
+def test_priorities_at_the_limit():
+    limiter = _limiter(max_limit=2)
+    assert limiter.try_acquire(LOW) and limiter.try_acquire(LOW)
+    # Full for low priority; normal gets twice the headroom; critical is never shed
+    assert not limiter.try_acquire(LOW)
+    assert limiter.try_acquire(NORMAL) and limiter.try_acquire(NORMAL)
+    assert not limiter.try_acquire(NORMAL)
+    assert limiter.try_acquire(CRITICAL)
+    assert limiter.stats()["shed"] == {LOW: 1, NORMAL: 1, CRITICAL: 0}
+    assert limiter.in_flight == 5
+
+def test_middleware_sheds_with_503_and_retry_after():
+    limiter = _limiter(max_limit=2)
+    limiter.in_flight = 2  # as if two requests were running
+    client = TestClient(LoadSheddingMiddleware(_ok, limiter))
+
+    shed = client.get("/api/events")
+    assert shed.status_code == 503
+    assert shed.headers["Retry-After"] == "1"
+    assert client.post("/api/book-seats").status_code == 200
+    # The admitted request released its slot
+    assert limiter.in_flight == 2
+
+def test_auth_latency_is_not_sampled():
+    limiter = _limiter(window_seconds=3600)
+    client = TestClient(LoadSheddingMiddleware(_ok, limiter))
+    client.post("/api/auth/login")
+    assert limiter._request_samples == []
+    client.get("/api/events/1/seats")
+    assert len(limiter._request_samples) == 1
@@ -0,0 +1,36 @@
+"""manage.py init-db: the deploy step that creates the schema"""
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+def _init_db(database: Path) -> subprocess.CompletedProcess:
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{database}"}
+    return subprocess.run(
+        [sys.executable, "manage.py", "init-db"], cwd=APP_DIR, env=env, capture_output=True, text=True
+    )
+
+def _tables(database: Path) -> set:
+    with sqlite3.connect(database) as connection:
+        return {name for (name,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+def test_init_db_creates_the_schema_and_is_repeatable(tmp_path):
+    database = tmp_path / "deploy.db"
+    first = _init_db(database)
+    assert first.returncode == 0, first.stderr
+    assert {"movies", "events", "seats", "users"} <= _tables(database)
+
+    again = _init_db(database)
+    assert again.returncode == 0, again.stderr
+    assert "Tables are up to date" in again.stdout
+
+def test_workers_do_not_create_tables_by_default(monkeypatch):
+    from config import Config
+
+    monkeypatch.delenv("CREATE_TABLES_ON_STARTUP", raising=False)
+    # Not a developer's app/.env
+    monkeypatch.setattr(Config, "_load_env_file", lambda self: None)
+    assert Config().create_tables_on_startup is False
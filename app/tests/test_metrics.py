@@ -0,0 +1,67 @@
+"""Prometheus metrics: sharded counters and histograms, exposition, and /metrics"""
+import gc
+import threading
+
+from core.metrics import Counter, Gauge, Histogram, Registry
+
+def _in_threads(target, count: int = 4):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def test_counter_sums_thread_shards_and_keeps_dead_threads_counts():
+    counter = Counter("jobs_total", "Jobs", labelnames=("result",))
+    _in_threads(lambda: [counter.inc("ok") for _ in range(100)])
+    counter.inc("failed", amount=2)
+
+    gc.collect()
+    # Exited threads were folded into the base accumulator
+    assert len(counter._shards) == 1
+    assert counter.value("ok") == 400
+    assert list(counter.collect()) == ['jobs_total{result="failed"} 2', 'jobs_total{result="ok"} 400']
+
+def test_histogram_exposition_is_cumulative():
+    histogram = Histogram("latency_seconds", "Latency", labelnames=("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "/a")
+    assert list(histogram.collect()) == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a",le="1.0"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 6.05',
+        'latency_seconds_count{route="/a"} 4',
+    ]
+
+def test_histogram_merges_threads():
+    histogram = Histogram("work_seconds", "Work", buckets=(1.0,))
+    _in_threads(lambda: [histogram.observe(0.5) for _ in range(10)])
+    assert "work_seconds_count 40" in list(histogram.collect())
+
+def test_registry_renders_help_type_and_escaped_labels():
+    registry = Registry()
+    registry.register(Gauge("queue_depth", "Items waiting", lambda: [(('say "hi"\n',), 3)], ("queue",)))
+    assert registry.render() == (
+        "# HELP queue_depth Items waiting\n"
+        "# TYPE queue_depth gauge\n"
+        'queue_depth{queue="say \\"hi\\"\\n"} 3\n'
+    )
+
+def test_metrics_endpoint(client, make_user, make_event):
+    event = make_event(total_seats=2)
+    email, login = make_user()
+    headers = {"Authorization": f"Bearer {login['access_token']}"}
+    seat_id = client.get(f"/api/events/{event['id']}/seats", headers=headers).json()["seats"][0]["seat_id"]
+    assert client.post("/api/book-seats", json={"seat_ids": [seat_id], "user_email": email}, headers=headers).status_code == 200
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain")
+    text = response.text
+    # Latency is labelled by route template, not by the raw path
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/events/{event_id}/seats",status="200"}' in text
+    assert f"/api/events/{event['id']}/seats" not in text
+    assert 'booking_attempts_total{result="success"}' in text
+    assert 'seat_lock_events_total{event="taken"}' in text
+    assert 'threadpool_workers{state="tasks_waiting"}' in text
@@ -0,0 +1,74 @@
+"""Keyset pagination: cursors and walking event/movie lists page by page"""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from config import get_config
+from core.pagination import decode_cursor, encode_cursor
+
+def _walk(client, url, headers, **params) -> list:
+    """Every row of a list, following X-Next-Cursor"""
+    rows, cursor = [], None
+    while True:
+        response = client.get(url, headers=headers, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        rows.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return rows
+        assert 'rel="next"' in response.headers["Link"]
+
+def test_cursor_round_trip():
+    start_time = datetime(2030, 1, 1, 19, 30)
+    cursor = encode_cursor(start_time, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, datetime, int) == (start_time, 42)
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "!!!", encode_cursor(1), encode_cursor("x", "y")])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, datetime, int)
+    assert error.value.status_code == 400
+
+def test_invalid_cursor_is_a_400(client, user_headers):
+    assert client.get("/api/events?cursor=garbage", headers=user_headers).status_code == 400
+
+def test_event_pages_cover_every_event_once_in_order(client, user_headers, make_event):
+    now = datetime.utcnow()
+    first = make_event(start_time=now + timedelta(days=3))
+    # Same showtime, so the id breaks the tie across a page boundary
+    created = [first["id"]] + [
+        make_event(movie_id=first["movie_id"], start_time=now + timedelta(days=3))["id"] for _ in range(4)
+    ]
+
+    events = _walk(client, "/api/events", user_headers, limit=2)
+    keys = [(event["start_time"], event["event_id"]) for event in events]
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+    assert set(created) <= {event["event_id"] for event in events}
+
+def test_event_list_hides_past_showtimes_unless_asked(client, user_headers, make_event):
+    past = make_event(start_time=datetime.utcnow() - timedelta(days=2))["id"]
+    assert past not in {event["event_id"] for event in _walk(client, "/api/events", user_headers)}
+    assert past in {event["event_id"] for event in _walk(client, "/api/events", user_headers, include_past="true")}
+
+def test_limit_is_capped(client, user_headers):
+    response = client.get("/api/events", headers=user_headers, params={"limit": 10 ** 6})
+    assert response.status_code == 200
+    assert len(response.json()) <= get_config().page_size_max
+
+def test_not_modified_page_keeps_next_cursor(client, admin_headers, make_event):
+    for _ in range(3):
+        make_event()
+    url = "/api/admin/movies?limit=1"
+    response = client.get(url, headers=admin_headers)
+    not_modified = client.get(url, headers={**admin_headers, "If-None-Match": response.headers["ETag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["X-Next-Cursor"] == response.headers["X-Next-Cursor"]
+
+def test_movie_pages_by_id(client, admin_headers, make_event):
+    for _ in range(3):
+        make_event()
+    ids = [movie["id"] for movie in _walk(client, "/api/admin/movies", admin_headers, limit=2)]
+    assert ids == sorted(set(ids))
@@ -0,0 +1,73 @@
+"""Sampling profiler: who may trigger it, and that samples land on the right request"""
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.profiler import ProfilingMiddleware, profiler
+
+def _spin(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+async def busy_app(scope, receive, send):
+    _spin(0.05)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+def _profiled(middleware: ProfilingMiddleware, path: str = "/work", headers: dict = None) -> list:
+    """Profiles recorded for one request through `middleware`"""
+    before = {profile.id for profile in profiler.profiles}
+    assert TestClient(middleware).get(path, headers=headers or {}).status_code == 200
+    return [profile for profile in profiler.profiles if profile.id not in before]
+
+def _is_admin(token: str) -> bool:
+    return token == "admin-token"
+
+def test_header_is_off_without_secret_or_admin_check():
+    middleware = ProfilingMiddleware(busy_app, header="X-Profile")
+    assert _profiled(middleware, headers={"X-Profile": "1"}) == []
+
+@pytest.mark.parametrize("value, profiled", [("s3cret", True), ("1", False), ("s3cret-not", False)])
+def test_header_needs_the_shared_secret(value, profiled):
+    middleware = ProfilingMiddleware(busy_app, header="X-Profile", secret="s3cret")
+    profiles = _profiled(middleware, headers={"X-Profile": value})
+    assert [profile.reason for profile in profiles] == (["header"] if profiled else [])
+
+@pytest.mark.parametrize("token, profiled", [("admin-token", True), ("user-token", False), (None, False)])
+def test_header_from_an_admin(token, profiled):
+    middleware = ProfilingMiddleware(busy_app, header="X-Profile", is_admin=_is_admin)
+    headers = {"X-Profile": "1", **({"Authorization": f"Bearer {token}"} if token else {})}
+    assert len(_profiled(middleware, headers=headers)) == int(profiled)
+
+def test_async_request_samples_its_own_frames():
+    middleware = ProfilingMiddleware(busy_app, path_pattern=r"^/work$")
+    (profile,) = _profiled(middleware)
+    assert profile.reason == "route"
+    assert profile.status == 200
+    assert profile.sample_count > 0
+    assert any("test_profiler.py:_spin" in stack for stack in profile.stacks)
+    assert not profiler._tasks
+
+def test_bound_thread_is_sampled_only_while_bound():
+    profile = profiler.start("GET", "/thread", "test")
+
+    def work():
+        profiler.bind_thread(profile)
+        try:
+            _spin(0.05)
+        finally:
+            profiler.unbind_thread()
+        _spin(0.05)
+
+    thread = threading.Thread(target=work)
+    thread.start()
+    thread.join()
+    profiler.finish(profile, None, 200, 0.1)
+
+    assert profile.sample_count > 0
+    # Every sample was taken inside the bound block
+    assert all("test_profiler.py:work;test_profiler.py:_spin" in stack for stack in profile.stacks)
+    assert not profiler._threads
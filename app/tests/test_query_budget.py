@@ -0,0 +1,55 @@
+"""SQL statement budgets for hot read routes (catches N+1 queries)"""
+import pytest
+
+from core.sqlprofile import query_budget
+from database import engine
+
+EVENTS = 8
+
+@pytest.fixture
+def many_events(make_event) -> list:
+    """Several events of one movie, so a per-event or per-seat query would blow the budget"""
+    first = make_event(total_seats=30)
+    return [first] + [make_event(movie_id=first["movie_id"], total_seats=30) for _ in range(EVENTS - 1)]
+
+def test_seat_map_budget(client, admin_headers, many_events):
+    url = f"/api/events/{many_events[0]['id']}/seats"
+    client.get("/api/auth/me", headers=admin_headers)
+
+    # Versions, event, seats, and advancing the seat map counter on the first read
+    with query_budget(engine, 4):
+        response = client.get(url, headers=admin_headers)
+    assert response.status_code == 200
+    assert len(response.json()["seats"]) == 30
+
+    with query_budget(engine, 3):
+        assert client.get(url, headers=admin_headers).status_code == 200
+
+    # A 304 only reads the version counters
+    with query_budget(engine, 1):
+        not_modified = client.get(url, headers={**admin_headers, "If-None-Match": response.headers["ETag"]})
+    assert not_modified.status_code == 304
+
+def test_admin_events_budget(client, admin_headers, many_events):
+    url = "/api/admin/events?limit=5"
+    client.get("/api/auth/me", headers=admin_headers)
+
+    # Window key, versions, the page of events, one GROUP BY for their seat counts
+    with query_budget(engine, 4):
+        response = client.get(url, headers=admin_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 5
+
+    # Window key, versions, and the key-only page for X-Next-Cursor
+    with query_budget(engine, 3):
+        not_modified = client.get(url, headers={**admin_headers, "If-None-Match": response.headers["ETag"]})
+    assert not_modified.status_code == 304
+
+def test_admin_overview_budget(client, admin_headers, many_events):
+    client.get("/api/auth/me", headers=admin_headers)
+
+    # The events page as above, the movie catalog, and the two totals
+    with query_budget(engine, 7):
+        response = client.get("/api/admin/events/overview?limit=5", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()["total_events"] >= EVENTS
@@ -0,0 +1,130 @@
+"""GCRA rate limiting: the memory and database backends and the middleware"""
+import re
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from core.ratelimit import DatabaseBackend, MemoryBackend, RateLimit, RateLimitMiddleware, RouteClass
+from database import engine
+from models.rate_limit import RateLimitBucket
+
+class FakeClock:
+    """Time source for the backends that only moves when told to"""
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+@pytest.fixture(params=["memory", "database"])
+def backend(request, client, clock):
+    # `client` has created the tables
+    if request.param == "memory":
+        return MemoryBackend(clock=clock)
+    return DatabaseBackend(engine, clock=clock)
+
+def _key() -> str:
+    return f"test:{uuid.uuid4().hex}"
+
+def test_parse():
+    rate = RateLimit.parse("20/60")
+    assert (rate.limit, rate.period, rate.interval) == (20, 60.0, 3.0)
+
+def test_burst_then_retry_after(backend):
+    rate, key = RateLimit(3, 60), _key()
+    assert [backend.hit(key, rate) for _ in range(3)] == [0.0, 0.0, 0.0]
+    # The next unit of budget frees up one interval (20 s) after the burst
+    assert backend.hit(key, rate) == pytest.approx(20)
+
+def test_rejected_hits_spend_nothing(backend, clock):
+    rate, key = RateLimit(2, 60), _key()
+    backend.hit(key, rate)
+    backend.hit(key, rate)
+    assert backend.hit(key, rate) == pytest.approx(30)
+    clock.advance(10)
+    # Retrying while limited doesn't push the retry time further out
+    assert backend.hit(key, rate) == pytest.approx(20)
+    assert backend.hit(key, rate) == pytest.approx(20)
+
+def test_keys_are_independent(backend):
+    rate, key = RateLimit(1, 60), _key()
+    assert backend.hit(key, rate) == 0.0
+    assert backend.hit(key, rate) > 0
+    assert backend.hit(_key(), rate) == 0.0
+
+def test_budget_recovers_at_sustained_rate(backend, clock):
+    rate, key = RateLimit(2, 60), _key()
+    backend.hit(key, rate)
+    backend.hit(key, rate)
+    clock.advance(29)
+    assert backend.hit(key, rate) > 0
+    clock.advance(1)
+    # One interval frees exactly one unit
+    assert backend.hit(key, rate) == 0.0
+    assert backend.hit(key, rate) > 0
+    clock.advance(60)
+    assert [backend.hit(key, rate) for _ in range(2)] == [0.0, 0.0]
+
+def test_memory_backend_evicts_least_recently_used(clock):
+    backend, rate = MemoryBackend(max_keys=2, clock=clock), RateLimit(1, 60)
+    for key in ("a", "b", "c"):
+        backend.hit(key, rate)
+    # "a" was evicted and starts over with a full budget; "c" was not
+    assert backend.hit("a", rate) == 0.0
+    assert backend.hit("c", rate) > 0
+
+def test_database_backend_prunes_spent_rows(client, clock):
+    backend = DatabaseBackend(engine, prune_interval=0, clock=clock)
+    rate = RateLimit(5, 60)
+    stale = [_key() for _ in range(3)]
+    for key in stale:
+        backend.hit(key, rate)
+    clock.advance(rate.interval + 1)
+    backend.hit(_key(), rate)
+
+    with engine.connect() as connection:
+        remaining = connection.execute(
+            select(func.count()).select_from(RateLimitBucket).where(RateLimitBucket.key.in_(stale))
+        ).scalar()
+    assert remaining == 0
+
+# ============ MIDDLEWARE ============
+
+async def _ok(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+def _auth_client(rate: RateLimit, ip_rate: RateLimit) -> TestClient:
+    auth = RouteClass(
+        name="auth", methods=frozenset({"POST"}), path_pattern=re.compile(r"^/api/auth/login$"),
+        rate=rate, per_user=False, body_key="email", ip_rate=ip_rate
+    )
+    return TestClient(RateLimitMiddleware(_ok, [auth], MemoryBackend(clock=FakeClock())))
+
+def _login(client: TestClient, email: str):
+    return client.post("/api/auth/login", json={"email": email, "password": "x"})
+
+def test_auth_budget_per_email():
+    auth_client = _auth_client(RateLimit(2, 60), RateLimit(100, 60))
+    assert [_login(auth_client, "a@example.com").status_code for _ in range(3)] == [200, 200, 429]
+    # Someone else behind the same address still gets in
+    assert _login(auth_client, "b@example.com").status_code == 200
+
+def test_changing_email_does_not_lift_the_ip_budget():
+    auth_client = _auth_client(RateLimit(2, 60), RateLimit(3, 60))
+    statuses = [_login(auth_client, f"user{index}@example.com").status_code for index in range(5)]
+    assert statuses == [200, 200, 200, 429, 429]
+
+    response = _login(auth_client, "another@example.com")
+    assert response.status_code == 429
+    assert response.headers["X-RateLimit-Limit"] == "3;w=60"
+    assert int(response.headers["Retry-After"]) > 0
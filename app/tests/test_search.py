@@ -0,0 +1,75 @@
+"""Movie search: the FTS5 index and the LIKE fallback"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+import core.search
+from core.search import search_terms
+
+def _word() -> str:
+    # A made-up word no other test's movie contains
+    return "zq" + uuid.uuid4().hex[:10]
+
+def _search(client, headers, q, **params) -> set:
+    response = client.get("/api/events/search", headers=headers, params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return {event["event_id"] for event in response.json()}
+
+@pytest.fixture(params=["fts", "like"])
+def search_mode(request, client, monkeypatch):
+    if request.param == "fts":
+        assert core.search.fts_available()
+    else:
+        monkeypatch.setattr(core.search, "_fts_available", False)
+    return request.param
+
+def test_search_terms_drop_punctuation_and_operators():
+    assert search_terms('Star-Wars: "NEAR" *') == ["star", "wars", "near"]
+    assert search_terms("!!! ___") == []
+
+def test_matches_title_and_description(client, user_headers, make_event, search_mode):
+    word = _word()
+    in_title = make_event(title=f"The {word} Returns")["id"]
+    in_description = make_event(description=f"A story about {word}.")["id"]
+    assert _search(client, user_headers, word) == {in_title, in_description}
+    assert _search(client, user_headers, word.upper()) == {in_title, in_description}
+
+def test_every_word_must_match(client, user_headers, make_event, search_mode):
+    word, other = _word(), _word()
+    both = make_event(title=f"{word} {other}")["id"]
+    make_event(title=word)
+    assert _search(client, user_headers, f"{word} {other}") == {both}
+
+def test_prefix_matches(client, user_headers, make_event, search_mode):
+    word = _word()
+    event = make_event(title=f"{word}ing")["id"]
+    assert _search(client, user_headers, word) == {event}
+
+def test_substring_only_matches_in_like_fallback(client, user_headers, make_event, search_mode):
+    word = _word()
+    event = make_event(title=word)["id"]
+    expected = {event} if search_mode == "like" else set()
+    assert _search(client, user_headers, word[3:]) == expected
+
+def test_index_follows_movie_edits(client, user_headers, admin_headers, make_event):
+    word, renamed = _word(), _word()
+    event = make_event(title=word)
+    response = client.put(f"/api/admin/movies/{event['movie_id']}", json={"title": renamed}, headers=admin_headers)
+    assert response.status_code == 200
+    assert _search(client, user_headers, word) == set()
+    assert _search(client, user_headers, renamed) == {event["id"]}
+
+def test_showtime_window(client, user_headers, make_event):
+    word, now = _word(), datetime.utcnow()
+    past = make_event(title=word, start_time=now - timedelta(days=1))
+    soon = make_event(movie_id=past["movie_id"], start_time=now + timedelta(days=1))["id"]
+    later = make_event(movie_id=past["movie_id"], start_time=now + timedelta(days=20))["id"]
+
+    assert _search(client, user_headers, word) == {soon, later}
+    assert _search(client, user_headers, word, include_past="true") == {past["id"], soon, later}
+    assert _search(client, user_headers, word, to=(now + timedelta(days=10)).isoformat()) == {soon}
+    assert _search(client, user_headers, word, **{"from": (now + timedelta(days=10)).isoformat()}) == {later}
+
+def test_query_without_words_matches_nothing(client, user_headers):
+    assert _search(client, user_headers, "!!!") == set()
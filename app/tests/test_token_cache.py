@@ -0,0 +1,56 @@
+"""Verified-token cache: repeated tokens skip jwt.decode, and expiry is still honoured"""
+import time
+from datetime import timedelta
+
+import pytest
+
+import core.auth
+from core.auth import create_access_token, token_cache, verify_token
+
+@pytest.fixture
+def decodes(monkeypatch) -> list:
+    """Tokens passed to jwt.decode during the test"""
+    calls = []
+    decode = core.auth.jwt.decode
+
+    def counting_decode(token, *args, **kwargs):
+        calls.append(token)
+        return decode(token, *args, **kwargs)
+
+    monkeypatch.setattr(core.auth.jwt, "decode", counting_decode)
+    return calls
+
+def _token(minutes: float = 30, email: str = "cached@example.com") -> str:
+    return create_access_token({"sub": email, "role": "customer", "uid": 7}, expires_delta=timedelta(minutes=minutes))
+
+def test_repeated_token_is_decoded_once(decodes):
+    token = _token()
+    claims = verify_token(token)
+    assert claims == {"email": "cached@example.com", "role": "customer", "uid": 7}
+    assert verify_token(token) == claims
+    assert verify_token(token) == claims
+    assert decodes == [token]
+
+def test_entry_expires_with_the_token(decodes):
+    token = _token(minutes=1 / 60)
+    assert verify_token(token) is not None
+    expires_at, _ = token_cache._data[token]
+    assert expires_at - time.monotonic() <= 1
+
+def test_expired_and_invalid_tokens_are_rejected_and_not_cached(decodes):
+    expired, forged = _token(minutes=-1), _token()[:-4] + "AAAA"
+    for token in (expired, forged, "not-a-jwt"):
+        assert verify_token(token) is None
+        assert verify_token(token) is None
+    # Every attempt was verified again
+    assert len(decodes) == 6
+
+def test_cache_stats_for_tuning(client, admin_headers):
+    response = client.get("/api/admin/cache-stats", headers=admin_headers)
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["token_cache"]["hits"] >= 1
+    assert {"size", "maxsize", "hit_rate"} <= set(stats["token_cache"]) & set(stats["user_cache"])
+
+def test_cache_stats_are_admin_only(client, user_headers):
+    assert client.get("/api/admin/cache-stats", headers=user_headers).status_code == 403
@@ -0,0 +1,64 @@
+"""Tracing: spans assembled into traces, and which incoming traceparents are recorded"""
+import pytest
+from fastapi.testclient import TestClient
+
+from core.tracing import InMemorySpanExporter, TracerProvider, TracingMiddleware
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+async def _ok(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+def _traced(sample_rate: float):
+    """A middleware-wrapped app with its own provider; returns (client, exporter)"""
+    exporter = InMemorySpanExporter()
+    middleware = TracingMiddleware(_ok)
+    middleware.tracer = TracerProvider(True, sample_rate, [exporter]).get_tracer("http")
+    return TestClient(middleware), exporter
+
+def test_child_spans_are_exported_with_their_root():
+    exporter = InMemorySpanExporter()
+    tracer = TracerProvider(True, 1.0, [exporter]).get_tracer("test")
+    with tracer.start_as_current_span("root") as root:
+        with tracer.start_as_current_span("child") as child:
+            # Nothing is exported until the root ends
+            assert exporter.summaries() == []
+
+    spans = exporter.get_trace(root.trace_id)
+    assert [span["name"] for span in spans] == ["root", "child"]
+    assert spans[1]["parent_span_id"] == root.span_id == child.parent_span_id
+
+def test_unsampled_root_has_no_recording_children():
+    tracer = TracerProvider(True, 0.0, [InMemorySpanExporter()]).get_tracer("test")
+    with tracer.start_as_current_span("root") as root:
+        with tracer.start_as_current_span("child") as child:
+            assert not root.is_recording() and not child.is_recording()
+
+def test_request_without_traceparent_starts_a_trace():
+    client, exporter = _traced(1.0)
+    response = client.get("/work")
+    [summary] = exporter.summaries()
+    assert summary["name"] == "GET /work"
+    assert response.headers["traceparent"].startswith(f"00-{summary['trace_id']}-")
+
+def test_sampled_traceparent_is_continued():
+    client, exporter = _traced(1.0)
+    response = client.get("/work", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"})
+    [span] = exporter.get_trace(TRACE_ID)
+    assert span["parent_span_id"] == PARENT_ID
+    assert response.headers["traceparent"] == f"00-{TRACE_ID}-{span['span_id']}-01"
+
+def test_unsampled_traceparent_is_not_recorded():
+    client, exporter = _traced(1.0)
+    response = client.get("/work", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-00"})
+    assert exporter.summaries() == []
+    assert "traceparent" not in response.headers
+
+@pytest.mark.parametrize("flags", ["01", "00"])
+def test_local_sample_rate_applies_to_incoming_traces(flags):
+    client, exporter = _traced(0.0)
+    for _ in range(20):
+        client.get("/work", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-{flags}"})
+    assert exporter.summaries() == []
@@ -0,0 +1,74 @@
+"""Authenticated-user cache: the TTL/LRU cache, skipped user lookups and invalidation"""
+import pytest
+
+import core.auth
+from core.auth import user_cache
+from core.cache import TTLCache
+from core.sqlprofile import query_budget
+from database import SessionLocal, engine
+from models.user import User
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.set("c", 3)
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+
+def test_ttl_cache_expiry_pop_and_stats():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("gone", 1, ttl=0)
+    cache.set("kept", 2)
+    assert cache.get("gone") is None
+    assert cache.get("kept") == 2
+    cache.pop("kept")
+    assert cache.get("kept", "default") == "default"
+    assert cache.stats() == {"size": 0, "maxsize": 10, "ttl_seconds": 60, "hits": 1, "misses": 2, "hit_rate": 0.3333}
+
+def test_zero_size_cache_stores_nothing():
+    cache = TTLCache(maxsize=0, ttl=60)
+    cache.set("a", 1)
+    assert len(cache) == 0
+
+@pytest.fixture
+def customer(make_user):
+    """(email, headers) of a new customer, with the user cache cleared"""
+    email, login = make_user()
+    user_cache.clear()
+    return email, {"Authorization": f"Bearer {login['access_token']}"}
+
+def _users_queries(client, url: str, headers: dict) -> list:
+    with query_budget(engine, 100) as statements:
+        assert client.get(url, headers=headers).status_code == 200
+    return [statement for statement in statements if "FROM users" in statement]
+
+def test_second_request_skips_the_users_table(client, customer, make_event):
+    email, headers = customer
+    url = f"/api/events/{make_event(total_seats=2)['id']}/seats"
+    assert len(_users_queries(client, url, headers)) == 1
+    assert _users_queries(client, url, headers) == []
+    assert user_cache.get(email).email == email
+
+def test_deactivation_evicts_the_cached_user(client, customer, make_event):
+    email, headers = customer
+    url = f"/api/events/{make_event(total_seats=2)['id']}/seats"
+    assert client.get(url, headers=headers).status_code == 200
+
+    db = SessionLocal()
+    try:
+        db.query(User).filter(User.email == email).one().is_active = 0
+        db.commit()
+    finally:
+        db.close()
+
+    assert user_cache.get(email) is None
+    response = client.get(url, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Inactive user"
+
+def test_claims_only_reads_never_touch_the_users_table(client, customer, make_event, monkeypatch):
+    _, headers = customer
+    monkeypatch.setattr(core.auth.config, "auth_claims_only_reads", True)
+    url = f"/api/events/{make_event(total_seats=2)['id']}/seats"
+    assert _users_queries(client, url, headers) == []
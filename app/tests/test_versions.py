@@ -0,0 +1,91 @@
+"""Conditional GETs: ETags, 304s and what invalidates them"""
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+from core.versions import make_etag
+from database import engine
+
+def _revalidate(client, url, headers, etag):
+    return client.get(url, headers={**headers, "If-None-Match": etag})
+
+def test_make_etag_depends_on_versions_and_extra():
+    names = ("catalog",)
+    etag = make_etag({"catalog": (1, None)}, names)
+    assert etag.startswith('W/"')
+    assert make_etag({"catalog": (2, None)}, names) != etag
+    assert make_etag({"catalog": (1, None)}, names, extra="from=x") != etag
+    assert make_etag({}, names) != etag
+
+def test_event_list_not_modified_until_catalog_changes(client, user_headers, make_event):
+    make_event()
+    response = client.get("/api/events", headers=user_headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    not_modified = _revalidate(client, "/api/events", user_headers, etag)
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+    # Weak comparison, and any tag of a list may match
+    assert _revalidate(client, "/api/events", user_headers, f'"other", {etag.removeprefix("W/")}').status_code == 304
+
+    make_event()
+    changed = _revalidate(client, "/api/events", user_headers, etag)
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+def test_upcoming_and_all_events_have_different_etags(client, user_headers, make_event):
+    make_event(start_time=datetime.utcnow() - timedelta(days=1))
+    upcoming = client.get("/api/events", headers=user_headers).headers["ETag"]
+    everything = client.get("/api/events?include_past=true", headers=user_headers).headers["ETag"]
+    assert upcoming != everything
+
+def test_seat_map_not_modified_until_a_booking(client, make_user, make_event):
+    event = make_event(total_seats=4)
+    email, login = make_user()
+    headers = {"Authorization": f"Bearer {login['access_token']}"}
+    url = f"/api/events/{event['id']}/seats"
+
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert _revalidate(client, url, headers, etag).status_code == 304
+
+    seat_id = response.json()["seats"][0]["seat_id"]
+    booking = client.post("/api/book-seats", json={"seat_ids": [seat_id], "user_email": email}, headers=headers)
+    assert booking.status_code == 200
+
+    changed = _revalidate(client, url, headers, etag)
+    assert changed.status_code == 200
+    assert next(seat for seat in changed.json()["seats"] if seat["seat_id"] == seat_id)["status"] == "locked"
+    assert _revalidate(client, url, headers, changed.headers["ETag"]).status_code == 304
+
+def test_not_modified_still_requires_authentication(client, user_headers):
+    etag = client.get("/api/events", headers=user_headers).headers["ETag"]
+    assert client.get("/api/events", headers={"If-None-Match": etag}).status_code in (401, 403)
+
+def test_seat_map_read_does_not_wait_for_a_held_write_lock(client, user_headers, make_event):
+    event = make_event(total_seats=2)
+    url = f"/api/events/{event['id']}/seats"
+    # Another writer holds the database write lock (as a long booking would)
+    blocker = sqlite3.connect(engine.url.database, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.monotonic()
+        response = client.get(url, headers=user_headers)
+        elapsed = time.monotonic() - started
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()
+
+    # The counter couldn't advance, so the map goes out without an ETag
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+    assert elapsed < 1, elapsed
+    assert client.get(url, headers=user_headers).headers["ETag"]
+
+    # The short wait doesn't stick to the pooled connections
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000